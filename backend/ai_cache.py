@@ -0,0 +1,236 @@
+"""
+AI 응답 캐시 - (엔드포인트, 모델, 정규화한 프롬프트) 해시를 키로 DB(ai_cache 테이블)에 저장
+재시작 후에도 유지되고 워커 간 공유. TTL 만료 + 최대 항목 수 초과 시 오래 사용하지 않은 항목부터 제거
+미스일 때 같은 키로 진행 중인 호출이 있으면 새로 호출하지 않고 합류 (워커 프로세스 내)
+
+환경 변수
+- AI_CACHE_TTL: 유지 시간(초, 기본 7일). 0이면 캐시 사용 안 함
+- AI_CACHE_MAX_ENTRIES: 최대 항목 수 (기본 10000)
+"""
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from functools import partial
+from typing import AsyncIterator
+
+from fastapi.concurrency import run_in_threadpool
+from openai import AsyncOpenAI
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ai_client import OPENAI_MODEL, complete, stream_complete
+from models import AiCacheEntry
+from singleflight import FlightAborted, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", str(7 * 24 * 3600)))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "10000"))
+EVICT_EVERY = 100  # 저장 N회마다 만료/초과 항목 정리
+HIT_FLUSH_EVERY = 100  # 적중 N회마다 hits/last_used_at를 모아서 기록
+
+
+def normalize_prompt(prompt: str) -> str:
+    """공백 차이만 있는 프롬프트를 같은 키로"""
+    return " ".join(prompt.split())
+
+
+def cache_key(endpoint: str, model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{endpoint}\0{model}\0{normalize_prompt(prompt)}".encode()).hexdigest()
+
+
+class CacheStats:
+    """엔드포인트별 적중/미스 횟수 (프로세스별)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: dict[str, dict[str, int]] = {}
+        self._writes = 0
+
+    def _endpoint(self, endpoint: str) -> dict[str, int]:
+        return self._counts.setdefault(endpoint, {"hits": 0, "misses": 0, "coalesced": 0})
+
+    def record(self, endpoint: str, hit: bool) -> None:
+        with self._lock:
+            self._endpoint(endpoint)["hits" if hit else "misses"] += 1
+
+    def record_coalesced(self, endpoint: str) -> None:
+        """미스였지만 진행 중인 같은 호출에 합류 (LLM 호출 절약)"""
+        with self._lock:
+            self._endpoint(endpoint)["coalesced"] += 1
+
+    def count_write(self) -> int:
+        with self._lock:
+            self._writes += 1
+            return self._writes
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {**c, "hit_rate": round(c["hits"] / max(c["hits"] + c["misses"], 1), 4)}
+                for endpoint, c in self._counts.items()
+            }
+
+
+class HitBuffer:
+    """적중 기록(hits, last_used_at)을 메모리에 모아 두었다가 한 번에 UPDATE - 캐시 조회가 쓰기 트랜잭션이 되지 않도록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[int, datetime]] = {}
+        self._count = 0
+
+    def add(self, key: str, now: datetime) -> bool:
+        """적중 기록. 모아서 기록할 때가 되면 True"""
+        with self._lock:
+            hits, _ = self._pending.get(key, (0, now))
+            self._pending[key] = (hits + 1, now)
+            self._count += 1
+            return self._count >= HIT_FLUSH_EVERY
+
+    def take(self) -> dict[str, tuple[int, datetime]]:
+        with self._lock:
+            pending, self._pending, self._count = self._pending, {}, 0
+            return pending
+
+
+stats = CacheStats()
+hit_buffer = HitBuffer()
+inflight = SingleFlight()  # 캐시 키별 진행 중인 LLM 호출
+
+
+_table = AiCacheEntry.__table__
+_RECORD_HITS = (
+    update(_table).where(_table.c.key == bindparam("k"))
+    .values(hits=_table.c.hits + bindparam("n"), last_used_at=bindparam("used"))
+)
+
+
+def flush_hits(db: Session) -> None:
+    """모아 둔 적중 기록을 키별 UPDATE 묶음(executemany) 한 번으로 기록"""
+    pending = hit_buffer.take()
+    if pending:
+        db.execute(_RECORD_HITS, [{"k": k, "n": n, "used": used} for k, (n, used) in pending.items()])
+        db.commit()
+
+
+def get_cached(db: Session, key: str, endpoint: str) -> str | None:
+    """캐시 조회 (읽기만) - 적중 기록은 메모리에 모아 HIT_FLUSH_EVERY회마다 기록"""
+    now = datetime.utcnow()
+    text = db.scalar(select(AiCacheEntry.response).where(AiCacheEntry.key == key, AiCacheEntry.expires_at > now))
+    stats.record(endpoint, text is not None)
+    if text is not None and hit_buffer.add(key, now):
+        flush_hits(db)
+    return text
+
+
+def cached_keys(db: Session, keys: list[str]) -> set[str]:
+    """유효한(만료 전) 캐시 항목이 있는 키 - 적중 통계에는 반영하지 않음"""
+    rows = db.scalars(
+        select(AiCacheEntry.key).where(AiCacheEntry.key.in_(keys), AiCacheEntry.expires_at > datetime.utcnow())
+    )
+    return set(rows)
+
+
+def put_cached(db: Session, key: str, endpoint: str, model: str, text: str, ttl: float = AI_CACHE_TTL) -> None:
+    """캐시 저장 (같은 키가 이미 있으면 덮어씀)"""
+    now = datetime.utcnow()
+    values = {"response": text, "model": model, "created_at": now, "expires_at": now + timedelta(seconds=ttl), "last_used_at": now}
+    db.add(AiCacheEntry(key=key, endpoint=endpoint, hits=0, **values))
+    try:
+        db.commit()
+    except IntegrityError:  # 다른 워커가 먼저 저장
+        db.rollback()
+        db.execute(update(AiCacheEntry).where(AiCacheEntry.key == key).values(**values))
+        db.commit()
+    if stats.count_write() % EVICT_EVERY == 0:
+        evict(db)
+
+
+def evict(db: Session, max_entries: int = AI_CACHE_MAX_ENTRIES) -> int:
+    """만료 항목 삭제 후 max_entries 초과분을 last_used_at 오래된 순으로 삭제. 삭제 수 반환"""
+    flush_hits(db)  # 최근 사용 시각 반영 후 정리
+    removed = db.execute(delete(AiCacheEntry).where(AiCacheEntry.expires_at <= datetime.utcnow())).rowcount
+    excess = db.scalar(select(func.count()).select_from(AiCacheEntry)) - max_entries
+    if excess > 0:
+        oldest = select(AiCacheEntry.key).order_by(AiCacheEntry.last_used_at).limit(excess)
+        removed += db.execute(delete(AiCacheEntry).where(AiCacheEntry.key.in_(oldest))).rowcount
+    db.commit()
+    return removed
+
+
+def entry_count(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(AiCacheEntry))
+
+
+async def _lookup(db: Session, key: str, endpoint: str) -> str | None:
+    try:
+        return await run_in_threadpool(get_cached, db, key, endpoint)
+    except Exception:
+        db.rollback()
+        logger.exception("AI 캐시 조회 실패")
+        return None
+
+
+async def _store(db: Session, key: str, endpoint: str, text: str) -> None:
+    try:
+        await run_in_threadpool(put_cached, db, key, endpoint, OPENAI_MODEL, text)
+    except Exception:
+        db.rollback()
+        logger.exception("AI 캐시 저장 실패")
+
+
+async def cached_complete(db: Session, endpoint: str, client: AsyncOpenAI, prompt: str, max_tokens: int) -> str:
+    """캐시 우선 채팅 완성 - 미스 시 같은 프롬프트로 진행 중인 호출이 있으면 합류 (single-flight)
+
+    캐시 조회/저장 실패는 응답에 영향 없음 (조회 실패는 미스로 처리). 저장은 호출을 시작한 요청만
+    """
+    key = cache_key(endpoint, OPENAI_MODEL, prompt)
+    if AI_CACHE_TTL > 0:
+        text = await _lookup(db, key, endpoint)
+        if text is not None:
+            return text
+    text, joined = await inflight.do(key, partial(complete, client, prompt, max_tokens))
+    if joined:
+        stats.record_coalesced(endpoint)
+    elif text and AI_CACHE_TTL > 0:
+        await _store(db, key, endpoint, text)
+    return text
+
+
+async def cached_stream(db: Session, endpoint: str, client: AsyncOpenAI, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+    """캐시 우선 스트리밍 - 적중 시 전체 텍스트를 한 조각으로, 미스 시 모델 조각을 그대로 내보내고 끝까지 받으면 저장
+
+    같은 프롬프트로 진행 중인 호출(스트리밍/일반)이 있으면 합류해 완료된 전체 텍스트를 한 조각으로 받음.
+    시작한 쪽 연결이 끊겨 호출이 중단되면 합류한 쪽이 새로 시작하거나 새 호출에 다시 합류 (다른 요청에 영향 없음)
+    """
+    key = cache_key(endpoint, OPENAI_MODEL, prompt)
+    if AI_CACHE_TTL > 0:
+        text = await _lookup(db, key, endpoint)
+        if text is not None:
+            yield text
+            return
+    while inflight.in_flight(key):
+        try:
+            text = await inflight.wait(key)
+        except FlightAborted:
+            continue
+        stats.record_coalesced(endpoint)
+        yield text
+        return
+    flight = inflight.begin(key)
+    pieces = []
+    try:
+        async for piece in stream_complete(client, prompt, max_tokens):
+            pieces.append(piece)
+            yield piece
+    except BaseException as e:  # 연결 종료(GeneratorExit) 포함 - 합류한 대기자에게 전달
+        inflight.finish(key, flight, error=e)
+        raise
+    text = "".join(pieces)
+    inflight.finish(key, flight, result=text)
+    if text and AI_CACHE_TTL > 0:
+        await _store(db, key, endpoint, text)
@@ -0,0 +1,77 @@
+"""
+OpenAI 클라이언트 - 프로세스당 하나의 AsyncOpenAI를 재사용 (연결 풀 유지, TLS 핸드셰이크 재사용)
+lifespan에서 열고 닫으며, lifespan 없이 호출되면 처음 사용할 때 생성
+
+환경 변수
+- OPENAI_API_KEY: 없으면 get_ai_client()가 None
+- OPENAI_BASE_URL: 호환 서버/로컬 스텁 주소 (SDK가 직접 읽음)
+- OPENAI_MODEL: 기본 gpt-4o-mini
+- OPENAI_MAX_CONNECTIONS / OPENAI_MAX_KEEPALIVE: 연결 풀 크기 (기본 100 / 20)
+- OPENAI_TIMEOUT: 요청 타임아웃(초, 기본 60)
+"""
+import os
+from typing import AsyncIterator, Optional
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+_client: Optional[AsyncOpenAI] = None
+
+
+def _create_client(api_key: str) -> AsyncOpenAI:
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=30,
+    )
+    timeout = httpx.Timeout(float(os.getenv("OPENAI_TIMEOUT", "60")), connect=5.0)
+    return AsyncOpenAI(
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=1,
+        http_client=DefaultAsyncHttpxClient(limits=limits, timeout=timeout),
+    )
+
+
+def get_ai_client() -> Optional[AsyncOpenAI]:
+    """공유 AsyncOpenAI 클라이언트. OPENAI_API_KEY가 없으면 None"""
+    global _client
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    if _client is None:
+        _client = _create_client(api_key)
+    return _client
+
+
+async def close_ai_client() -> None:
+    """lifespan 종료 시 연결 풀 정리"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+async def complete(client: AsyncOpenAI, prompt: str, max_tokens: int) -> str:
+    """단일 사용자 메시지 채팅 완성 → 응답 텍스트"""
+    resp = await client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+    )
+    return resp.choices[0].message.content or ""
+
+
+async def stream_complete(client: AsyncOpenAI, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+    """채팅 완성 스트리밍 - 모델이 보내는 텍스트 조각을 도착 순서대로"""
+    stream = await client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        stream=True,
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
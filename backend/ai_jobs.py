@@ -0,0 +1,219 @@
+"""
+AI 작업 큐 - 요청은 작업만 등록하고 즉시 job id 반환, 워커 풀이 동시 실행 수를 제한해 처리
+작업별 마감 시간, 지터를 준 지수 백오프 재시도, 업스트림 장애 시 빠르게 실패하는 서킷 브레이커
+
+작업 상태는 워커 프로세스 메모리에 보관 (결과 조회는 같은 워커로 라우팅되거나 단일 워커일 때)
+
+환경 변수
+- AI_JOB_CONCURRENCY: 동시에 실행할 작업 수 (기본 4)
+- AI_JOB_MAX_QUEUE: 대기 가능한 작업 수 (기본 1000), 초과 시 QueueFull
+- AI_JOB_DEADLINE: 작업당 마감 시간(초, 재시도 포함, 기본 60)
+- AI_JOB_RETRIES: 일시적 오류 재시도 횟수 (기본 2)
+- AI_JOB_RESULT_TTL: 완료된 작업 결과 보관 시간(초, 기본 3600)
+- AI_BREAKER_FAILURES / AI_BREAKER_RESET: 연속 실패 N회면 차단, 차단 후 재시도 허용까지(초) (기본 5 / 30)
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+
+import openai
+
+from cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 업스트림 오류 (그 외 4xx 등은 즉시 실패)
+RETRYABLE = (
+    asyncio.TimeoutError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class QueueFull(Exception):
+    """대기 작업이 가득 참 - 잠시 후 재시도"""
+
+
+class CircuitBreaker:
+    """연속 실패 failure_threshold회면 열림(open) → reset_timeout 후 시험 호출 1회 허용(half-open)
+    시험 호출 성공 시 닫힘, 실패 시 다시 열림"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._trial = False
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "queued"  # queued → running → succeeded | failed
+    result: Any = None
+    error: Optional[str] = None  # upstream_timeout | upstream_unavailable | upstream_error
+    attempts: int = 0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        d = {"job_id": self.id, "kind": self.kind, "status": self.status, "attempts": self.attempts,
+             "created_at": self.created_at.isoformat()}
+        if self.status == "succeeded":
+            d["result"] = self.result
+        elif self.status == "failed":
+            d["error"] = self.error
+        return d
+
+
+class JobQueue:
+    """이벤트 루프 안에서 동작하는 작업 큐. 워커는 start() 또는 첫 submit() 때 현재 루프에서 시작"""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        max_queue: int = 1000,
+        deadline: float = 60.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        result_ttl: float = 3600.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._jobs = TTLCache(maxsize=max(max_queue * 10, 10000), ttl=result_ttl)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        return cls(
+            concurrency=int(os.getenv("AI_JOB_CONCURRENCY", "4")),
+            max_queue=int(os.getenv("AI_JOB_MAX_QUEUE", "1000")),
+            deadline=float(os.getenv("AI_JOB_DEADLINE", "60")),
+            retries=int(os.getenv("AI_JOB_RETRIES", "2")),
+            result_ttl=float(os.getenv("AI_JOB_RESULT_TTL", "3600")),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv("AI_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.getenv("AI_BREAKER_RESET", "30")),
+            ),
+        )
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._workers = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        for w in self._workers:
+            w.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, kind: str, fn: Callable[[], Awaitable[Any]]) -> Job:
+        """작업 등록 - fn()은 업스트림 호출 1회 (재시도마다 다시 호출됨)"""
+        self.start()
+        if self._queue.qsize() >= self.max_queue:
+            raise QueueFull()
+        job = Job(id=str(uuid.uuid4()), kind=kind)
+        self._jobs.set(job.id, job)
+        self._queue.put_nowait((job, fn, time.monotonic() + self.deadline))
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job, fn, deadline = await self._queue.get()
+            try:
+                await self._run(job, fn, deadline)
+            except Exception:  # _run이 작업 상태를 남기지 못한 경우
+                logger.exception("AI 작업 실패: %s", job.id)
+                self._finish(job, error="upstream_error")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job, fn: Callable[[], Awaitable[Any]], deadline: float) -> None:
+        job.status = "running"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return self._finish(job, error="upstream_timeout")
+            if not self.breaker.allow():
+                return self._finish(job, error="upstream_unavailable")
+            job.attempts += 1
+            try:
+                result = await asyncio.wait_for(fn(), remaining)
+            except RETRYABLE as e:
+                self.breaker.record_failure()
+                logger.warning("AI 작업 %s 시도 %d 실패: %r", job.id, job.attempts, e)
+                if job.attempts > self.retries:
+                    timed_out = isinstance(e, (asyncio.TimeoutError, openai.APITimeoutError))
+                    return self._finish(job, error="upstream_timeout" if timed_out else "upstream_error")
+                delay = self.backoff * 2 ** (job.attempts - 1) * random.uniform(0.5, 1.5)
+                await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                continue
+            except Exception as e:
+                self.breaker.record_success()  # 업스트림은 응답함 (요청 오류) - 장애로 세지 않음
+                logger.warning("AI 작업 %s 실패 (재시도 안 함): %r", job.id, e)
+                return self._finish(job, error="upstream_error")
+            self.breaker.record_success()
+            return self._finish(job, result=result)
+
+    def _finish(self, job: Job, result: Any = None, error: Optional[str] = None) -> None:
+        job.status = "failed" if error else "succeeded"
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.utcnow()
@@ -0,0 +1,54 @@
+"""
+AI 엔드포인트 프롬프트 - 엔드포인트와 캐시 예열(maintenance.py warm-ai-cache)이 같은 프롬프트를 쓰도록 한 곳에서 생성
+"""
+from typing import Optional
+
+from career_match import get_career_recommendations
+from report_templates import MBTI_REPORTS
+
+
+def report_prompt(
+    mbti_type: str,
+    job: Optional[str] = None,
+    current_concern: Optional[str] = None,
+    relationship_concern: Optional[str] = None,
+) -> str:
+    """/api/report/ai - 맞춤 심리 해석"""
+    base_info = MBTI_REPORTS[mbti_type]
+    user_input = []
+    if job:
+        user_input.append(f"직업: {job}")
+    if current_concern:
+        user_input.append(f"현재 고민: {current_concern}")
+    if relationship_concern:
+        user_input.append(f"관계 고민: {relationship_concern}")
+    return f"""당신은 MBTI 기반 심리 분석 전문가입니다.
+사용자의 MBTI 유형은 {mbti_type}이며, 기본 성격 특성은 다음과 같습니다:
+- 키워드: {', '.join(base_info['keywords'])}
+- 강점: {base_info['strengths']}
+- 약점: {base_info['weaknesses']}
+- 스트레스 반응: {base_info['stress_reaction']}
+- 의사결정 스타일: {base_info['decision_style']}
+
+사용자 입력:
+{chr(10).join(user_input) if user_input else '(추가 입력 없음)'}
+
+위 정보를 바탕으로 200자 내외로 맞춤 심리 해석을 작성해 주세요. 따뜻하고 구체적으로 작성하며, 한국어로 답변하세요."""
+
+
+def career_advice_prompt(mbti_type: str, current_job: str) -> str:
+    """/api/career/ai-advice - 커리어 조언 (JSON 응답 요청)"""
+    base_info = MBTI_REPORTS[mbti_type]
+    careers = get_career_recommendations(mbti_type)["recommended_careers"]
+    return f"""당신은 MBTI 기반 커리어 코치입니다.
+사용자 정보:
+- MBTI: {mbti_type}
+- 현재 직무: {current_job}
+- 성격 키워드: {', '.join(base_info['keywords'])}
+- 강점: {base_info['strengths']}
+- 약점: {base_info['weaknesses']}
+- 추천 직무군: {', '.join(careers)}
+
+다음 두 가지를 각각 150자 내외로 한국어로 작성해 주세요. JSON 형식으로만 답변하세요.
+{{"career_advice": "현재 직무에서의 성장 방향, MBTI 강점을 활용한 조언",
+ "strength_strategy": "강점 활용 전략 2~3가지 구체적 제안"}}"""
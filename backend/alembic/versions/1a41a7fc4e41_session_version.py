@@ -0,0 +1,31 @@
+"""session_version
+
+세션 답변 PATCH의 낙관적 동시성 제어용 버전 컬럼
+
+Revision ID: 1a41a7fc4e41
+Revises: 2f23de49cc36
+Create Date: 2026-10-18 15:21:44.903216
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a41a7fc4e41'
+down_revision: Union[str, Sequence[str], None] = '2f23de49cc36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('mbti_sessions', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('mbti_sessions') as batch_op:
+        batch_op.drop_column('version')
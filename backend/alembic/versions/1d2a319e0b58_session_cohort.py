@@ -0,0 +1,39 @@
+"""session_cohort
+
+기관 검사 캠페인(cohort) 컬럼 - 일괄 등록 시 지정, 캠페인 단위 일괄 PDF 내보내기
+PostgreSQL에서는 인덱스를 CONCURRENTLY로 생성/삭제해 쓰기를 막지 않음
+
+Revision ID: 1d2a319e0b58
+Revises: fc3f69f84073
+Create Date: 2026-10-18 21:05:12.402731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d2a319e0b58'
+down_revision: Union[str, Sequence[str], None] = 'fc3f69f84073'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('mbti_sessions', sa.Column('cohort', sa.String(length=100), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_mbti_sessions_cohort_id', 'mbti_sessions', ['cohort', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_mbti_sessions_cohort_id', table_name='mbti_sessions', postgresql_concurrently=True)
+    with op.batch_alter_table('mbti_sessions') as batch_op:
+        batch_op.drop_column('cohort')
@@ -0,0 +1,120 @@
+"""packed_session_answers
+
+답변을 문항당 3비트 압축 인코딩(answers_packed, 18바이트)으로 저장.
+기존 JSON 답변(answers)은 nullable로 바꾸고, 배치 단위로 answers_packed로 변환.
+앱은 두 형식을 모두 읽으므로 변환 도중/이후 배포 순서와 무관하게 동작.
+MBTI_ANSWERS_JSON_DUAL_WRITE=1 이면 JSON 답변을 지우지 않음 (이전 버전 인스턴스와 공존 시).
+배치 크기: MBTI_BACKFILL_BATCH_SIZE (기본 2000)
+
+Revision ID: 2f23de49cc36
+Revises: a348f2f64cd5
+Create Date: 2026-10-18 13:40:05.662817
+
+"""
+import logging
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+from answer_codec import decode_answers, encode_answers
+from scoring import QUESTION_IDS, answers_to_array
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f23de49cc36'
+down_revision: Union[str, Sequence[str], None] = 'a348f2f64cd5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BATCH_SIZE = int(os.getenv("MBTI_BACKFILL_BATCH_SIZE", "2000"))
+KEEP_JSON = os.getenv("MBTI_ANSWERS_JSON_DUAL_WRITE", "") == "1"
+
+mbti_sessions = sa.table(
+    'mbti_sessions',
+    sa.column('id', sa.String),
+    sa.column('answers', sa.JSON(none_as_null=True)),
+    sa.column('answers_packed', sa.LargeBinary),
+)
+
+
+def _backfill(conn) -> None:
+    """JSON 답변만 있는 행을 id keyset 순서로 배치 변환"""
+    t = mbti_sessions
+    update = (
+        t.update()
+        .where(t.c.id == sa.bindparam('b_id'))
+        .values(answers_packed=sa.bindparam('b_packed'))
+    )
+    if not KEEP_JSON:
+        update = update.values(answers=None)
+    last_id, total = "", 0
+    while True:
+        rows = conn.execute(
+            sa.select(t.c.id, t.c.answers)
+            .where(t.c.id > last_id, t.c.answers_packed.is_(None), t.c.answers.is_not(None))
+            .order_by(t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(update, [
+            {'b_id': r.id, 'b_packed': encode_answers(answers_to_array(r.answers or {}))} for r in rows
+        ])
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info("mbti_sessions answers pack: %d rows (last id %s)", total, last_id)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    offline = op.get_context().as_sql
+    existing = set() if offline else {c['name'] for c in sa.inspect(op.get_bind()).get_columns('mbti_sessions')}
+    if 'answers_packed' not in existing:  # 변환 도중 중단 후 재실행 시 스키마 변경은 건너뜀
+        with op.batch_alter_table('mbti_sessions') as batch_op:
+            batch_op.add_column(sa.Column('answers_packed', sa.LargeBinary(), nullable=True))
+            batch_op.alter_column('answers', existing_type=sa.JSON(), nullable=True)
+    if offline:
+        return
+    with op.get_context().autocommit_block():
+        _backfill(op.get_bind())
+
+
+def _restore_json(conn) -> None:
+    """압축 답변이 있는 행을 id keyset 순서로 배치 단위 JSON 복원 (압축 형식이 최신 상태)"""
+    t = mbti_sessions
+    update = t.update().where(t.c.id == sa.bindparam('b_id')).values(answers=sa.bindparam('b_answers'))
+    last_id, total = "", 0
+    while True:
+        rows = conn.execute(
+            sa.select(t.c.id, t.c.answers_packed)
+            .where(t.c.id > last_id, t.c.answers_packed.is_not(None))
+            .order_by(t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        params = []
+        for r in rows:
+            arr = decode_answers(r.answers_packed)
+            params.append({'b_id': r.id, 'b_answers': {str(QUESTION_IDS[i]): int(arr[i]) for i in np.flatnonzero(arr)}})
+        conn.execute(update, params)
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info("mbti_sessions answers unpack: %d rows (last id %s)", total, last_id)
+    conn.execute(t.update().where(t.c.answers.is_(None)).values(answers={}))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 압축 형식만 남은 행은 JSON으로 되돌린 뒤 컬럼 제거
+    if not op.get_context().as_sql:
+        with op.get_context().autocommit_block():
+            _restore_json(op.get_bind())
+    with op.batch_alter_table('mbti_sessions') as batch_op:
+        batch_op.alter_column('answers', existing_type=sa.JSON(), nullable=False)
+        batch_op.drop_column('answers_packed')
@@ -0,0 +1,44 @@
+"""session_cohort_owner
+
+일괄 등록 세션 소유자(owner_id) - 캠페인(cohort)은 소유자별로 구분, 인덱스를 (owner_id, cohort, id)로 교체
+PostgreSQL에서는 새 인덱스를 먼저 CONCURRENTLY로 만든 뒤 이전 인덱스를 CONCURRENTLY로 삭제 (쓰기를 막지 않음)
+
+Revision ID: 97368dcec1d6
+Revises: 1d2a319e0b58
+Create Date: 2026-10-18 23:40:27.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '97368dcec1d6'
+down_revision: Union[str, Sequence[str], None] = '1d2a319e0b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('mbti_sessions', sa.Column('owner_id', sa.String(length=36), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_mbti_sessions_owner_cohort_id', 'mbti_sessions', ['owner_id', 'cohort', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index('ix_mbti_sessions_cohort_id', table_name='mbti_sessions', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_mbti_sessions_cohort_id', 'mbti_sessions', ['cohort', 'id'],
+            unique=False, postgresql_concurrently=True,
+        )
+        op.drop_index('ix_mbti_sessions_owner_cohort_id', table_name='mbti_sessions', postgresql_concurrently=True)
+    with op.batch_alter_table('mbti_sessions') as batch_op:
+        batch_op.drop_column('owner_id')
@@ -0,0 +1,44 @@
+"""session_expiry
+
+미완료 세션 만료 작업용 updated_at 인덱스와 보관 테이블.
+PostgreSQL에서는 인덱스를 CONCURRENTLY로 생성해 쓰기를 막지 않음
+
+Revision ID: 9eb79046f466
+Revises: 1a41a7fc4e41
+Create Date: 2026-10-18 17:05:12.370419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9eb79046f466'
+down_revision: Union[str, Sequence[str], None] = '1a41a7fc4e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('mbti_sessions_archive',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('answers_packed', sa.LargeBinary(), nullable=True),
+    sa.Column('answered_count', sa.Integer(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_mbti_sessions_updated_at'), 'mbti_sessions', ['updated_at'],
+            unique=False, postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_mbti_sessions_updated_at'), table_name='mbti_sessions')
+    op.drop_table('mbti_sessions_archive')
@@ -0,0 +1,116 @@
+"""session_result_columns
+
+48문항 완료 세션의 결과(mbti_type, percentages, completed_at)를 세션 행에 저장.
+기존 행은 id 순서로 배치 단위 backfill - 배치마다 커밋하므로 테이블을 오래 잠그지 않고,
+중단되면 `alembic upgrade head` 재실행 시 남은 행부터 이어서 처리.
+배치 크기: MBTI_BACKFILL_BATCH_SIZE (기본 2000)
+
+Revision ID: a348f2f64cd5
+Revises: b1ef8fe0d9d2
+Create Date: 2026-10-18 11:02:47.118230
+
+"""
+import logging
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+from scoring import NUM_QUESTIONS, answers_to_array, pole_scores, results_from_scores
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a348f2f64cd5'
+down_revision: Union[str, Sequence[str], None] = 'b1ef8fe0d9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BATCH_SIZE = int(os.getenv("MBTI_BACKFILL_BATCH_SIZE", "2000"))
+
+# 이 리비전 시점의 스키마 (모델이 바뀌어도 backfill은 그대로 동작하도록 고정)
+mbti_sessions = sa.table(
+    'mbti_sessions',
+    sa.column('id', sa.String),
+    sa.column('answers', sa.JSON),
+    sa.column('updated_at', sa.DateTime),
+    sa.column('pole_scores', sa.JSON),
+    sa.column('answered_count', sa.Integer),
+    sa.column('mbti_type', sa.String),
+    sa.column('percentages', sa.JSON),
+    sa.column('completed_at', sa.DateTime),
+)
+
+
+def _backfill(conn) -> None:
+    """누적 점수/결과 컬럼이 비어 있는 행을 id keyset 순서로 배치 처리"""
+    t = mbti_sessions
+    pending = sa.or_(
+        t.c.answered_count.is_(None),
+        sa.and_(t.c.answered_count >= NUM_QUESTIONS, t.c.mbti_type.is_(None)),
+    )
+    update = (
+        t.update()
+        .where(t.c.id == sa.bindparam('b_id'))
+        .values(
+            pole_scores=sa.bindparam('b_pole_scores'),
+            answered_count=sa.bindparam('b_answered_count'),
+            mbti_type=sa.bindparam('b_mbti_type'),
+            percentages=sa.bindparam('b_percentages'),
+            completed_at=sa.bindparam('b_completed_at'),
+        )
+    )
+    last_id, total = "", 0
+    while True:
+        rows = conn.execute(
+            sa.select(t.c.id, t.c.answers, t.c.updated_at)
+            .where(t.c.id > last_id, pending)
+            .order_by(t.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        answers = np.stack([answers_to_array(r.answers or {}) for r in rows])
+        scores = pole_scores(answers)
+        counts = np.count_nonzero(answers, axis=1)
+        results = results_from_scores(scores)
+        params = []
+        for r, s, n, res in zip(rows, scores.tolist(), counts.tolist(), results):
+            done = n >= NUM_QUESTIONS
+            params.append({
+                'b_id': r.id,
+                'b_pole_scores': s,
+                'b_answered_count': n,
+                'b_mbti_type': res['type'] if done else None,
+                'b_percentages': res['percentages'] if done else None,
+                'b_completed_at': r.updated_at if done else None,
+            })
+        conn.execute(update, params)
+        last_id = rows[-1].id
+        total += len(rows)
+        logger.info("mbti_sessions backfill: %d rows (last id %s)", total, last_id)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    offline = op.get_context().as_sql
+    existing = set() if offline else {c['name'] for c in sa.inspect(op.get_bind()).get_columns('mbti_sessions')}
+    if 'mbti_type' not in existing:  # backfill 도중 중단 후 재실행 시 컬럼 추가는 건너뜀
+        op.add_column('mbti_sessions', sa.Column('mbti_type', sa.String(length=4), nullable=True))
+        op.add_column('mbti_sessions', sa.Column('percentages', sa.JSON(), nullable=True))
+        op.add_column('mbti_sessions', sa.Column('completed_at', sa.DateTime(), nullable=True))
+    if offline:
+        return
+    with op.get_context().autocommit_block():
+        _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('mbti_sessions') as batch_op:
+        batch_op.drop_column('completed_at')
+        batch_op.drop_column('percentages')
+        batch_op.drop_column('mbti_type')
@@ -0,0 +1,32 @@
+"""session_running_scores
+
+Revision ID: b1ef8fe0d9d2
+Revises: ea2865055b66
+Create Date: 2026-10-18 10:12:31.504113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1ef8fe0d9d2'
+down_revision: Union[str, Sequence[str], None] = 'ea2865055b66'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 세션은 NULL로 두고 읽을 때 저장된 답변으로 계산 (다음 제출 시 채워짐)
+    op.add_column('mbti_sessions', sa.Column('pole_scores', sa.JSON(), nullable=True))
+    op.add_column('mbti_sessions', sa.Column('answered_count', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('mbti_sessions') as batch_op:
+        batch_op.drop_column('answered_count')
+        batch_op.drop_column('pole_scores')
@@ -0,0 +1,44 @@
+"""ai_cache
+
+AI 응답 캐시 테이블 (재시작 후에도 유지, 워커 간 공유)
+
+Revision ID: fc3f69f84073
+Revises: 9eb79046f466
+Create Date: 2026-10-18 19:12:40.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fc3f69f84073'
+down_revision: Union[str, Sequence[str], None] = '9eb79046f466'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ai_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('endpoint', sa.String(length=50), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('hits', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_ai_cache_expires_at'), 'ai_cache', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_ai_cache_last_used_at'), 'ai_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ai_cache_last_used_at'), table_name='ai_cache')
+    op.drop_index(op.f('ix_ai_cache_expires_at'), table_name='ai_cache')
+    op.drop_table('ai_cache')
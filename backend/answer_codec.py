@@ -0,0 +1,54 @@
+"""
+답변 압축 인코딩 - 문항당 3비트 (0 = 미응답, 1~5 = 응답값), 48문항 = 18바이트
+"""
+import numpy as np
+
+from scoring import NUM_QUESTIONS
+
+BITS_PER_ANSWER = 3
+PACKED_SIZE = NUM_QUESTIONS * BITS_PER_ANSWER // 8  # 18
+UNANSWERED = 0
+_SHIFTS = np.arange(BITS_PER_ANSWER - 1, -1, -1, dtype=np.uint8)  # [2, 1, 0]
+_WEIGHTS = (1 << _SHIFTS).astype(np.int8)  # [4, 2, 1]
+
+
+def encode_answers(answers: np.ndarray) -> bytes:
+    """길이 48 응답 배열 → 18바이트"""
+    a = np.asarray(answers, dtype=np.uint8)
+    if a.shape != (NUM_QUESTIONS,) or a.max(initial=0) > 5:
+        raise ValueError("응답 배열은 길이 48, 값 0~5 여야 합니다")
+    bits = (a[:, None] >> _SHIFTS) & 1
+    return np.packbits(bits.ravel()).tobytes()
+
+
+def decode_answers_batch(blobs: list[bytes]) -> np.ndarray:
+    """여러 세션의 18바이트 인코딩 → (N, 48) 응답 행렬 (채점 엔진 입력)"""
+    raw = np.frombuffer(b"".join(blobs), dtype=np.uint8)
+    if raw.size != len(blobs) * PACKED_SIZE:
+        raise ValueError("잘못된 답변 인코딩 길이")
+    bits = np.unpackbits(raw.reshape(len(blobs), PACKED_SIZE), axis=1)
+    return bits.reshape(len(blobs), NUM_QUESTIONS, BITS_PER_ANSWER).astype(np.int8) @ _WEIGHTS
+
+
+def decode_answers(blob: bytes) -> np.ndarray:
+    """18바이트 → 길이 48 응답 배열"""
+    return decode_answers_batch([blob])[0]
+
+
+def parse_compact_answers(value: str | list[int]) -> np.ndarray:
+    """요청의 간단 형식 → 길이 48 응답 배열. 48자리 숫자 문자열 또는 길이 48 정수 배열 (0 = 미응답)
+
+    문항 순서는 /api/mbti/questions 순서. 범위 검사는 배열 전체에 한 번에 적용
+    """
+    if isinstance(value, str):
+        a = np.frombuffer(value.encode("ascii", "replace"), dtype=np.uint8) - ord("0")
+    else:
+        try:
+            a = np.asarray(value, dtype=np.int64)
+        except OverflowError:
+            raise ValueError("answers 값은 0(미응답) 또는 1~5 여야 합니다") from None
+    if a.shape != (NUM_QUESTIONS,):
+        raise ValueError(f"answers는 {NUM_QUESTIONS}개 값이어야 합니다")
+    if not ((a >= 0) & (a <= 5)).all():
+        raise ValueError("answers 값은 0(미응답) 또는 1~5 여야 합니다")
+    return a.astype(np.int8)
@@ -0,0 +1,182 @@
+"""
+세션 자동 저장 write-behind 버퍼
+세션별 최신 상태를 메모리에 두고 짧은 주기로 변경된 세션만 일괄 upsert (executemany 1회 + commit 1회)
+MBTI_WRITE_BEHIND=1 로 활성화. 버퍼는 워커 프로세스별이므로 단일 워커 또는 세션 고정 라우팅에서 사용
+"""
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from models import MbtiSession
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = tuple(c.name for c in MbtiSession.__table__.columns)
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def _copy(sess: MbtiSession) -> MbtiSession:
+    """DB/버퍼 세션 → 어떤 DB 세션에도 속하지 않는 복사본 (JSON 값은 교체만 하므로 얕은 복사)"""
+    return MbtiSession(**{c: getattr(sess, c) for c in _COLUMNS})
+
+
+def _upsert_statement(dialect: str):
+    insert = _UPSERT_DIALECTS.get(dialect)
+    if insert is None:
+        raise RuntimeError(f"write-behind 버퍼는 {dialect} DB를 지원하지 않습니다")
+    table = MbtiSession.__table__
+    stmt = insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={c: stmt.excluded[c] for c in _COLUMNS if c != "id"},
+    )
+
+
+class WriteBehindFull(Exception):
+    """DB 반영이 실패하는 동안 버퍼가 가득 참 - 새 세션은 잠시 후 재시도"""
+
+
+class WriteBehindBuffer:
+    """변경된 세션 상태를 모아 두었다가 주기적으로 DB에 반영
+
+    - 읽기는 버퍼(및 반영 중인 배치)를 먼저 확인하므로 항상 최신 상태를 봄
+    - 변경된 세션이 max_sessions를 넘으면 호출 스레드에서 즉시 flush (메모리 상한).
+      이 flush가 실패해도 이미 버퍼에 반영한 변경은 그대로 성공 (다음 주기에 재시도)
+    - flush가 실패하는 동안 버퍼가 가득 차 있으면 새 세션은 WriteBehindFull로 거절 (버퍼에 있는 세션 변경은 허용)
+    """
+
+    def __init__(self, session_factory: Callable, max_sessions: int = 10000, interval: float = 2.0):
+        self._session_factory = session_factory
+        self.max_sessions = max_sessions
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty: OrderedDict[str, MbtiSession] = OrderedDict()
+        self._flushing: dict[str, MbtiSession] = {}
+        self._generation = 0  # flush 완료마다 증가
+        self._failing = False  # 마지막 flush 실패 여부
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls) -> "WriteBehindBuffer | None":
+        if os.getenv("MBTI_WRITE_BEHIND", "") != "1":
+            return None
+        from database import SessionLocal
+        return cls(
+            SessionLocal,
+            max_sessions=int(os.getenv("MBTI_WRITE_BEHIND_MAX_SESSIONS", "10000")),
+            interval=float(os.getenv("MBTI_WRITE_BEHIND_INTERVAL", "2")),
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._dirty)
+
+    def _current(self, session_id: str) -> MbtiSession | None:
+        sess = self._dirty.get(session_id)
+        return sess if sess is not None else self._flushing.get(session_id)
+
+    def get(self, session_id: str) -> MbtiSession | None:
+        """버퍼에 있는 세션 상태의 복사본. 없으면 None (DB에서 읽으면 됨)"""
+        with self._lock:
+            sess = self._current(session_id)
+            return _copy(sess) if sess is not None else None
+
+    def modify(
+        self, session_id: str, loader: Callable[[], MbtiSession | None], fn: Callable,
+    ) -> tuple[MbtiSession | None, int]:
+        """세션 상태 변경 - fn(sess | None) -> (sess | None, 변경된 문항 수)
+
+        버퍼에 없으면 loader()로 DB에서 읽은 상태에서 시작. 변경되면 버전을 올리고 dirty로 표시.
+        변경 후 세션 상태의 복사본과 변경된 문항 수 반환
+        """
+        while True:
+            with self._lock:
+                cached = self._current(session_id)
+                generation = self._generation
+            base = cached if cached is not None else loader()
+            with self._lock:
+                sess = self._dirty.get(session_id)
+                if sess is None:
+                    src = self._flushing.get(session_id)
+                    if src is None:
+                        if cached is None and generation != self._generation:
+                            continue  # DB에서 읽는 사이 반영된 배치가 있음 - 다시 읽기
+                        src = base
+                    sess = _copy(src) if src is not None else None
+                if session_id not in self._dirty and self._failing and len(self._dirty) >= self.max_sessions:
+                    raise WriteBehindFull()
+                is_new = sess is None
+                sess, changed = fn(sess)
+                if changed or (is_new and sess is not None):
+                    sess.version = 1 if is_new else (sess.version or 1) + 1
+                    sess.updated_at = datetime.utcnow()
+                    self._dirty[session_id] = sess
+                    self._dirty.move_to_end(session_id)
+                snapshot = _copy(sess) if sess is not None else None
+                over = len(self._dirty) > self.max_sessions and not self._failing
+            if over:
+                try:
+                    self.flush()
+                except Exception:  # 변경은 버퍼에 있음 - 주기적 flush가 재시도
+                    logger.exception("write-behind 즉시 flush 실패")
+            return snapshot, changed
+
+    def flush(self) -> int:
+        """변경된 세션 전체를 upsert 1회로 반영. 반영한 세션 수 반환"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._dirty = self._dirty, OrderedDict()
+                self._flushing = batch
+            if not batch:
+                return 0
+            db = self._session_factory()
+            try:
+                rows = [{c: getattr(s, c) for c in _COLUMNS} for s in batch.values()]
+                db.execute(_upsert_statement(db.get_bind().dialect.name), rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:  # 실패한 배치는 다시 dirty로 (그 사이 더 새 상태가 있으면 그것 유지)
+                    for sid, sess in batch.items():
+                        self._dirty.setdefault(sid, sess)
+                    self._failing = True
+                raise
+            else:
+                self._failing = False
+            finally:
+                db.close()
+                with self._lock:
+                    self._flushing = {}
+                    self._generation += 1
+            return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                logger.exception("write-behind flush 실패 - 다음 주기에 재시도")
+
+    def start(self) -> None:
+        """주기적 flush 시작 (lifespan 시작 시)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """주기적 flush 중지 후 남은 변경 반영 (lifespan 종료 시)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
@@ -0,0 +1,114 @@
+"""
+AI 엔드포인트 벤치마크 - 로컬 OpenAI 스텁(fake_openai_server.py)으로 오프라인 측정
+
+    python benchmarks/bench_ai_endpoints.py [--requests 200] [--concurrency 100] [--latency 2.0]
+
+동시 /api/report/ai 요청 처리량과 그동안의 /api/mbti/questions 지연을 출력
+(이전 커밋에서 같은 명령으로 실행하면 요청마다 동기 클라이언트를 만들던 방식과 비교 가능)
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from bench_login_storm import _free_port, _percentile, _wait_ready
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+async def _wait_stub(base: str) -> None:
+    async with httpx.AsyncClient() as c:
+        for _ in range(100):
+            try:
+                await c.get(f"{base}/docs")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    raise RuntimeError("스텁 서버가 시작되지 않았습니다")
+
+
+async def _load(base: str, requests: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=120) as c:
+        sem = asyncio.Semaphore(concurrency)
+        statuses: dict[int, int] = {}
+        done = asyncio.Event()
+        latencies: list[float] = []
+
+        async def report():
+            async with sem:
+                r = await c.post("/api/report/ai", json={"mbti_type": "INTJ", "job": "개발자"})
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        async def probe():
+            while not done.is_set():
+                t = time.perf_counter()
+                await c.get("/api/mbti/questions")
+                latencies.append((time.perf_counter() - t) * 1000)
+                await asyncio.sleep(0.02)
+
+        prober = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(report() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    return {
+        "statuses": statuses,
+        "seconds": elapsed,
+        "reports_per_sec": statuses.get(200, 0) / elapsed,
+        "questions_p50": statistics.median(latencies) if latencies else 0.0,
+        "questions_p99": _percentile(latencies, 0.99),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=2.0, help="스텁 응답 지연(초)")
+    args = parser.parse_args()
+
+    stub_port, app_port = _free_port(), _free_port()
+    stub = subprocess.Popen(
+        [sys.executable, str(Path(__file__).with_name("fake_openai_server.py")),
+         "--port", str(stub_port), "--latency", str(args.latency)],
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "OPENAI_API_KEY": "sk-fake",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{stub_port}/v1",
+        }
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning"],
+            cwd=BACKEND, env=env,
+        )
+        try:
+            base = f"http://127.0.0.1:{app_port}"
+            asyncio.run(_wait_stub(f"http://127.0.0.1:{stub_port}"))
+            asyncio.run(_wait_ready(base))
+            r = asyncio.run(_load(base, args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            stub.terminate()
+            server.wait()
+            stub.wait()
+
+    ideal = args.requests / args.concurrency * args.latency
+    print(f"{args.requests} reports in {r['seconds']:.1f}s (ideal {ideal:.1f}s), {r['reports_per_sec']:.1f}/s, "
+          f"statuses {r['statuses']}")
+    print(f"/api/mbti/questions during load: p50 {r['questions_p50']:.1f} ms, p99 {r['questions_p99']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+로그인 폭주 벤치마크 - 로그인 처리량과 다른 API(/api/mbti/questions) 지연 측정
+
+    python benchmarks/bench_login_storm.py [--logins 200] [--concurrency 32] [--workers 0 4]
+
+--workers 값마다 임시 sqlite DB로 uvicorn을 띄워 PASSWORD_HASH_WORKERS만 바꿔 비교
+(0 = 기존처럼 요청 스레드풀에서 bcrypt 실행)
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def _wait_ready(base: str) -> None:
+    async with httpx.AsyncClient() as c:
+        for _ in range(100):
+            try:
+                if (await c.get(f"{base}/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("서버가 시작되지 않았습니다")
+
+
+async def _storm(base: str, logins: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as c:
+        creds = {"email": "storm@example.com", "password": "storm-password"}
+        await c.post("/api/auth/register", json={**creds, "nickname": "storm"})
+
+        sem = asyncio.Semaphore(concurrency)
+        statuses: dict[int, int] = {}
+        done = asyncio.Event()
+
+        async def login():
+            async with sem:
+                r = await c.post("/api/auth/login", json=creds)
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+        async def probe(latencies: list[float]):
+            while not done.is_set():
+                t = time.perf_counter()
+                await c.get("/api/mbti/questions")
+                latencies.append((time.perf_counter() - t) * 1000)
+                await asyncio.sleep(0.01)
+
+        latencies: list[float] = []
+        prober = asyncio.create_task(probe(latencies))
+        started = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await prober
+
+    return {
+        "statuses": statuses,
+        "logins_per_sec": statuses.get(200, 0) / elapsed,
+        "questions_p50": statistics.median(latencies) if latencies else 0.0,
+        "questions_p99": _percentile(latencies, 0.99),
+        "probes": len(latencies),
+    }
+
+
+def run(workers: int, logins: int, concurrency: int, rounds: int) -> dict:
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+            "PASSWORD_HASH_WORKERS": str(workers),
+            "BCRYPT_ROUNDS": str(rounds),
+        }
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND, env=env,
+        )
+        try:
+            base = f"http://127.0.0.1:{port}"
+            asyncio.run(_wait_ready(base))
+            return asyncio.run(_storm(base, logins, concurrency))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12, help="BCRYPT_ROUNDS")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, min(4, os.cpu_count() or 1)])
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'login/s':>8} {'q p50 ms':>9} {'q p99 ms':>9} {'probes':>6}  statuses")
+    for w in args.workers:
+        r = run(w, args.logins, args.concurrency, args.rounds)
+        print(f"{w:>7} {r['logins_per_sec']:>8.1f} {r['questions_p50']:>9.1f} {r['questions_p99']:>9.1f} "
+              f"{r['probes']:>6}  {r['statuses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+PDF 렌더링 처리량 벤치마크 - 렌더링 프로세스 수별 초당 PDF 수
+
+    python benchmarks/bench_pdf_render.py [--pdfs 400] [--workers 0 1 2 4]
+
+0 = 프로세스 풀 없이 스레드풀에서 렌더링 (GIL 때문에 코어 수와 무관하게 단일 코어 처리량)
+매번 다른 비율로 렌더링해 캐시 없이 순수 렌더링 비용만 측정
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pdf_render import PdfRenderer  # noqa: E402
+from report_templates import MBTI_REPORTS, VALID_MBTI_TYPES  # noqa: E402
+
+
+def _inputs(n: int) -> list[tuple[str, dict, dict]]:
+    out = []
+    for i in range(n):
+        t = VALID_MBTI_TYPES[i % len(VALID_MBTI_TYPES)]
+        e = 50 + i % 50
+        pct = {"EI": {"E": e, "I": 100 - e}, "SN": {"S": 60, "N": 40}, "TF": {"T": 45, "F": 55}, "JP": {"J": 70, "P": 30}}
+        out.append((t, pct, MBTI_REPORTS[t]))
+    return out
+
+
+async def run(workers: int, pdfs: int) -> dict:
+    renderer = PdfRenderer(workers, max_pending=pdfs)
+    renderer.start()
+    try:
+        await renderer.render(*_inputs(1)[0])  # 워커 기동 + 폰트 등록은 측정에서 제외
+        start = time.perf_counter()
+        bodies = await asyncio.gather(*(renderer.render(*args) for args in _inputs(pdfs)))
+        elapsed = time.perf_counter() - start
+    finally:
+        renderer.shutdown()
+    return {"pdfs_per_sec": pdfs / elapsed, "avg_kb": sum(map(len, bodies)) / len(bodies) / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    cores = os.cpu_count() or 1
+    parser.add_argument("--pdfs", type=int, default=400)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({0, 1, min(2, cores), cores}))
+    args = parser.parse_args()
+
+    print(f"cores={cores}")
+    print(f"{'workers':>7} {'pdf/s':>8} {'avg KB':>7}")
+    for w in args.workers:
+        r = asyncio.run(run(w, args.pdfs))
+        print(f"{w:>7} {r['pdfs_per_sec']:>8.1f} {r['avg_kb']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+OpenAI 채팅 완성 API 로컬 스텁 - 오프라인 벤치마크용
+
+    python benchmarks/fake_openai_server.py [--port 8900] [--latency 2.0] [--fail-rate 0.0]
+
+API 서버는 OPENAI_BASE_URL=http://127.0.0.1:8900/v1 OPENAI_API_KEY=sk-fake 로 실행
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI()
+app.state.latency = 2.0
+app.state.fail_rate = 0.0
+_ids = itertools.count(1)
+
+_CAREER_JSON = '{"career_advice": "스텁 커리어 조언", "strength_strategy": "스텁 강점 전략"}'
+
+
+STREAM_PIECES = 20  # stream=True 일 때 응답을 나눠 보내는 조각 수
+
+
+async def _stream(completion_id: str, model: str, content: str):
+    """OpenAI 스트리밍 형식 - 지연을 조각마다 나눠 토큰이 흘러나오는 것처럼"""
+    step = max(1, len(content) // STREAM_PIECES)
+    for i in range(0, len(content), step):
+        await asyncio.sleep(app.state.latency / STREAM_PIECES)
+        chunk = {
+            "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+            "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}],
+        }
+        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    content = _CAREER_JSON if "JSON" in prompt else "스텁 AI 해석입니다."
+    completion_id = f"chatcmpl-fake-{next(_ids)}"
+    if random.random() < app.state.fail_rate:  # 업스트림 장애 흉내 (재시도/서킷 브레이커 확인용)
+        await asyncio.sleep(app.state.latency)
+        return JSONResponse({"error": {"message": "stub failure", "type": "server_error"}}, status_code=500)
+    if body.get("stream"):
+        return StreamingResponse(_stream(completion_id, body.get("model", "gpt-4o-mini"), content),
+                                 media_type="text/event-stream")
+    await asyncio.sleep(app.state.latency)  # LLM 응답 지연 흉내
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": len(prompt), "completion_tokens": len(content), "total_tokens": len(prompt) + len(content)},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=2.0, help="응답 지연(초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="500 응답 비율 (0~1)")
+    args = parser.parse_args()
+    app.state.latency = args.latency
+    app.state.fail_rate = args.fail_rate
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 """
 MBTI 유형별 직무 적합도
+직무마다 4차원 선호 벡터(지표별 -1 ~ 1, 첫 번째 극 E S T J 쪽이 +)를 두고
+사용자의 지표별 퍼센트와 한 번의 행렬 연산으로 순위를 매김
 """
+import numpy as np
+
 from report_templates import VALID_MBTI_TYPES
+from scoring import DIMENSIONS, TYPES_BY_CODE
 
 # 직무군: 개발, 기획, 마케팅, 연구, 상담, 예술, 관리, 영업, 디자인, 교육 등
 CAREER_MATCH = {
@@ -30,3 +35,73 @@ def get_career_recommendations(mbti_type: str) -> dict:
     if key not in VALID_MBTI_TYPES:
         raise ValueError(f"유효하지 않은 MBTI 유형: {mbti_type}")
     return {"mbti_type": key, "recommended_careers": CAREER_MATCH[key]}
+
+
+def type_vector(mbti_type: str) -> np.ndarray:
+    """유형 → 지표별 +1(첫 번째 극) / -1(두 번째 극)"""
+    return np.array([1.0 if p == dim[0] else -1.0 for p, dim in zip(mbti_type, DIMENSIONS)])
+
+
+def _career_profiles(match: dict[str, list[str]]) -> dict[str, np.ndarray]:
+    """추천 유형들의 가중 평균 벡터 (목록 앞쪽일수록 가중치 큼)"""
+    sums: dict[str, np.ndarray] = {}
+    weights: dict[str, float] = {}
+    for mbti_type, careers in match.items():
+        v = type_vector(mbti_type)
+        for rank, career in enumerate(careers):
+            w = float(len(careers) - rank)
+            sums[career] = sums.get(career, 0.0) + w * v
+            weights[career] = weights.get(career, 0.0) + w
+    return {career: sums[career] / weights[career] for career in sums}
+
+
+CAREER_PROFILES = _career_profiles(CAREER_MATCH)
+CAREERS = tuple(CAREER_PROFILES)
+CAREER_VECTORS = np.array([CAREER_PROFILES[c] for c in CAREERS])  # (직무 수, 4)
+_MAX_DISTANCE = 2.0 * np.sqrt(len(DIMENSIONS))  # 반대 꼭짓점 사이 거리
+
+
+def percentages_to_vector(percentages: dict) -> np.ndarray:
+    """결과 percentages({"E/I": {"E": 62.5, "I": 37.5}, ...}) → 지표별 -1 ~ 1"""
+    try:
+        first = np.array([float(percentages[dim][dim[0]]) for dim in DIMENSIONS])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("percentages에는 지표별 첫 번째 극 퍼센트가 있어야 합니다 (예: {\"E/I\": {\"E\": 60}})") from None
+    if not ((first >= 0) & (first <= 100)).all():
+        raise ValueError("percentages 값은 0~100 이어야 합니다")
+    return (first - 50.0) / 50.0
+
+
+def similarity(vectors: np.ndarray, profiles: np.ndarray = CAREER_VECTORS) -> np.ndarray:
+    """(N, 4) 선호 벡터 x (M, 4) 직무 벡터 → (N, M) 적합도 0 ~ 1 (거리 기반 - 선호 강도 반영)"""
+    d = np.linalg.norm(np.atleast_2d(vectors)[:, None, :] - profiles[None, :, :], axis=2)
+    return 1.0 - d / _MAX_DISTANCE
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 상위 k개 인덱스 (내림차순) - 전체 정렬 대신 argpartition"""
+    k = min(k, scores.size)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+def rank_careers(percentages: dict, top_k: int = 10) -> list[dict]:
+    """사용자 퍼센트 기준 전체 직무 순위 상위 top_k"""
+    scores = similarity(percentages_to_vector(percentages))[0]
+    return [{"career": CAREERS[i], "score": round(float(scores[i]), 4)} for i in _top_k(scores, top_k)]
+
+
+# 역색인: 직무 → 잘 맞는 유형 (16개 유형 꼭짓점 기준 점수 내림차순)
+TYPE_VECTORS = np.array([type_vector(t) for t in TYPES_BY_CODE])
+_TYPE_SCORES = similarity(TYPE_VECTORS)  # (16, 직무 수)
+_TYPE_ORDER = np.argsort(-_TYPE_SCORES, axis=0, kind="stable")  # 직무별 유형 순위
+_CAREER_INDEX = {career: i for i, career in enumerate(CAREERS)}
+
+
+def best_types_for_career(career: str, limit: int = 4) -> list[dict]:
+    """이 직무에 잘 맞는 유형 상위 limit개. 없는 직무는 KeyError"""
+    j = _CAREER_INDEX[career]
+    return [
+        {"type": TYPES_BY_CODE[i], "score": round(float(_TYPE_SCORES[i, j]), 4)}
+        for i in _TYPE_ORDER[:limit, j]
+    ]
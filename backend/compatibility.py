@@ -1,7 +1,12 @@
 """
 MBTI 궁합 분석 - 관계 유형, 갈등 포인트, 의사소통 전략
+16 x 16 = 256 쌍 전체를 import 시 한 번 계산해 4비트 유형 코드로 인덱싱하는 불변 표로 보관
 """
+from types import MappingProxyType
+from typing import Mapping
+
 from report_templates import VALID_MBTI_TYPES
+from scoring import TYPE_CODES, TYPES_BY_CODE
 
 RELATIONSHIP_TYPES = {
     "ideal": "이상적",
@@ -88,15 +93,45 @@ def get_long_term_tips(rel_type: str, type_a: str, type_b: str) -> list[str]:
     ]
 
 
-def analyze_compatibility(type_a: str, type_b: str) -> dict:
-    """전체 궁합 분석 - 갈등 포인트, 의사소통 전략, 장기 관계 유지 팁"""
+def _analyze(type_a: str, type_b: str) -> Mapping:
     rel_type = get_relationship_type(type_a, type_b)
-    return {
-        "type_a": type_a.upper(),
-        "type_b": type_b.upper(),
+    return MappingProxyType({
+        "type_a": type_a,
+        "type_b": type_b,
         "relationship_type": RELATIONSHIP_TYPES[rel_type],
         "relationship_key": rel_type,
-        "conflict_points": get_conflict_points(type_a, type_b),
-        "communication_strategy": get_communication_strategy(rel_type, type_a, type_b),
-        "long_term_tips": get_long_term_tips(rel_type, type_a, type_b),
+        "conflict_points": tuple(get_conflict_points(type_a, type_b)),
+        "communication_strategy": tuple(get_communication_strategy(rel_type, type_a, type_b)),
+        "long_term_tips": tuple(get_long_term_tips(rel_type, type_a, type_b)),
+    })
+
+
+# COMPATIBILITY_MATRIX[code_a][code_b] - 읽기 전용 (목록은 tuple)
+COMPATIBILITY_MATRIX = tuple(tuple(_analyze(a, b) for b in TYPES_BY_CODE) for a in TYPES_BY_CODE)
+
+
+def compatibility_entry(type_a: str, type_b: str) -> Mapping:
+    """두 유형의 사전 계산된 궁합 항목 (읽기 전용)"""
+    code_a, code_b = TYPE_CODES.get(type_a.upper()), TYPE_CODES.get(type_b.upper())
+    if code_a is None or code_b is None:
+        raise ValueError("유효하지 않은 MBTI 유형")
+    return COMPATIBILITY_MATRIX[code_a][code_b]
+
+
+def analyze_compatibility(type_a: str, type_b: str) -> dict:
+    """전체 궁합 분석 - 갈등 포인트, 의사소통 전략, 장기 관계 유지 팁"""
+    return dict(compatibility_entry(type_a, type_b))
+
+
+def compatibility_matrix() -> dict:
+    """궁합 표 전체 - 유형 순서는 4비트 코드 순. 관계 유형별로 같은 전략/팁은 한 번만 포함"""
+    return {
+        "types": list(TYPES_BY_CODE),
+        "relationship_types": RELATIONSHIP_TYPES,
+        "communication_strategy": {k: get_communication_strategy(k, "", "") for k in RELATIONSHIP_TYPES},
+        "long_term_tips": {k: get_long_term_tips(k, "", "") for k in RELATIONSHIP_TYPES},
+        "matrix": [
+            [{"relationship_key": e["relationship_key"], "conflict_points": list(e["conflict_points"])} for e in row]
+            for row in COMPATIBILITY_MATRIX
+        ],
     }
@@ -6,9 +6,11 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+import main
 from database import Base, get_db
 from main import app
-from models import User, MbtiSession, Share, UserResult
+from models import User, MbtiSession, ArchivedMbtiSession, AiCacheEntry, Share, UserResult
+from pdf_cache import PdfCache
 
 # 테스트용 in-memory DB
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -21,9 +23,10 @@ TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_
 
 
 @pytest.fixture(autouse=True)
-def setup_test_db():
-    """모든 테스트 전에 DB 초기화"""
+def setup_test_db(tmp_path, monkeypatch):
+    """모든 테스트 전에 DB 초기화 + 테스트별 PDF 캐시 (실제 캐시 디렉터리를 쓰지 않도록)"""
     Base.metadata.create_all(bind=test_engine)
+    monkeypatch.setattr(main, "pdf_cache", PdfCache(str(tmp_path / "pdf_cache")))
 
     def override_get_db():
         db = TestingSessionLocal()
@@ -38,7 +38,7 @@ def get_db():
 
 
 def init_db():
-    from models import User, MbtiSession, Share, UserResult
+    from models import User, MbtiSession, ArchivedMbtiSession, AiCacheEntry, Share, UserResult
     try:
         Base.metadata.create_all(bind=engine)
     except Exception as e:
@@ -1,7 +1,12 @@
 """
 MindMBTI - MBTI 기반 심리 분석 서비스 API
 """
+import asyncio
+import csv
+import io
+import json
 import os
+import re
 from pathlib import Path
 from contextlib import asynccontextmanager
 
@@ -10,19 +15,50 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 import uuid
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional, Union
 
-from fastapi import FastAPI, HTTPException, Depends
-from fastapi.responses import Response
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr, Field
-import bcrypt
+from pydantic import BaseModel, EmailStr, Field, PrivateAttr, ValidationError, model_validator
+import numpy as np
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-
-from database import get_db, init_db
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, defer
+from sqlalchemy.orm.exc import StaleDataError
+
+import ai_cache
+from ai_cache import cached_complete, cached_stream, entry_count
+from ai_client import close_ai_client, get_ai_client
+from ai_jobs import JobQueue, QueueFull
+from ai_prompts import career_advice_prompt, report_prompt
+from autosave_buffer import WriteBehindBuffer, WriteBehindFull
+from cache import TTLCache
+from database import SessionLocal, get_db, init_db
+from maintenance import periodic_purge_from_env
 from models import User, MbtiSession, Share, UserResult
+from passwords import HashPoolBusy, PasswordHasher
+from pdf_cache import PdfCache, pdf_key, serve_pdf
+from pdf_render import PdfRenderer, RenderPoolBusy
+from shares import expand_share, share_record
+from singleflight import SingleFlight
+from static_responses import StaticResponse, render_table, serve
+from zip_stream import ZipStream
+
+
+# 세션 자동 저장 write-behind 버퍼 (MBTI_WRITE_BEHIND=1 일 때만)
+write_behind = WriteBehindBuffer.from_env()
+# bcrypt 전용 프로세스 풀
+password_hasher = PasswordHasher.from_env()
+# AI 작업 큐 (동시 실행 제한 + 재시도 + 서킷 브레이커)
+ai_jobs = JobQueue.from_env()
+# 생성된 PDF 캐시 (메모리 LRU + 디스크)
+pdf_cache = PdfCache.from_env()
+# PDF 렌더링 전용 프로세스 풀, 같은 PDF 동시 렌더링은 하나로 합침
+pdf_renderer = PdfRenderer.from_env()
+pdf_flights = SingleFlight()
 
 
 @asynccontextmanager
@@ -32,8 +68,25 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         import logging
         logging.getLogger(__name__).exception("DB init failed (app will start anyway): %s", e)
+    if write_behind is not None:
+        write_behind.start()
+    password_hasher.start()
+    pdf_renderer.start()
+    get_ai_client()
+    ai_jobs.start()
+    purge = periodic_purge_from_env(SessionLocal)
+    purge_task = asyncio.create_task(purge) if purge else None
     yield
-    pass
+    if purge_task is not None:
+        purge_task.cancel()
+    if write_behind is not None:
+        await write_behind.stop()
+    password_hasher.shutdown()
+    pdf_renderer.shutdown()
+    await ai_jobs.stop()
+    with SessionLocal() as db:  # 모아 둔 AI 캐시 적중 기록
+        ai_cache.flush_hits(db)
+    await close_ai_client()
 
 
 app = FastAPI(title="MindMBTI API", lifespan=lifespan)
@@ -62,32 +115,69 @@ class LoginRequest(BaseModel):
     password: str
 
 
+# 인증 캐시 - 토큰 디코딩 결과(token → user_id)와 회원 존재 확인(user_id → True)
+_token_cache = TTLCache(maxsize=10000, ttl=300)
+_user_exists_cache = TTLCache(maxsize=10000, ttl=60)
+
+
+def _decode_user_id(token: str) -> Optional[str]:
+    """JWT → user_id (캐시). 유효하지 않으면 JWTError"""
+    uid = _token_cache.get(token)
+    if uid is None:
+        uid = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        if uid:
+            _token_cache.set(token, uid)
+    return uid
+
+
+def invalidate_user_cache(user_id: str) -> None:
+    """회원 정보 변경/삭제 시 호출"""
+    _user_exists_cache.pop(user_id)
+
+
 def get_current_user_id(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)) -> Optional[str]:
     if not credentials:
         return None
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
+        return _decode_user_id(credentials.credentials)
     except JWTError:
         return None
 
 
+def _required_uid(credentials: HTTPAuthorizationCredentials) -> str:
+    try:
+        uid = _decode_user_id(credentials.credentials)
+    except JWTError:
+        raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
+    if not uid:
+        raise HTTPException(status_code=401, detail="인증이 필요합니다")
+    return uid
+
+
+def get_required_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security_required),
+    db: Session = Depends(get_db),
+) -> User:
+    """로그인 필수 - 회원 객체가 필요한 엔드포인트용 (조회 1회). 인증 실패 시 401"""
+    uid = _required_uid(credentials)
+    user = db.get(User, uid)
+    if not user:
+        raise HTTPException(status_code=401, detail="인증이 필요합니다")
+    _user_exists_cache.set(uid, True)
+    return user
+
+
 def get_required_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security_required),
     db: Session = Depends(get_db),
 ) -> str:
-    """로그인 필수 - 인증 실패 시 401"""
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        uid = payload.get("sub")
-        if not uid:
-            raise HTTPException(status_code=401, detail="인증이 필요합니다")
-        user = db.query(User).filter(User.id == uid).first()
-        if not user:
+    """로그인 필수 - 회원 존재 확인은 캐시 우선. 인증 실패 시 401"""
+    uid = _required_uid(credentials)
+    if not _user_exists_cache.get(uid):
+        if db.query(User.id).filter(User.id == uid).first() is None:
             raise HTTPException(status_code=401, detail="인증이 필요합니다")
-        return uid
-    except JWTError:
-        raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
+        _user_exists_cache.set(uid, True)
+    return uid
 
 
 @app.get("/")
@@ -101,27 +191,50 @@ def health():
     return {"ok": True}
 
 
+def _password_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _find_user_by_email(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _create_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
 @app.post("/api/auth/register")
-def register(req: RegisterRequest, db: Session = Depends(get_db)):
+async def register(req: RegisterRequest, db: Session = Depends(get_db)):
     """회원가입 - 이메일, 비밀번호, 닉네임"""
-    if db.query(User).filter(User.email == req.email).first():
+    if await run_in_threadpool(_find_user_by_email, db, req.email):
         raise HTTPException(status_code=400, detail="이메일이 이미 등록되어 있습니다")
     user_id = str(uuid.uuid4())
-    password_hash = bcrypt.hashpw(req.password.encode(), bcrypt.gensalt()).decode()
+    try:
+        password_hash = await password_hasher.hash(req.password)
+    except HashPoolBusy:
+        raise _password_busy()
     user = User(
         id=user_id, email=req.email, password_hash=password_hash, nickname=req.nickname,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await run_in_threadpool(_create_user, db, user)
     return {"id": user_id, "email": req.email, "nickname": req.nickname}
 
 
 @app.post("/api/auth/login")
-def login(req: LoginRequest, db: Session = Depends(get_db)):
+async def login(req: LoginRequest, db: Session = Depends(get_db)):
     """로그인 - 이메일, 비밀번호 → JWT 반환"""
-    user = db.query(User).filter(User.email == req.email).first()
-    if not user or not bcrypt.checkpw(req.password.encode(), user.password_hash.encode()):
+    user = await run_in_threadpool(_find_user_by_email, db, req.email)
+    try:
+        ok = bool(user) and await password_hasher.verify(req.password, user.password_hash)
+    except HashPoolBusy:
+        raise _password_busy()
+    if not ok:
         raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다")
     token = jwt.encode({"sub": user.id}, SECRET_KEY, algorithm=ALGORITHM)
     return {"access_token": token, "token_type": "bearer"}
@@ -154,24 +267,18 @@ def _user_to_dict(user: User) -> dict:
 
 
 @app.get("/api/user/me")
-def get_my_profile(user_id: str = Depends(get_required_user_id), db: Session = Depends(get_db)):
+def get_my_profile(user: User = Depends(get_required_user)):
     """내 프로필 조회"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다")
     return _user_to_dict(user)
 
 
 @app.patch("/api/user/me")
 def update_my_profile(
     req: ProfileUpdateRequest,
-    user_id: str = Depends(get_required_user_id),
+    user: User = Depends(get_required_user),
     db: Session = Depends(get_db),
 ):
     """회원정보 수정 - 닉네임, 성별, 연령대, 프로필 이미지 URL"""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다")
     if req.nickname is not None:
         user.nickname = req.nickname
     if req.gender is not None:
@@ -185,12 +292,18 @@ def update_my_profile(
     if req.profile_image_url is not None:
         user.profile_image_url = req.profile_image_url if req.profile_image_url else None
     db.commit()
+    invalidate_user_cache(user.id)
     db.refresh(user)
     return _user_to_dict(user)
 
 
 # --- Phase 2: MBTI 설문 및 결과 ---
 from mbti_questions import MBTI_QUESTIONS
+from answer_codec import parse_compact_answers
+from scoring import answers_to_array
+from session_store import (
+    apply_answers, merge_answers, new_session, new_session_rows, session_result, session_results,
+)
 
 
 class AnswerItem(BaseModel):
@@ -198,90 +311,287 @@ class AnswerItem(BaseModel):
     value: int = Field(..., ge=1, le=5)
 
 
-class SubmitRequest(BaseModel):
+class _AnswersPayload(BaseModel):
+    # [{question_id, value}, ...] 또는 간단 형식: 길이 48 정수 배열 / 48자리 숫자 문자열 (0 = 미응답)
+    answers: Union[list[AnswerItem], list[int], str]
+    _answers_array: np.ndarray = PrivateAttr()
+
+    @model_validator(mode="after")
+    def _parse_answers(self):
+        if isinstance(self.answers, str) or (self.answers and isinstance(self.answers[0], int)):
+            self._answers_array = parse_compact_answers(self.answers)
+        else:
+            self._answers_array = answers_to_array({a.question_id: a.value for a in self.answers})
+        return self
+
+    def answers_array(self) -> np.ndarray:
+        """길이 48 응답 배열 (0 = 미응답)"""
+        return self._answers_array
+
+
+class SubmitRequest(_AnswersPayload):
     session_id: Optional[str] = None
-    answers: list[AnswerItem]
+
+
+class AnswersPatchRequest(_AnswersPayload):
+    version: int  # 클라이언트가 마지막으로 받은 세션 버전
+
+
+_QUESTIONS_RESPONSE = StaticResponse.render({"questions": MBTI_QUESTIONS})
 
 
 @app.get("/api/mbti/questions")
-def get_mbti_questions():
-    """48문항 MBTI 설문 반환"""
-    return {"questions": MBTI_QUESTIONS}
+def get_mbti_questions(request: Request):
+    """48문항 MBTI 설문 반환 (사전 렌더링)"""
+    return serve(request, _QUESTIONS_RESPONSE)
 
 
 @app.post("/api/mbti/submit")
 def submit_mbti(req: SubmitRequest, db: Session = Depends(get_db)):
     """검사 답변 제출, 중간 저장"""
     sid = req.session_id or str(uuid.uuid4())
-    answers_dict = {a.question_id: a.value for a in req.answers}
-    sess = db.query(MbtiSession).filter(MbtiSession.id == sid).first()
+    answers = req.answers_array()
+    saved = int(np.count_nonzero(answers))
+    if write_behind is not None:
+        def stage(sess):
+            if sess is None:
+                return new_session(sid, answers), saved
+            return sess, apply_answers(sess, answers)
+
+        sess, _ = _stage(db, sid, stage)
+        return {"session_id": sid, "saved": saved, "version": sess.version}
+    sess = _get_session(db, sid)
     if sess:
-        sess.answers = answers_dict
-        sess.updated_at = datetime.utcnow()
+        if apply_answers(sess, answers):
+            sess.updated_at = datetime.utcnow()
     else:
-        sess = MbtiSession(id=sid, answers=answers_dict)
+        sess = new_session(sid, answers)
         db.add(sess)
-    db.commit()
-    return {"session_id": sid, "saved": len(answers_dict)}
+    _commit_session(db)
+    return {"session_id": sid, "saved": saved, "version": sess.version}
 
 
-def _compute_mbti_result(answers: dict[int, int]) -> dict:
-    """점수 기반 MBTI 유형 계산"""
-    dim_scores: dict[str, dict[str, float]] = {
-        "E/I": {"E": 0.0, "I": 0.0},
-        "S/N": {"S": 0.0, "N": 0.0},
-        "T/F": {"T": 0.0, "F": 0.0},
-        "J/P": {"J": 0.0, "P": 0.0},
-    }
-    q_by_dim = {}
-    for q in MBTI_QUESTIONS:
-        dim = q["dimension"]
-        if dim not in q_by_dim:
-            q_by_dim[dim] = []
-        q_by_dim[dim].append(q)
-    for dim, poles in dim_scores.items():
-        for q in q_by_dim.get(dim, []):
-            qid, pos = q["id"], q["positive_pole"]
-            neg = dim.split("/")[1] if pos == dim[0] else dim[0]
-            val = answers.get(qid, 3)
-            poles[pos] += val
-            poles[neg] += 6 - val
-    mbti_type = ""
-    percentages = {}
-    for dim, poles in dim_scores.items():
-        a, b = dim[0], dim[2]
-        sa, sb = poles[a], poles[b]
-        total = sa + sb
-        mbti_type += a if sa >= sb else b
-        pct = round((sa / total * 100) if total > 0 else 50, 1)
-        percentages[dim] = {a: pct, b: round(100 - pct, 1)}
-    return {"type": mbti_type, "percentages": percentages}
+def _stage(db: Session, session_id: str, fn) -> tuple[MbtiSession | None, int]:
+    """write-behind 버퍼에 변경 반영 - DB 반영이 밀려 버퍼가 가득 차면 503 (새 세션만)"""
+    try:
+        return write_behind.modify(session_id, lambda: _get_session(db, session_id), fn)
+    except WriteBehindFull:
+        raise HTTPException(
+            status_code=503,
+            detail="저장 요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요",
+            headers={"Retry-After": str(max(1, round(write_behind.interval)))},
+        )
+
+
+def _get_session(db: Session, session_id: str) -> MbtiSession | None:
+    return db.query(MbtiSession).filter(MbtiSession.id == session_id).first()
+
+
+def _commit_session(db: Session) -> None:
+    """세션 버전 충돌 (다른 탭/기기에서 먼저 저장) 시 409"""
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="다른 곳에서 답변이 먼저 저장되었습니다. 새로고침 후 다시 시도해 주세요")
+
+
+@app.patch("/api/mbti/session/{session_id}/answers")
+def patch_mbti_answers(session_id: str, req: AnswersPatchRequest, db: Session = Depends(get_db)):
+    """변경된 답변만 병합 저장 - version 불일치 시 409 (낙관적 동시성 제어)"""
+    patch = req.answers_array()
+
+    def merge(sess):
+        if not sess:
+            raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
+        if sess.version != req.version:
+            raise HTTPException(
+                status_code=409,
+                detail="세션 버전이 일치하지 않습니다",
+                headers={"X-Session-Version": str(sess.version)},
+            )
+        return sess, merge_answers(sess, patch)
+
+    if write_behind is not None:
+        sess, changed = _stage(db, session_id, merge)
+    else:
+        sess, changed = merge(_get_session(db, session_id))
+        if changed:
+            sess.updated_at = datetime.utcnow()
+            _commit_session(db)
+    return {"session_id": session_id, "changed": changed, "answered": sess.answered_count, "version": sess.version}
+
+
+_SKIP_ANSWERS = (defer(MbtiSession.answers), defer(MbtiSession.answers_packed))
+
+
+def _load_session(db: Session, session_id: str) -> MbtiSession | None:
+    """결과 조회용 세션 로드 - 결과 컬럼/누적 점수만 읽고 답변은 로드하지 않음. write-behind 버퍼 우선"""
+    if write_behind is not None and (buffered := write_behind.get(session_id)) is not None:
+        return buffered
+    return (
+        db.query(MbtiSession)
+        .options(*_SKIP_ANSWERS)
+        .filter(MbtiSession.id == session_id)
+        .first()
+    )
 
 
 @app.get("/api/mbti/result/{session_id}")
 def get_mbti_result(session_id: str, db: Session = Depends(get_db)):
     """MBTI 결과 조회 - 유형 + 퍼센트"""
-    sess = db.query(MbtiSession).filter(MbtiSession.id == session_id).first()
+    sess = _load_session(db, session_id)
     if not sess:
         raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다")
-    answers = sess.answers or {}
-    if len(answers) < 48:
+    result = session_result(sess)
+    if result is None:
         raise HTTPException(status_code=400, detail="모든 문항에 답변해 주세요")
-    result = _compute_mbti_result(answers)
     return {"session_id": session_id, **result}
 
 
+def _load_results(db: Session, ids: list[str]) -> dict[str, Optional[dict]]:
+    """여러 세션 결과 - IN 쿼리 1회 + 행렬 채점 1회. 없는 세션은 키 없음, 미완료는 None"""
+    found = {}
+    if write_behind is not None:
+        found = {sid: sess for sid in ids if (sess := write_behind.get(sid)) is not None}
+    rest = [sid for sid in ids if sid not in found]
+    rows = db.query(MbtiSession).options(*_SKIP_ANSWERS).filter(MbtiSession.id.in_(rest)).all() if rest else []
+    found.update((sess.id, sess) for sess in rows)
+    present = [sid for sid in ids if sid in found]
+    return dict(zip(present, session_results([found[sid] for sid in present])))
+
+
+class BatchResultRequest(BaseModel):
+    session_ids: list[str] = Field(..., min_length=1, max_length=1000)
+
+
+@app.post("/api/mbti/result/batch")
+def get_mbti_results_batch(req: BatchResultRequest, db: Session = Depends(get_db)):
+    """여러 세션 결과 일괄 조회 - IN 쿼리 1회 + 행렬 채점 1회"""
+    ids = list(dict.fromkeys(req.session_ids))
+    scored = _load_results(db, ids)
+    complete = [sid for sid in ids if scored.get(sid) is not None]
+    return {
+        "results": [{"session_id": sid, **scored[sid]} for sid in complete],
+        "not_found": [sid for sid in ids if sid not in scored],
+        "incomplete": [sid for sid in ids if sid in scored and scored[sid] is None],
+    }
+
+
+# --- 기관 검사 일괄 등록 (NDJSON 스트리밍) ---
+IMPORT_CHUNK_SIZE = 500
+IMPORT_MAX_LINE_BYTES = 64 * 1024
+
+
+class ImportLine(_AnswersPayload):
+    external_id: Optional[str] = Field(None, max_length=200)  # 응답 행 매칭용 (답안지 번호 등)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """요청 본문을 읽으면서 응답을 내보내는 스트리밍 응답
+
+    StreamingResponse의 연결 종료 감시 태스크는 receive()로 본문 청크를 가로채므로 사용하지 않음.
+    연결 종료는 본문을 읽는 쪽(ClientDisconnect)과 전송 실패로 감지
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+async def _ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes | None]]:
+    """바이트 청크 → (줄 번호, 줄). 너무 긴 줄은 버리고 None으로 표시 (메모리 상한)"""
+    buf, n, overflow = b"", 0, False
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            n += 1
+            if overflow:
+                yield n, None
+                overflow = False
+            elif line.strip():
+                yield n, line
+        if len(buf) > IMPORT_MAX_LINE_BYTES:
+            buf, overflow = b"", True
+    if buf.strip() or overflow:
+        yield n + 1, None if overflow else buf
+
+
+def _insert_import_chunk(
+    db: Session, chunk: list[tuple[int, ImportLine]], owner_id: str, cohort: Optional[str] = None,
+) -> list[dict]:
+    """검증된 줄 묶음을 bulk INSERT 1회 + 행렬 채점 1회로 등록"""
+    ids = [str(uuid.uuid4()) for _ in chunk]
+    rows, results = new_session_rows(ids, np.stack([item.answers_array() for _, item in chunk]))
+    for row in rows:
+        row["owner_id"] = owner_id
+        row["cohort"] = cohort
+    db.execute(insert(MbtiSession), rows)
+    db.commit()
+    out = []
+    for (n, item), sid, row, res in zip(chunk, ids, rows, results):
+        out.append({
+            "line": n, "external_id": item.external_id, "session_id": sid,
+            "answered": row["answered_count"], **(res or {"type": None, "percentages": None}),
+        })
+    return out
+
+
+@app.post("/api/mbti/import")
+async def import_sessions(
+    request: Request,
+    cohort: Optional[str] = Query(None, min_length=1, max_length=100),
+    user_id: str = Depends(get_required_user_id),
+    db: Session = Depends(get_db),
+):
+    """검사 답안 일괄 등록 (로그인 필수) - NDJSON 한 줄에 한 명 ({"answers": ..., "external_id": ...}), 결과도 NDJSON으로 스트리밍
+    ?cohort=캠페인명 을 주면 등록된 세션 전체를 그 캠페인으로 묶음 (POST /api/mbti/export/pdf 로 일괄 내보내기)
+    캠페인은 등록한 회원별로 구분 - 같은 이름이어도 다른 회원의 캠페인에는 섞이지 않음
+
+    본문을 줄 단위로 읽어 500건씩 INSERT/채점하므로 업로드 크기와 무관하게 메모리 사용량 일정.
+    응답은 업로드 도중에도 전송되므로 클라이언트는 업로드와 동시에 응답을 읽어야 함
+    """
+    async def results() -> AsyncIterator[bytes]:
+        chunk: list[tuple[int, ImportLine]] = []
+        imported = errors = 0
+        async for n, line in _ndjson_lines(request.stream()):
+            try:
+                if line is None:
+                    raise ValueError(f"한 줄은 {IMPORT_MAX_LINE_BYTES}바이트를 넘을 수 없습니다")
+                chunk.append((n, ImportLine.model_validate_json(line)))
+            except ValueError as e:  # pydantic ValidationError 포함
+                errors += 1
+                msg = e.errors()[0]["msg"] if isinstance(e, ValidationError) else str(e)
+                yield json.dumps({"line": n, "error": msg}, ensure_ascii=False).encode() + b"\n"
+                continue
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                out = await run_in_threadpool(_insert_import_chunk, db, chunk, user_id, cohort)
+                imported += len(out)
+                chunk = []
+                yield "".join(json.dumps(o, ensure_ascii=False) + "\n" for o in out).encode()
+        if chunk:
+            out = await run_in_threadpool(_insert_import_chunk, db, chunk, user_id, cohort)
+            imported += len(out)
+            yield "".join(json.dumps(o, ensure_ascii=False) + "\n" for o in out).encode()
+        yield json.dumps({"summary": {"imported": imported, "errors": errors}}).encode() + b"\n"
+
+    return _DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+
 # --- Phase 3: 심리 분석 리포트 ---
-from report_templates import MBTI_REPORTS, VALID_MBTI_TYPES
+from report_templates import MBTI_REPORTS, VALID_MBTI_TYPES, report_for
+
+
+_BASIC_REPORT_RESPONSES = render_table({t: {"mbti_type": t, **MBTI_REPORTS[t]} for t in VALID_MBTI_TYPES})
 
 
 @app.get("/api/report/basic/{mbti_type}")
-def get_basic_report(mbti_type: str):
+def get_basic_report(mbti_type: str, request: Request):
     """MBTI 유형별 기본 리포트 - 성격 키워드, 강점, 약점, 스트레스 반응, 의사결정 스타일"""
-    key = mbti_type.upper()
-    if key not in VALID_MBTI_TYPES:
+    entry = _BASIC_REPORT_RESPONSES.get(mbti_type.upper())
+    if entry is None:
         raise HTTPException(status_code=400, detail=f"유효하지 않은 MBTI 유형: {mbti_type}")
-    return {"mbti_type": key, **MBTI_REPORTS[key]}
+    return serve(request, entry)
 
 
 class AiReportRequest(BaseModel):
@@ -291,52 +601,68 @@ class AiReportRequest(BaseModel):
     relationship_concern: Optional[str] = None
 
 
-@app.post("/api/report/ai")
-def generate_ai_report(req: AiReportRequest):
-    """AI 맞춤 해석 생성 - 직업, 현재 고민, 관계 고민 기반"""
-    key = req.mbti_type.upper()
+def _require_ai(mbti_type: str):
+    """AI 엔드포인트 공통 검사 → (대문자 유형, 클라이언트). 유형 오류 400, API 키 없음 503"""
+    key = mbti_type.upper()
     if key not in VALID_MBTI_TYPES:
-        raise HTTPException(status_code=400, detail=f"유효하지 않은 MBTI 유형: {req.mbti_type}")
-
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 MBTI 유형: {mbti_type}")
+    client = get_ai_client()
+    if client is None:
         raise HTTPException(status_code=503, detail="OPENAI_API_KEY가 설정되지 않았습니다. 관리자에게 문의하세요.")
+    return key, client
+
 
-    from openai import OpenAI
-    client = OpenAI(api_key=api_key)
-    base_info = MBTI_REPORTS[key]
-    user_input = []
-    if req.job:
-        user_input.append(f"직업: {req.job}")
-    if req.current_concern:
-        user_input.append(f"현재 고민: {req.current_concern}")
-    if req.relationship_concern:
-        user_input.append(f"관계 고민: {req.relationship_concern}")
-    prompt = f"""당신은 MBTI 기반 심리 분석 전문가입니다.
-사용자의 MBTI 유형은 {key}이며, 기본 성격 특성은 다음과 같습니다:
-- 키워드: {', '.join(base_info['keywords'])}
-- 강점: {base_info['strengths']}
-- 약점: {base_info['weaknesses']}
-- 스트레스 반응: {base_info['stress_reaction']}
-- 의사결정 스타일: {base_info['decision_style']}
-
-사용자 입력:
-{chr(10).join(user_input) if user_input else '(추가 입력 없음)'}
-
-위 정보를 바탕으로 200자 내외로 맞춤 심리 해석을 작성해 주세요. 따뜻하고 구체적으로 작성하며, 한국어로 답변하세요."""
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
 
+
+async def _sse_events(pieces: AsyncIterator[str], result) -> AsyncIterator[bytes]:
+    """텍스트 조각 → token 이벤트들 + done(result(전체 텍스트)) 또는 error 이벤트"""
+    received = []
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500,
-        )
-        text = resp.choices[0].message.content
+        async for piece in pieces:
+            received.append(piece)
+            yield _sse("token", {"text": piece})
+    except Exception as e:
+        yield _sse("error", {"detail": f"AI 생성 중 오류: {str(e)}"})
+        return
+    yield _sse("done", result("".join(received)))
+
+
+def _sse_response(events: AsyncIterator[bytes]) -> StreamingResponse:
+    # 프록시 버퍼링 끄기 (nginx)
+    return StreamingResponse(
+        events, media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/report/ai")
+async def generate_ai_report(req: AiReportRequest, db: Session = Depends(get_db)):
+    """AI 맞춤 해석 생성 - 직업, 현재 고민, 관계 고민 기반"""
+    key, client = _require_ai(req.mbti_type)
+    prompt = report_prompt(key, req.job, req.current_concern, req.relationship_concern)
+    try:
+        text = await cached_complete(db, "report", client, prompt, max_tokens=500)
         return {"mbti_type": key, "ai_interpretation": text}
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"AI 생성 중 오류: {str(e)}")
 
 
+@app.post("/api/report/ai/stream")
+async def generate_ai_report_stream(req: AiReportRequest, db: Session = Depends(get_db)):
+    """AI 맞춤 해석 SSE 스트리밍 - token 이벤트로 조각 전송, 마지막 done 이벤트에 전체 결과"""
+    key, client = _require_ai(req.mbti_type)
+    prompt = report_prompt(key, req.job, req.current_concern, req.relationship_concern)
+    pieces = cached_stream(db, "report", client, prompt, max_tokens=500)
+    return _sse_response(_sse_events(pieces, lambda text: {"mbti_type": key, "ai_interpretation": text}))
+
+
+@app.get("/api/ai/cache/stats")
+def ai_cache_stats(db: Session = Depends(get_db)):
+    """AI 응답 캐시 항목 수와 엔드포인트별 적중률 (적중/미스는 이 워커 기준)"""
+    return {"entries": entry_count(db), "endpoints": ai_cache.stats.snapshot()}
+
+
 # --- FR-022: PDF 다운로드 & 공유 링크 ---
 class ShareRequest(BaseModel):
     session_id: str
@@ -344,80 +670,189 @@ class ShareRequest(BaseModel):
 
 def _get_full_result(db: Session, session_id: str) -> dict | None:
     """세션 결과 + 기본 리포트 조합"""
-    sess = db.query(MbtiSession).filter(MbtiSession.id == session_id).first()
-    if not sess or len(sess.answers or {}) < 48:
+    sess = _load_session(db, session_id)
+    result = session_result(sess) if sess else None
+    if result is None:
         return None
-    result = _compute_mbti_result(sess.answers)
-    key = result.get("type", "")
-    report = MBTI_REPORTS.get(key, {}) if key in VALID_MBTI_TYPES else {}
-    return {**result, "session_id": session_id, "report": report}
+    return {**result, "session_id": session_id, "report": report_for(result.get("type", ""))}
+
+
+# 공유 결과는 만든 뒤 바뀌지 않음 - CDN/브라우저가 재검증 없이 보관
+SHARE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 자주 열리는 공유 결과 read-through 캐시 - (응답 데이터, 사전 직렬화 응답)
+share_cache = TTLCache(
+    maxsize=int(os.getenv("SHARE_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("SHARE_CACHE_TTL", "3600")),
+)
 
 
 @app.post("/api/share")
 def create_share(req: ShareRequest, db: Session = Depends(get_db)):
-    """공유 링크 생성 - session_id로 결과 저장 후 share_id 반환"""
+    """공유 링크 생성 - session_id로 결과(유형, 퍼센트, 리포트 템플릿 버전) 저장 후 share_id 반환"""
     data = _get_full_result(db, req.session_id)
     if not data:
         raise HTTPException(status_code=400, detail="완료된 검사 결과가 없습니다")
     share_id = str(uuid.uuid4())[:8]
-    rec = Share(id=share_id, data=data)
+    rec = Share(id=share_id, data=share_record(data, req.session_id))
     db.add(rec)
     db.commit()
     return {"share_id": share_id, "share_url": f"/share/{share_id}"}
 
 
-@app.get("/api/share/{share_id}")
-def get_share(share_id: str, db: Session = Depends(get_db)):
-    """공유된 결과 조회"""
+def _find_share(db: Session, share_id: str) -> Share:
     rec = db.query(Share).filter(Share.id == share_id).first()
     if not rec:
         raise HTTPException(status_code=404, detail="공유 링크를 찾을 수 없습니다")
-    return rec.data
+    return rec
+
+
+def _cached_share(db: Session, share_id: str) -> tuple[dict, StaticResponse]:
+    """공유 결과 (리포트 조인 포함) - 캐시 미스일 때만 DB 조회 + 직렬화"""
+    hit = share_cache.get(share_id)
+    if hit is None:
+        data = expand_share(_find_share(db, share_id).data)
+        hit = (data, StaticResponse.render(data))
+        share_cache.set(share_id, hit)
+    return hit
+
+
+@app.get("/api/share/{share_id}")
+def get_share(share_id: str, request: Request, db: Session = Depends(get_db)):
+    """공유된 결과 조회"""
+    _, entry = _cached_share(db, share_id)
+    return serve(request, entry, cache_control=SHARE_CACHE_CONTROL)
+
+
+async def _pdf_response(request: Request, data: dict) -> Response:
+    """결과 PDF - 같은 입력은 캐시에서 (ETag/Last-Modified 조건부 요청 지원), 미스 시 렌더링 프로세스 풀에서 생성"""
+    mbti_type, percentages, report = data.get("type", ""), data.get("percentages", {}), data.get("report", {})
+    key = pdf_key(mbti_type, percentages, report)
+    entry = await run_in_threadpool(pdf_cache.get, key)
+    if entry is None:
+        async def render():
+            body = await pdf_renderer.render(mbti_type, percentages, report)
+            return await run_in_threadpool(pdf_cache.put, key, body)
+
+        try:
+            entry, _ = await pdf_flights.do(key, render)
+        except RenderPoolBusy:
+            raise HTTPException(
+                status_code=503,
+                detail="PDF 생성 요청이 많습니다. 잠시 후 다시 시도해 주세요",
+                headers={"Retry-After": "1"},
+            )
+    return serve_pdf(request, entry, f'MindMBTI_{mbti_type or "result"}.pdf')
 
 
 @app.get("/api/share/{share_id}/pdf")
-def download_share_pdf(share_id: str, db: Session = Depends(get_db)):
+async def download_share_pdf(share_id: str, request: Request, db: Session = Depends(get_db)):
     """공유 결과 PDF 다운로드"""
-    rec = db.query(Share).filter(Share.id == share_id).first()
-    if not rec:
-        raise HTTPException(status_code=404, detail="공유 링크를 찾을 수 없습니다")
-    data = rec.data
-    from pdf_utils import create_mbti_pdf
-    pdf_bytes = create_mbti_pdf(
-        data.get("type", ""),
-        data.get("percentages", {}),
-        data.get("report", {}),
-    )
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="MindMBTI_{data.get("type", "result")}.pdf"'},
-    )
+    data, _ = await run_in_threadpool(_cached_share, db, share_id)
+    return await _pdf_response(request, data)
 
 
 # session_id로 직접 PDF 다운로드 (공유 없이)
 @app.get("/api/mbti/result/{session_id}/pdf")
-def download_result_pdf(session_id: str, db: Session = Depends(get_db)):
+async def download_result_pdf(session_id: str, request: Request, db: Session = Depends(get_db)):
     """검사 결과 PDF 다운로드"""
-    data = _get_full_result(db, session_id)
+    data = await run_in_threadpool(_get_full_result, db, session_id)
     if not data:
         raise HTTPException(status_code=400, detail="완료된 검사 결과가 없습니다")
-    from pdf_utils import create_mbti_pdf
-    pdf_bytes = create_mbti_pdf(
-        data.get("type", ""),
-        data.get("percentages", {}),
-        data.get("report", {}),
+    return await _pdf_response(request, data)
+
+
+# --- 기관 검사 결과 PDF 일괄 내보내기 (ZIP 스트리밍) ---
+EXPORT_BATCH_SIZE = 500
+EXPORT_MAX_SESSIONS = 10000
+_ZIP_NAME_UNSAFE = re.compile(r"[^A-Za-z0-9_-]")  # ZIP 항목 이름에 경로 구분자/".." 방지
+
+
+class PdfExportRequest(BaseModel):
+    """session_ids 또는 cohort 중 하나"""
+    session_ids: Optional[list[str]] = Field(None, min_length=1, max_length=EXPORT_MAX_SESSIONS)
+    cohort: Optional[str] = Field(None, min_length=1, max_length=100)
+
+    @model_validator(mode="after")
+    def _one_source(self):
+        if (self.session_ids is None) == (self.cohort is None):
+            raise ValueError("session_ids 또는 cohort 중 하나만 보내 주세요")
+        return self
+
+
+def _cohort_session_ids(db: Session, owner_id: str, cohort: str, after: Optional[str], limit: int) -> list[str]:
+    """회원 캠페인 세션 id를 id 순으로 한 페이지 (키셋 페이지네이션 - (owner_id, cohort, id) 인덱스)"""
+    q = db.query(MbtiSession.id).filter(MbtiSession.owner_id == owner_id, MbtiSession.cohort == cohort)
+    if after is not None:
+        q = q.filter(MbtiSession.id > after)
+    return [sid for (sid,) in q.order_by(MbtiSession.id).limit(limit)]
+
+
+def _others_session_ids(db: Session, ids: list[str], owner_id: str) -> set[str]:
+    """다른 회원이 일괄 등록한 세션 id - 내보내기에서 not_found로 처리"""
+    q = db.query(MbtiSession.id).filter(
+        MbtiSession.id.in_(ids), MbtiSession.owner_id.isnot(None), MbtiSession.owner_id != owner_id,
     )
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="MindMBTI_{data.get("type", "result")}.pdf"'},
+    return {sid for (sid,) in q}
+
+
+async def _export_batches(db: Session, req: PdfExportRequest, owner_id: str) -> AsyncIterator[list[str]]:
+    if req.session_ids is not None:
+        ids = list(dict.fromkeys(req.session_ids))
+        for i in range(0, len(ids), EXPORT_BATCH_SIZE):
+            yield ids[i:i + EXPORT_BATCH_SIZE]
+        return
+    after = None
+    while batch := await run_in_threadpool(_cohort_session_ids, db, owner_id, req.cohort, after, EXPORT_BATCH_SIZE):
+        yield batch
+        after = batch[-1]
+
+
+@app.post("/api/mbti/export/pdf")
+async def export_result_pdfs(
+    req: PdfExportRequest, user_id: str = Depends(get_required_user_id), db: Session = Depends(get_db),
+):
+    """검사 결과 PDF 일괄 내보내기 (로그인 필수) - session_ids 목록 또는 내가 일괄 등록한 cohort 전체를 ZIP으로 스트리밍
+
+    500건씩 IN 쿼리 1회 + 행렬 채점 1회 → 렌더링 프로세스 풀에서 병렬 렌더링 → ZIP 항목으로 바로 전송.
+    인원수와 무관하게 메모리는 묶음 하나 분량. 마지막 manifest.csv에 세션별 상태(ok / not_found / incomplete)
+    다른 회원이 일괄 등록한 세션은 session_ids로 지정해도 not_found
+    """
+    async def archive() -> AsyncIterator[bytes]:
+        zs = ZipStream()
+        manifest = io.StringIO()
+        writer = csv.writer(manifest)
+        writer.writerow(["session_id", "type", "status", "file"])
+        async for batch in _export_batches(db, req, user_id):
+            scored = await run_in_threadpool(_load_results, db, batch)
+            if req.session_ids is not None:
+                for sid in await run_in_threadpool(_others_session_ids, db, batch, user_id):
+                    scored.pop(sid, None)
+            done = [sid for sid in batch if scored.get(sid) is not None]
+            pdfs = await pdf_renderer.render_many([
+                (scored[sid]["type"], scored[sid]["percentages"], MBTI_REPORTS.get(scored[sid]["type"], {}))
+                for sid in done
+            ])
+            rendered = dict(zip(done, pdfs))
+            for sid in batch:
+                if sid not in rendered:
+                    writer.writerow([sid, "", "not_found" if sid not in scored else "incomplete", ""])
+                    continue
+                name = f'MindMBTI_{scored[sid]["type"]}_{_ZIP_NAME_UNSAFE.sub("_", sid)}.pdf'
+                writer.writerow([sid, scored[sid]["type"], "ok", name])
+                yield zs.add(name, rendered.pop(sid))
+        yield zs.add("manifest.csv", manifest.getvalue().encode("utf-8-sig"))  # 엑셀에서 바로 열리도록 BOM
+        yield zs.close()
+
+    return StreamingResponse(
+        archive(), media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="MindMBTI_results.zip"'},
     )
 
 
 # --- Phase 4: 궁합 분석 & 직무 적합도 ---
-from compatibility import analyze_compatibility
-from career_match import get_career_recommendations
+from compatibility import analyze_compatibility, compatibility_matrix
+from team_analysis import analyze_team, type_histogram
+from career_match import best_types_for_career, get_career_recommendations, rank_careers
 
 
 class CompatibilityRequest(BaseModel):
@@ -425,82 +860,205 @@ class CompatibilityRequest(BaseModel):
     type_b: str
 
 
+_COMPATIBILITY_RESPONSES = render_table({
+    (a, b): analyze_compatibility(a, b) for a in VALID_MBTI_TYPES for b in VALID_MBTI_TYPES
+})
+_COMPATIBILITY_MATRIX_RESPONSE = StaticResponse.render(compatibility_matrix())
+_CAREER_RESPONSES = render_table({t: get_career_recommendations(t) for t in VALID_MBTI_TYPES})
+
+
+def _compatibility_response(request: Request, type_a: str, type_b: str) -> Response:
+    entry = _COMPATIBILITY_RESPONSES.get((type_a.upper(), type_b.upper()))
+    if entry is None:
+        raise HTTPException(status_code=400, detail="유효하지 않은 MBTI 유형")
+    return serve(request, entry)
+
+
 @app.post("/api/compatibility")
-def compatibility(req: CompatibilityRequest):
+def compatibility(req: CompatibilityRequest, request: Request):
     """MBTI 궁합 분석 - 관계 유형, 갈등 포인트, 의사소통 전략"""
+    return _compatibility_response(request, req.type_a, req.type_b)
+
+
+@app.get("/api/compatibility/matrix")
+def compatibility_matrix_table(request: Request):
+    """16x16 궁합 표 전체 - 궁합 그리드를 요청 1회로 렌더링"""
+    return serve(request, _COMPATIBILITY_MATRIX_RESPONSE)
+
+
+@app.get("/api/compatibility/{type_a}/{type_b}")
+def compatibility_get(type_a: str, type_b: str, request: Request):
+    """궁합 분석 GET 버전 - HTTP 캐시/CDN 캐시 가능"""
+    return _compatibility_response(request, type_a, type_b)
+
+
+# --- 팀 궁합 분석 ---
+TEAM_MAX_MEMBERS = 10000
+
+
+class TeamAnalysisRequest(BaseModel):
+    """session_ids 또는 types 중 하나"""
+    session_ids: Optional[list[str]] = Field(None, min_length=1, max_length=TEAM_MAX_MEMBERS)
+    types: Optional[list[str]] = Field(None, min_length=1, max_length=TEAM_MAX_MEMBERS)
+
+    @model_validator(mode="after")
+    def _one_source(self):
+        if (self.session_ids is None) == (self.types is None):
+            raise ValueError("session_ids 또는 types 중 하나만 보내 주세요")
+        return self
+
+
+@app.post("/api/compatibility/team")
+def team_compatibility(req: TeamAnalysisRequest, db: Session = Depends(get_db)):
+    """팀 궁합 분석 - 16칸 유형 히스토그램 기준 관계 유형 분포, 지표별 균형, 갈등 핫스팟"""
+    not_found: list[str] = []
+    incomplete: list[str] = []
+    if req.types is not None:
+        types = req.types
+    else:
+        ids = list(dict.fromkeys(req.session_ids))
+        scored = _load_results(db, ids)
+        types = [r["type"] for r in scored.values() if r is not None]
+        not_found = [sid for sid in ids if sid not in scored]
+        incomplete = [sid for sid in ids if sid in scored and scored[sid] is None]
     try:
-        return analyze_compatibility(req.type_a, req.type_b)
+        hist = type_histogram(types)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    return {**analyze_team(hist), "not_found": not_found, "incomplete": incomplete}
 
 
 @app.get("/api/career/match/{mbti_type}")
-def career_match(mbti_type: str):
+def career_match(mbti_type: str, request: Request):
     """직무 매칭 - MBTI 유형별 직무군 추천"""
+    entry = _CAREER_RESPONSES.get(mbti_type.upper())
+    if entry is None:
+        raise HTTPException(status_code=400, detail=f"유효하지 않은 MBTI 유형: {mbti_type}")
+    return serve(request, entry)
+
+
+class CareerRankRequest(BaseModel):
+    percentages: dict[str, dict[str, float]]  # 결과의 percentages 그대로
+    top_k: int = Field(10, ge=1, le=100)
+
+
+@app.post("/api/career/match")
+def career_rank(req: CareerRankRequest):
+    """직무 순위 - 지표별 선호 강도(percentages)와 전체 직무 벡터의 적합도 상위 top_k"""
     try:
-        return get_career_recommendations(mbti_type)
+        return {"careers": rank_careers(req.percentages, req.top_k)}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.get("/api/career/{career}/types")
+def career_types(career: str, limit: int = 4):
+    """이 직무에 잘 맞는 유형 (사전 계산된 역색인)"""
+    try:
+        return {"career": career, "types": best_types_for_career(career, max(1, min(limit, 16)))}
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"직무를 찾을 수 없습니다: {career}")
+
+
 # --- FR-041: AI 커리어 조언 ---
 class CareerAdviceRequest(BaseModel):
     mbti_type: str
     current_job: str
 
 
+def _career_advice_result(mbti_type: str, current_job: str, text: str) -> dict:
+    """모델 응답(JSON 요청) → career_advice / strength_strategy. JSON이 아니면 전체를 조언으로"""
+    text = text.strip().removeprefix("```json").removeprefix("```").removesuffix("```").strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = {"career_advice": text, "strength_strategy": ""}
+    if not isinstance(data, dict):
+        data = {"career_advice": text, "strength_strategy": ""}
+    return {
+        "mbti_type": mbti_type,
+        "current_job": current_job,
+        "career_advice": data.get("career_advice", text),
+        "strength_strategy": data.get("strength_strategy", ""),
+    }
+
+
 @app.post("/api/career/ai-advice")
-def get_ai_career_advice(req: CareerAdviceRequest):
+async def get_ai_career_advice(req: CareerAdviceRequest, db: Session = Depends(get_db)):
     """AI 커리어 조언 - 현재 직무 + MBTI 기반, 강점 활용 전략 제안"""
-    key = req.mbti_type.upper()
-    if key not in VALID_MBTI_TYPES:
-        raise HTTPException(status_code=400, detail=f"유효하지 않은 MBTI 유형: {req.mbti_type}")
-
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=503, detail="OPENAI_API_KEY가 설정되지 않았습니다.")
-
-    from openai import OpenAI
-    client = OpenAI(api_key=api_key)
-    base_info = MBTI_REPORTS[key]
-    careers = get_career_recommendations(key)["recommended_careers"]
-
-    prompt = f"""당신은 MBTI 기반 커리어 코치입니다.
-사용자 정보:
-- MBTI: {key}
-- 현재 직무: {req.current_job}
-- 성격 키워드: {', '.join(base_info['keywords'])}
-- 강점: {base_info['strengths']}
-- 약점: {base_info['weaknesses']}
-- 추천 직무군: {', '.join(careers)}
-
-다음 두 가지를 각각 150자 내외로 한국어로 작성해 주세요. JSON 형식으로만 답변하세요.
-{{"career_advice": "현재 직무에서의 성장 방향, MBTI 강점을 활용한 조언",
- "strength_strategy": "강점 활용 전략 2~3가지 구체적 제안"}}"""
-
+    key, client = _require_ai(req.mbti_type)
+    prompt = career_advice_prompt(key, req.current_job)
     try:
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=600,
-        )
-        import json
-        text = (resp.choices[0].message.content or "").strip()
-        text = text.removeprefix("```json").removeprefix("```").strip()
-        try:
-            data = json.loads(text)
-        except json.JSONDecodeError:
-            data = {"career_advice": text, "strength_strategy": ""}
-        return {
-            "mbti_type": key,
-            "current_job": req.current_job,
-            "career_advice": data.get("career_advice", text),
-            "strength_strategy": data.get("strength_strategy", ""),
-        }
-    except HTTPException:
-        raise
+        text = await cached_complete(db, "career_advice", client, prompt, max_tokens=600)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"AI 생성 중 오류: {str(e)}")
+    return _career_advice_result(key, req.current_job, text)
+
+
+@app.post("/api/career/ai-advice/stream")
+async def get_ai_career_advice_stream(req: CareerAdviceRequest, db: Session = Depends(get_db)):
+    """AI 커리어 조언 SSE 스트리밍 - token 이벤트로 조각 전송, 마지막 done 이벤트에 파싱된 결과"""
+    key, client = _require_ai(req.mbti_type)
+    prompt = career_advice_prompt(key, req.current_job)
+    pieces = cached_stream(db, "career_advice", client, prompt, max_tokens=600)
+    return _sse_response(_sse_events(pieces, lambda text: _career_advice_result(key, req.current_job, text)))
+
+
+# --- AI 작업 큐 - 등록 후 폴링 ---
+job_session_factory = SessionLocal  # 작업 실행 중 캐시 조회/저장용 (요청 세션과 별개)
+
+
+async def _job_completion(endpoint: str, client, prompt: str, max_tokens: int) -> str:
+    db = job_session_factory()
+    try:
+        return await cached_complete(db, endpoint, client, prompt, max_tokens)
+    finally:
+        db.close()
+
+
+def _submit_job(kind: str, fn) -> dict:
+    try:
+        return ai_jobs.submit(kind, fn).to_dict()
+    except QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="대기 중인 AI 작업이 많습니다. 잠시 후 다시 시도해 주세요",
+            headers={"Retry-After": "5"},
+        )
+
+
+@app.post("/api/jobs/report", status_code=202)
+async def submit_ai_report_job(req: AiReportRequest):
+    """AI 맞춤 해석 작업 등록 → job_id (GET /api/jobs/{job_id}로 결과 조회)"""
+    key, client = _require_ai(req.mbti_type)
+    prompt = report_prompt(key, req.job, req.current_concern, req.relationship_concern)
+
+    async def run():
+        return {"mbti_type": key, "ai_interpretation": await _job_completion("report", client, prompt, 500)}
+
+    return _submit_job("report", run)
+
+
+@app.post("/api/jobs/career-advice", status_code=202)
+async def submit_ai_career_advice_job(req: CareerAdviceRequest):
+    """AI 커리어 조언 작업 등록 → job_id"""
+    key, client = _require_ai(req.mbti_type)
+    prompt = career_advice_prompt(key, req.current_job)
+
+    async def run():
+        text = await _job_completion("career_advice", client, prompt, 600)
+        return _career_advice_result(key, req.current_job, text)
+
+    return _submit_job("career_advice", run)
+
+
+@app.get("/api/jobs/{job_id}")
+def get_job(job_id: str):
+    """작업 상태 - queued | running | succeeded(result) | failed(error)"""
+    job = ai_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job.to_dict()
 
 
 # --- FR-050: 대시보드 - 내 분석 기록, 재검사 비교 ---
@@ -524,10 +1082,10 @@ def save_result_to_history(
     db: Session = Depends(get_db),
 ):
     """검사 결과를 내 기록에 저장"""
-    sess = db.query(MbtiSession).filter(MbtiSession.id == req.session_id).first()
-    if not sess or len(sess.answers or {}) < 48:
+    sess = _load_session(db, req.session_id)
+    result = session_result(sess) if sess else None
+    if result is None:
         raise HTTPException(status_code=400, detail="완료된 검사 결과가 없습니다")
-    result = _compute_mbti_result(sess.answers)
     rec = UserResult(
         id=str(uuid.uuid4()),
         user_id=user_id,
@@ -0,0 +1,235 @@
+"""
+DB 유지보수 작업 - CLI 및 앱 내 주기 실행
+
+    python maintenance.py purge-sessions --days 30 [--batch-size 1000] [--archive] [--max-batches N]
+    python maintenance.py warm-ai-cache [--concurrency 4]
+    python maintenance.py compact-shares [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / ".env")
+from sqlalchemy import delete, or_, select, update
+
+from answer_codec import encode_answers
+from models import ArchivedMbtiSession, MbtiSession, Share
+from scoring import NUM_QUESTIONS, answers_to_array
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeReport:
+    rows: int
+    batches: int
+    seconds: float
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _abandoned(cutoff: datetime):
+    """미완료 상태로 cutoff 이전에 마지막 수정된 세션"""
+    return (
+        MbtiSession.completed_at.is_(None),
+        or_(MbtiSession.answered_count.is_(None), MbtiSession.answered_count < NUM_QUESTIONS),
+        MbtiSession.updated_at < cutoff,
+    )
+
+
+def _archive_rows(db, ids: list[str], cutoff: datetime) -> None:
+    rows = db.execute(
+        select(MbtiSession.id, MbtiSession.answers, MbtiSession.answers_packed,
+               MbtiSession.answered_count, MbtiSession.updated_at)
+        .where(MbtiSession.id.in_(ids), *_abandoned(cutoff))
+    ).all()
+    db.execute(ArchivedMbtiSession.__table__.insert(), [
+        {
+            "id": r.id,
+            "answers_packed": r.answers_packed or encode_answers(answers_to_array(r.answers or {})),
+            "answered_count": r.answered_count,
+            "updated_at": r.updated_at,
+            "archived_at": datetime.utcnow(),
+        }
+        for r in rows
+    ])
+
+
+def purge_abandoned_sessions(
+    session_factory: Callable,
+    older_than: timedelta,
+    batch_size: int = 1000,
+    archive: bool = False,
+    max_batches: int | None = None,
+) -> PurgeReport:
+    """오래된 미완료 세션 삭제 (archive=True면 보관 테이블로 이동)
+
+    updated_at 인덱스 순서로 batch_size씩 처리하고 배치마다 커밋 - 잠금은 배치 단위로만 유지
+    """
+    cutoff = datetime.utcnow() - older_than
+    rows = batches = 0
+    started = time.perf_counter()
+    db = session_factory()
+    try:
+        while max_batches is None or batches < max_batches:
+            ids = db.scalars(
+                select(MbtiSession.id).where(*_abandoned(cutoff)).order_by(MbtiSession.updated_at).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            # 조회 후 그 사이에 이어서 응답한 세션은 조건을 다시 확인해 제외
+            if archive:
+                _archive_rows(db, ids, cutoff)
+            deleted = db.execute(
+                delete(MbtiSession).where(MbtiSession.id.in_(ids), *_abandoned(cutoff)),
+                execution_options={"synchronize_session": False},
+            ).rowcount
+            db.commit()
+            rows += deleted
+            batches += 1
+            elapsed = time.perf_counter() - started
+            logger.info("purge-sessions: %d rows, %.0f rows/s", rows, rows / elapsed if elapsed > 0 else 0)
+    finally:
+        db.close()
+    return PurgeReport(rows=rows, batches=batches, seconds=time.perf_counter() - started)
+
+
+async def run_periodic_purge(session_factory: Callable, interval: float, older_than: timedelta, **kwargs) -> None:
+    """앱 내 주기 실행 - lifespan에서 태스크로 시작"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            report = await asyncio.to_thread(purge_abandoned_sessions, session_factory, older_than, **kwargs)
+            if report.rows:
+                logger.info("purge-sessions: %d rows in %.1fs (%.0f rows/s)", report.rows, report.seconds, report.rows_per_sec)
+        except Exception:
+            logger.exception("purge-sessions 실패 - 다음 주기에 재시도")
+
+
+def periodic_purge_from_env(session_factory: Callable):
+    """MBTI_SESSION_PURGE_INTERVAL(초)이 설정된 경우 주기 실행 코루틴, 아니면 None"""
+    interval = os.getenv("MBTI_SESSION_PURGE_INTERVAL")
+    if not interval:
+        return None
+    return run_periodic_purge(
+        session_factory,
+        float(interval),
+        timedelta(days=float(os.getenv("MBTI_SESSION_PURGE_DAYS", "30"))),
+        batch_size=int(os.getenv("MBTI_SESSION_PURGE_BATCH_SIZE", "1000")),
+        archive=os.getenv("MBTI_SESSION_PURGE_ARCHIVE", "") == "1",
+    )
+
+
+async def warm_ai_cache(session_factory: Callable, concurrency: int = 4) -> tuple[int, int]:
+    """16개 유형의 입력 없는 AI 리포트를 캐시에 미리 채움 (유효한 항목이 있으면 건너뜀)
+
+    LLM 호출만 동시에 실행하고 DB 조회/저장은 한 세션에서 순서대로. (새로 채운 수, 건너뛴 수) 반환
+    """
+    from ai_cache import cache_key, cached_keys, put_cached
+    from ai_client import OPENAI_MODEL, close_ai_client, complete, get_ai_client
+    from ai_prompts import report_prompt
+    from report_templates import VALID_MBTI_TYPES
+
+    client = get_ai_client()
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다")
+    prompts = {cache_key("report", OPENAI_MODEL, p): p for p in map(report_prompt, VALID_MBTI_TYPES)}
+    sem = asyncio.Semaphore(concurrency)
+
+    async def generate(prompt: str) -> str:
+        async with sem:
+            return await complete(client, prompt, max_tokens=500)
+
+    db = session_factory()
+    try:
+        cached = cached_keys(db, list(prompts))
+        missing = [k for k in prompts if k not in cached]
+        try:
+            texts = await asyncio.gather(*(generate(prompts[k]) for k in missing))
+        finally:
+            await close_ai_client()
+        for key, text in zip(missing, texts):
+            if text:
+                put_cached(db, key, "report", OPENAI_MODEL, text)
+    finally:
+        db.close()
+    return len(missing), len(prompts) - len(missing)
+
+
+def compact_shares(session_factory: Callable, batch_size: int = 1000) -> tuple[int, int]:
+    """리포트 본문을 복사해 저장한 이전 형식 공유를 (유형, 퍼센트, 템플릿 버전) 형식으로 변환
+
+    id 순으로 batch_size씩 읽고 배치마다 커밋. 리포트가 현재 템플릿과 다르면 그대로 둠. (변환 수, 유지 수) 반환
+    """
+    from shares import compact_share
+
+    converted = kept = 0
+    after = ""
+    db = session_factory()
+    try:
+        while rows := db.execute(
+            select(Share.id, Share.data).where(Share.id > after).order_by(Share.id).limit(batch_size)
+        ).all():
+            changes = []
+            for r in rows:
+                if "template_version" in r.data:
+                    continue
+                data = compact_share(r.data)
+                if data is None:
+                    kept += 1
+                else:
+                    changes.append({"id": r.id, "data": data})
+            if changes:
+                db.execute(update(Share), changes)
+                db.commit()
+                converted += len(changes)
+            after = rows[-1].id
+    finally:
+        db.close()
+    return converted, kept
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="MindMBTI DB 유지보수")
+    sub = parser.add_subparsers(dest="command", required=True)
+    purge = sub.add_parser("purge-sessions", help="오래된 미완료 세션 삭제/보관")
+    purge.add_argument("--days", type=float, default=30, help="마지막 수정 후 경과 일수 (기본 30)")
+    purge.add_argument("--batch-size", type=int, default=1000)
+    purge.add_argument("--archive", action="store_true", help="삭제 전 mbti_sessions_archive로 복사")
+    purge.add_argument("--max-batches", type=int, default=None)
+    warm = sub.add_parser("warm-ai-cache", help="16개 유형 기본 AI 리포트를 캐시에 미리 생성")
+    warm.add_argument("--concurrency", type=int, default=4)
+    compact = sub.add_parser("compact-shares", help="이전 형식 공유 결과(리포트 본문 포함)를 템플릿 버전 참조로 변환")
+    compact.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    from database import SessionLocal
+
+    if args.command == "purge-sessions":
+        report = purge_abandoned_sessions(
+            SessionLocal, timedelta(days=args.days),
+            batch_size=args.batch_size, archive=args.archive, max_batches=args.max_batches,
+        )
+        print(f"purged {report.rows} sessions in {report.batches} batches, "
+              f"{report.seconds:.1f}s ({report.rows_per_sec:.0f} rows/s)")
+    elif args.command == "warm-ai-cache":
+        warmed, skipped = asyncio.run(warm_ai_cache(SessionLocal, args.concurrency))
+        print(f"warmed {warmed} types, {skipped} already cached")
+    elif args.command == "compact-shares":
+        converted, kept = compact_shares(SessionLocal, args.batch_size)
+        print(f"compacted {converted} shares, kept {kept} with custom report text")
+
+
+if __name__ == "__main__":
+    main()
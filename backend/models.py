@@ -2,7 +2,7 @@
 SQLAlchemy 모델
 """
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, JSON, Integer, LargeBinary, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -22,8 +22,43 @@ class User(Base):
 class MbtiSession(Base):
     __tablename__ = "mbti_sessions"
     id = Column(String(36), primary_key=True)
-    answers = Column(JSON, nullable=False)  # {question_id: value}
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    answers = Column(JSON(none_as_null=True), nullable=True)  # {question_id: value} - 이전 형식
+    answers_packed = Column(LargeBinary, nullable=True)  # 문항당 3비트, 18바이트 (answer_codec)
+    pole_scores = Column(JSON, nullable=True)  # [E, I, S, N, T, F, J, P] 누적 점수 (미응답=중립)
+    answered_count = Column(Integer, nullable=True)
+    mbti_type = Column(String(4), nullable=True)  # 48문항 완료 시 저장
+    percentages = Column(JSON, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # 답변 변경마다 증가
+    owner_id = Column(String(36), nullable=True)  # 일괄 등록한 회원 (캠페인 소유자)
+    cohort = Column(String(100), nullable=True)  # 기관 검사 캠페인 (일괄 등록 시 지정, 소유자별 일괄 내보내기 단위)
+
+    __mapper_args__ = {"version_id_col": version}
+    __table_args__ = (Index("ix_mbti_sessions_owner_cohort_id", "owner_id", "cohort", "id"),)  # 소유자 캠페인별 id 순 페이지 조회
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+
+
+class ArchivedMbtiSession(Base):
+    """만료 처리된 미완료 세션 보관 (maintenance.py purge-sessions --archive)"""
+    __tablename__ = "mbti_sessions_archive"
+    id = Column(String(36), primary_key=True)
+    answers_packed = Column(LargeBinary, nullable=True)
+    answered_count = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AiCacheEntry(Base):
+    """AI 응답 캐시 - 키는 (엔드포인트, 모델, 정규화한 프롬프트) 해시 (ai_cache)"""
+    __tablename__ = "ai_cache"
+    key = Column(String(64), primary_key=True)
+    endpoint = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    hits = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    last_used_at = Column(DateTime, default=datetime.utcnow, index=True)  # 크기 초과 시 오래 안 쓴 항목부터 제거
 
 
 class Share(Base):
@@ -0,0 +1,77 @@
+"""
+비밀번호 해시 - bcrypt를 전용 프로세스 풀에서 실행
+로그인이 몰려도 요청 스레드풀이 bcrypt로 채워지지 않아 다른 API가 밀리지 않음
+
+환경 변수
+- BCRYPT_ROUNDS: bcrypt cost (기본 12)
+- PASSWORD_HASH_WORKERS: 프로세스 수 (기본 min(4, CPU 수), 0이면 프로세스 풀 없이 스레드풀에서 실행)
+- PASSWORD_HASH_MAX_PENDING: 대기 가능한 해시 작업 수 (기본 workers x 8) - 초과 시 HashPoolBusy
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+from starlette.concurrency import run_in_threadpool
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+class HashPoolBusy(Exception):
+    """해시 작업 대기열이 가득 참 - 잠시 후 재시도"""
+
+
+def _hash(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode()
+
+
+def _check(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """크기 제한 프로세스 풀 + 대기열 상한 (이벤트 루프에서만 호출)"""
+
+    def __init__(self, workers: int, max_pending: int, rounds: int = BCRYPT_ROUNDS):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+
+    @classmethod
+    def from_env(cls) -> "PasswordHasher":
+        workers = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        max_pending = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(workers, 1) * 8)))
+        return cls(workers, max_pending)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        if self.workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            raise HashPoolBusy()
+        self._pending += 1
+        try:
+            if not self.workers:
+                return await run_in_threadpool(fn, *args)
+            self.start()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password.encode(), self.rounds)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(_check, password.encode(), hashed.encode())
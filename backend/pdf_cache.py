@@ -0,0 +1,206 @@
+"""
+생성된 PDF 캐시 - 입력(유형, 비율, 리포트 내용, 레이아웃 버전) 해시를 키로 하는 content-addressed 저장소
+메모리 LRU(바이트 상한) → 디스크(용량 상한, 오래 사용하지 않은 파일부터 삭제) 순으로 조회, 없으면 렌더링 후 둘 다 저장
+디스크 적중은 파일을 읽어 메모리로 올림 (응답 전에 다른 워커가 파일을 지워도 이미 읽은 바이트로 응답)
+키가 곧 내용이므로 ETag = 키, 한 번 저장된 파일은 바뀌지 않음
+
+디스크는 워커 간 공유 (원자적 rename으로 기록, 용량 관리는 워커별 근사)
+
+환경 변수
+- PDF_CACHE_DIR: 디스크 캐시 위치 - 지정하지 않거나 빈 값이면 디스크 캐시 사용 안 함 (메모리만)
+- PDF_CACHE_MAX_BYTES: 디스크 캐시 용량 (기본 256MB)
+- PDF_CACHE_MEMORY_BYTES: 메모리 캐시 용량 (기본 32MB)
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from static_responses import etag_matches
+
+logger = logging.getLogger(__name__)
+
+# pdf_utils 레이아웃을 바꾸면 올림 (이전 캐시 무효화)
+PDF_LAYOUT_VERSION = 2
+MEDIA_TYPE = "application/pdf"
+
+
+def pdf_key(mbti_type: str, percentages: dict, report: dict) -> str:
+    """PDF 입력 전체의 해시 - 같은 결과는 같은 키"""
+    payload = json.dumps([PDF_LAYOUT_VERSION, mbti_type, percentages, report], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedPdf:
+    key: str
+    size: int
+    last_modified: float
+    body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.key}"'
+
+
+class PdfCache:
+    def __init__(self, directory: Optional[str], max_bytes: int = 256 << 20, memory_bytes: int = 32 << 20):
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, CachedPdf] = OrderedDict()
+        self._memory_size = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()  # 키 → 파일 크기 (사용 순)
+        self._disk_size = 0
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        if self.directory:
+            self._scan()
+
+    @classmethod
+    def from_env(cls) -> "PdfCache":
+        return cls(
+            directory=os.getenv("PDF_CACHE_DIR"),
+            max_bytes=int(os.getenv("PDF_CACHE_MAX_BYTES", str(256 << 20))),
+            memory_bytes=int(os.getenv("PDF_CACHE_MEMORY_BYTES", str(32 << 20))),
+        )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _scan(self) -> None:
+        """기존 파일을 수정 시각 순으로 색인 (재시작 후에도 재사용)"""
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pdf") and entry.is_file():
+                    st = entry.stat()
+                    files.append((st.st_mtime, entry.name[:-4], st.st_size))
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+
+    def get(self, key: str) -> Optional[CachedPdf]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry
+        if self.directory:
+            entry = self._read(key)
+            if entry is not None:
+                with self._lock:
+                    if key in self._disk:
+                        self._disk.move_to_end(key)
+                    else:  # 다른 워커가 저장
+                        self._disk[key] = entry.size
+                        self._disk_size += entry.size
+                    self.hits["disk"] += 1
+                self._remember(entry)
+                return entry
+        with self._lock:
+            if key in self._disk:  # 다른 워커가 삭제
+                self._disk_size -= self._disk.pop(key)
+            self.misses += 1
+        return None
+
+    def _read(self, key: str) -> Optional[CachedPdf]:
+        """디스크 파일 → 항목 (없거나 읽는 중 삭제되면 None)"""
+        try:
+            with open(self._path(key), "rb") as f:
+                mtime = os.fstat(f.fileno()).st_mtime
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        return CachedPdf(key, len(body), mtime, body)
+
+    def _remember(self, entry: CachedPdf) -> None:
+        if entry.size > self.memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(entry.key, None)
+            self._memory_size -= old.size if old else 0
+            self._memory[entry.key] = entry
+            self._memory_size += entry.size
+            while self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= evicted.size
+
+    def put(self, key: str, body: bytes) -> CachedPdf:
+        entry = CachedPdf(key, len(body), time.time(), body)
+        self._remember(entry)
+        if self.directory:
+            try:
+                self._write(key, body)
+            except OSError:  # 디스크 오류는 응답에 영향 없음
+                logger.exception("PDF 캐시 저장 실패")
+        return entry
+
+    def _write(self, key: str, body: bytes) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+        with self._lock:
+            if key not in self._disk:
+                self._disk[key] = len(body)
+                self._disk_size += len(body)
+            self._disk.move_to_end(key)
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        while self._disk_size > self.max_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "memory": {"entries": len(self._memory), "bytes": self._memory_size},
+                "disk": {"entries": len(self._disk), "bytes": self._disk_size},
+                "hits": dict(self.hits),
+                "misses": self.misses,
+            }
+
+
+def _not_modified(request: Request, entry: CachedPdf) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, entry.etag)
+    since = request.headers.get("if-modified-since")
+    if since:
+        try:
+            return int(entry.last_modified) <= parsedate_to_datetime(since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def serve_pdf(request: Request, entry: CachedPdf, filename: str) -> Response:
+    """캐시된 PDF 응답 - 304 또는 바이트"""
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": formatdate(entry.last_modified, usegmt=True),
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    if _not_modified(request, entry):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type=MEDIA_TYPE, headers=headers)
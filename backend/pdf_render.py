@@ -0,0 +1,86 @@
+"""
+PDF 렌더링 - ReportLab(순수 파이썬, CPU 사용)을 전용 프로세스 풀에서 실행
+렌더링이 몰려도 요청 스레드풀과 GIL을 점유하지 않아 다른 API가 밀리지 않음
+워커 프로세스 시작 시 한글 폰트 등록 + 유형별 PDF 템플릿을 한 번 렌더링
+
+환경 변수
+- PDF_RENDER_WORKERS: 프로세스 수 (기본 CPU 수, 0이면 프로세스 풀 없이 스레드풀에서 실행)
+- PDF_RENDER_MAX_PENDING: 동시에 처리/대기 가능한 렌더링 수 (기본 workers x 4) - 초과 시 RenderPoolBusy
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from starlette.concurrency import run_in_threadpool
+
+from pdf_utils import create_mbti_pdf, warm_templates
+
+
+RETRY_INTERVAL = 0.05  # render_many가 대기열 자리를 다시 확인하는 간격(초)
+
+
+class RenderPoolBusy(Exception):
+    """렌더링 대기열이 가득 참 - 잠시 후 재시도"""
+
+
+def _render_chunk(jobs: list[tuple[str, dict, dict]]) -> list[bytes]:
+    return [create_mbti_pdf(*job) for job in jobs]
+
+
+class PdfRenderer:
+    """크기 제한 프로세스 풀 + 대기열 상한 (이벤트 루프에서만 호출)"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+
+    @classmethod
+    def from_env(cls) -> "PdfRenderer":
+        workers = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1)))
+        max_pending = int(os.getenv("PDF_RENDER_MAX_PENDING", str(max(workers, 1) * 4)))
+        return cls(workers, max_pending)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        if self.workers and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_templates)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _submit(self, fn, *args, wait: bool = False):
+        """대기열 상한 안에서 fn(*args)를 풀에서 실행 - 자리가 없으면 RenderPoolBusy (wait=True면 자리가 날 때까지 대기)"""
+        while self._pending >= self.max_pending:
+            if not wait:
+                raise RenderPoolBusy()
+            await asyncio.sleep(RETRY_INTERVAL)
+        self._pending += 1
+        try:
+            if not self.workers:
+                return await run_in_threadpool(fn, *args)
+            self.start()
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def render(self, mbti_type: str, percentages: dict, report: dict) -> bytes:
+        """create_mbti_pdf를 풀에서 실행 → PDF 바이트"""
+        return await self._submit(create_mbti_pdf, mbti_type, percentages, report)
+
+    async def render_many(self, jobs: list[tuple[str, dict, dict]]) -> list[bytes]:
+        """여러 PDF 일괄 렌더링 (일괄 내보내기) - 워커 수만큼 나눠 보내 프로세스 간 왕복 최소화
+        묶음 하나가 대기열 한 자리 - 자리가 없으면 실패 대신 대기 (이미 시작한 스트리밍 응답을 끊지 않도록)"""
+        if not jobs:
+            return []
+        size = -(-len(jobs) // max(self.workers, 1))
+        parts = await asyncio.gather(*(
+            self._submit(_render_chunk, jobs[i:i + size], wait=True) for i in range(0, len(jobs), size)
+        ))
+        return [pdf for part in parts for pdf in part]
@@ -1,40 +1,78 @@
 """
 MBTI 결과 PDF 생성
+비율 4줄을 뺀 나머지(제목, 키워드, 강점 등)는 유형별로 같으므로 유형별 템플릿을 한 번 렌더링해 두고
+요청마다 고정 폭 자리 표시자에 비율만 같은 길이로 덮어씀 (바이트 오프셋이 그대로라 xref 유효)
 """
 import io
 import os
+import re
+import threading
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-# 한글 폰트 등록 (Windows Malgun)
+from report_templates import MBTI_REPORTS
+
+# 한글 폰트 (Windows Malgun 등) - register_fonts()에서 한 번 등록, 없으면 Helvetica
 PDF_FONT = "Helvetica"
 PDF_BOLD = "Helvetica-Bold"
-try:
-    for path in [
-        "C:/Windows/Fonts/malgun.ttf",
-        "C:/Windows/Fonts/gulim.ttc",
-        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-    ]:
-        if os.path.exists(path):
-            pdfmetrics.registerFont(TTFont("KorFont", path))
-            PDF_FONT = PDF_BOLD = "KorFont"
-            break
-except Exception:
-    pass
+FONT_PATHS = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "C:/Windows/Fonts/gulim.ttc",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+]
+_fonts_registered = False
+
+
+def register_fonts() -> None:
+    """한글 폰트 등록 (TTF 파싱이 무거워 프로세스당 한 번 - 렌더링 프로세스 풀은 워커 시작 시 호출)"""
+    global PDF_FONT, PDF_BOLD, _fonts_registered
+    if _fonts_registered:
+        return
+    _fonts_registered = True
+    try:
+        for path in FONT_PATHS:
+            if os.path.exists(path):
+                pdfmetrics.registerFont(TTFont("KorFont", path))
+                PDF_FONT = PDF_BOLD = "KorFont"
+                break
+    except Exception:
+        pass
 
 
 def _truncate(s: str, max_len: int = 100) -> str:
     return (str(s) or "")[:max_len]
 
 
-def create_mbti_pdf(mbti_type: str, percentages: dict, report: dict) -> bytes:
-    """MBTI 결과 + 기본 리포트 PDF 생성"""
+# 비율 줄 - 항상 Helvetica(표준 폰트라 문자열이 PDF에 그대로 기록됨)로 그려 템플릿 치환 가능
+PCT_FONT = "Helvetica"
+PCT_SLOTS = 4
+PCT_SLOT_WIDTH = 40
+_STAMPABLE = re.compile(r"[A-Za-z0-9 .:%/+-]*")
+
+_templates: dict[str, bytes | None] = {}
+_templates_lock = threading.Lock()
+
+
+def _percentage_lines(percentages: dict) -> list[str]:
+    lines = []
+    for dim, pct in (percentages or {}).items():
+        if isinstance(pct, dict):
+            parts = " / ".join(f"{k} {v}%" for k, v in pct.items())
+            lines.append(f"  {dim}: {parts}")
+    return lines
+
+
+def _render(mbti_type: str, pct_lines: list[str] | None, report: dict, page_compression: int = 1) -> bytes:
+    """비율 줄을 뺀 내용은 압축된 Form XObject로, 비율 줄만 페이지 내용에 (page_compression=0이면 비압축 → 템플릿 치환 가능)
+    pct_lines가 None이면 비율 블록 생략"""
+    register_fonts()
     buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+    c = canvas.Canvas(buffer, pagesize=A4, invariant=1)
     w, h = A4
     y = h - 40
+    overlay: list[tuple[float, str]] = []
 
     def draw(text: str, size: int = 12, bold: bool = False):
         nonlocal y
@@ -44,15 +82,15 @@ def create_mbti_pdf(mbti_type: str, percentages: dict, report: dict) -> bytes:
             y -= 16
         y -= 4
 
+    c.beginForm("report")
     draw("MindMBTI - MBTI Analysis Report", 18, bold=True)
     draw(f"MBTI Type: {mbti_type}", 16, bold=True)
 
-    if percentages:
+    if pct_lines is not None:
         draw("Percentage by Dimension:", 12, bold=True)
-        for dim, pct in (percentages or {}).items():
-            if isinstance(pct, dict):
-                parts = " / ".join(f"{k} {v}%" for k, v in pct.items())
-                draw(f"  {dim}: {parts}", 10)
+        for line in pct_lines:
+            overlay.append((y, _truncate(line, 70)))
+            y -= 20
         y -= 8
 
     if report:
@@ -62,6 +100,59 @@ def create_mbti_pdf(mbti_type: str, percentages: dict, report: dict) -> bytes:
         draw("Weaknesses: " + _truncate(report.get("weaknesses"), 150), 10)
         draw("Stress: " + _truncate(report.get("stress_reaction"), 150), 10)
         draw("Decision: " + _truncate(report.get("decision_style"), 150), 10)
+    c.endForm()
 
+    c.setPageCompression(page_compression)
+    c.doForm("report")
+    c.setFont(PCT_FONT, 10)
+    for line_y, line in overlay:
+        c.drawString(40, line_y, line)
+    c.showPage()
+    c.setPageCompression(1)
     c.save()
     return buffer.getvalue()
+
+
+def _slot(i: int) -> bytes:
+    return f"@@PCT{i}@@".ljust(PCT_SLOT_WIDTH).encode()
+
+
+def _build_template(mbti_type: str) -> bytes | None:
+    pdf = _render(mbti_type, [_slot(i).decode() for i in range(PCT_SLOTS)], MBTI_REPORTS[mbti_type], page_compression=0)
+    # 자리 표시자가 그대로 한 번씩 기록됐을 때만 사용 (아니면 전체 렌더링)
+    return pdf if all(pdf.count(_slot(i)) == 1 for i in range(PCT_SLOTS)) else None
+
+
+def _template(mbti_type: str) -> bytes | None:
+    if mbti_type not in _templates:
+        with _templates_lock:
+            if mbti_type not in _templates:
+                _templates[mbti_type] = _build_template(mbti_type)
+    return _templates[mbti_type]
+
+
+def warm_templates() -> None:
+    """폰트 등록 + 16개 유형 템플릿 미리 렌더링 (렌더링 프로세스 풀 워커 시작 시)"""
+    register_fonts()
+    for mbti_type in MBTI_REPORTS:
+        _template(mbti_type)
+
+
+def _stamp(template: bytes, lines: list[str]) -> bytes:
+    for i, line in enumerate(lines):
+        template = template.replace(_slot(i), line.ljust(PCT_SLOT_WIDTH).encode())
+    return template
+
+
+def create_mbti_pdf(mbti_type: str, percentages: dict, report: dict) -> bytes:
+    """MBTI 결과 + 기본 리포트 PDF 생성 - 기본 리포트 그대로에 비율 4줄이면 템플릿 치환, 아니면 전체 렌더링"""
+    lines = _percentage_lines(percentages)
+    stampable = (
+        len(lines) == PCT_SLOTS
+        and all(len(line) <= PCT_SLOT_WIDTH and _STAMPABLE.fullmatch(line) for line in lines)
+        and mbti_type in MBTI_REPORTS and report == MBTI_REPORTS[mbti_type]
+    )
+    template = _template(mbti_type) if stampable else None
+    if template is not None:
+        return _stamp(template, lines)
+    return _render(mbti_type, lines if percentages else None, report)
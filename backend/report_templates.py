@@ -118,3 +118,13 @@ MBTI_REPORTS = {
 }
 
 VALID_MBTI_TYPES = list(MBTI_REPORTS.keys())
+
+# 리포트 문구를 바꾸면 버전을 올리고 이전 표는 REPORT_TEMPLATES에 남김
+# (공유 결과는 버전만 저장하고 읽을 때 이 표에서 본문을 조인 - shares.py)
+REPORT_TEMPLATE_VERSION = 1
+REPORT_TEMPLATES = {REPORT_TEMPLATE_VERSION: MBTI_REPORTS}
+
+
+def report_for(mbti_type: str, version: int = REPORT_TEMPLATE_VERSION) -> dict:
+    """유형별 기본 리포트 - 없는 버전이면 현재 버전, 없는 유형이면 빈 dict"""
+    return REPORT_TEMPLATES.get(version, MBTI_REPORTS).get(mbti_type, {})
@@ -0,0 +1,108 @@
+"""
+MBTI 채점 엔진 - 48문항을 (문항 x 극) 부호 행렬로 한 번만 컴파일해 N개 세션을 행렬 연산으로 채점
+"""
+import numpy as np
+
+from mbti_questions import MBTI_QUESTIONS
+
+DIMENSIONS = ("E/I", "S/N", "T/F", "J/P")
+POLES = tuple(p for dim in DIMENSIONS for p in (dim[0], dim[2]))  # E I S N T F J P
+NUM_QUESTIONS = len(MBTI_QUESTIONS)
+NEUTRAL_VALUE = 3  # 미응답 문항은 중립(3)으로 계산
+
+# 4비트 유형 코드 - 지표별로 두 번째 극(I N F P)이면 1, E/I가 최상위 비트 (ESTJ = 0, INFP = 15)
+TYPES_BY_CODE = tuple(
+    "".join(dim[2] if code >> (3 - i) & 1 else dim[0] for i, dim in enumerate(DIMENSIONS))
+    for code in range(1 << len(DIMENSIONS))
+)
+TYPE_CODES = {t: code for code, t in enumerate(TYPES_BY_CODE)}
+
+
+def _compile_questions(questions: list[dict]) -> tuple[np.ndarray, np.ndarray]:
+    """문항별 (+1: 긍정 극, -1: 반대 극) 부호 행렬과 극별 상수항 계산
+
+    극 점수 = sum(v) (긍정 극) + sum(6 - v) (반대 극) = answers @ SIGN + OFFSET
+    """
+    sign = np.zeros((len(questions), len(POLES)), dtype=np.int16)
+    for row, q in enumerate(questions):
+        dim, pos = q["dimension"], q["positive_pole"]
+        neg = dim[2] if pos == dim[0] else dim[0]
+        sign[row, POLES.index(pos)] = 1
+        sign[row, POLES.index(neg)] = -1
+    offset = 6 * (sign == -1).sum(axis=0).astype(np.int32)
+    sign.setflags(write=False)
+    offset.setflags(write=False)
+    return sign, offset
+
+
+SIGN_MATRIX, POLE_OFFSET = _compile_questions(MBTI_QUESTIONS)
+QUESTION_IDS = tuple(q["id"] for q in MBTI_QUESTIONS)
+_QID_TO_COL = {qid: col for col, qid in enumerate(QUESTION_IDS)}
+
+
+def answers_to_array(answers: dict) -> np.ndarray:
+    """{question_id: value} → 길이 48 배열 (0 = 미응답). JSON 키(str)도 허용"""
+    arr = np.zeros(NUM_QUESTIONS, dtype=np.int8)
+    for qid, val in answers.items():
+        col = _QID_TO_COL.get(int(qid))
+        if col is not None:
+            arr[col] = val
+    return arr
+
+
+def pole_scores(answers: np.ndarray) -> np.ndarray:
+    """(N, 48) 응답 행렬 → (N, 8) 극별 점수. 0(미응답)은 중립값으로 채움"""
+    a = np.asarray(answers, dtype=np.int32)
+    a = np.where(a == 0, NEUTRAL_VALUE, a)
+    return a @ SIGN_MATRIX + POLE_OFFSET
+
+
+def results_from_scores(scores: np.ndarray) -> list[dict]:
+    """(N, 8) 극별 점수 → [{"type", "percentages"}]"""
+    s = np.asarray(scores, dtype=np.float64).reshape(-1, len(DIMENSIONS), 2)
+    first, second = s[..., 0], s[..., 1]
+    total = first + second
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = np.where(total > 0, first / total * 100, 50.0)
+    pick_first = first >= second
+    results = []
+    for row_pct, row_pick in zip(pct.tolist(), pick_first.tolist()):
+        mbti_type = ""
+        percentages = {}
+        for dim, p, is_first in zip(DIMENSIONS, row_pct, row_pick):
+            a, b = dim[0], dim[2]
+            mbti_type += a if is_first else b
+            p = round(p, 1)
+            percentages[dim] = {a: p, b: round(100 - p, 1)}
+        results.append({"type": mbti_type, "percentages": percentages})
+    return results
+
+
+def result_from_scores(scores) -> dict:
+    """단일 세션 극별 점수(길이 8) → {"type", "percentages"}"""
+    return results_from_scores(np.asarray(scores).reshape(1, -1))[0]
+
+
+def score_batch(answers: np.ndarray) -> list[dict]:
+    """(N, 48) 응답 행렬을 한 번의 행렬 연산으로 채점"""
+    return results_from_scores(pole_scores(np.atleast_2d(answers)))
+
+
+def score_answers(answers: dict) -> dict:
+    """단일 세션 채점 ({question_id: value})"""
+    return score_batch(answers_to_array(answers))[0]
+
+
+EMPTY_POLE_SCORES = pole_scores(np.zeros(NUM_QUESTIONS, dtype=np.int8))
+
+
+def pole_score_delta(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """응답 변경분만으로 극별 점수 변화량 계산 (변경된 문항 행만 사용)"""
+    old = np.asarray(old, dtype=np.int32)
+    new = np.asarray(new, dtype=np.int32)
+    changed = np.flatnonzero(old != new)
+    if changed.size == 0:
+        return np.zeros(len(POLES), dtype=np.int32)
+    o = np.where(old[changed] == 0, NEUTRAL_VALUE, old[changed])
+    n = np.where(new[changed] == 0, NEUTRAL_VALUE, new[changed])
+    return (n - o) @ SIGN_MATRIX[changed]
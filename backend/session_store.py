@@ -0,0 +1,139 @@
+"""
+검사 세션 상태 관리 - 답변 변경 시 극별 누적 점수/응답 수를 증분 갱신,
+48문항 완료 시 결과(유형/퍼센트/완료 시각)를 세션에 저장
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+
+from answer_codec import decode_answers, encode_answers
+from models import MbtiSession
+from scoring import (
+    EMPTY_POLE_SCORES, NUM_QUESTIONS, QUESTION_IDS,
+    answers_to_array, pole_score_delta, pole_scores, result_from_scores, results_from_scores,
+)
+
+
+# 롤링 배포 중 이전 버전 인스턴스가 읽을 수 있도록 JSON 답변도 함께 기록
+ANSWERS_JSON_DUAL_WRITE = os.getenv("MBTI_ANSWERS_JSON_DUAL_WRITE", "") == "1"
+
+
+def session_answers(sess: MbtiSession) -> np.ndarray:
+    """세션 답변 → 길이 48 배열 (0 = 미응답). 압축 인코딩 우선, 없으면 이전 JSON 형식"""
+    if sess.answers_packed is not None:
+        return decode_answers(sess.answers_packed)
+    return answers_to_array(sess.answers or {})
+
+
+def _ensure_totals(sess: MbtiSession, current: np.ndarray | None = None) -> None:
+    """누적 점수가 없는 (이전 버전) 세션은 저장된 답변으로 한 번 계산"""
+    if sess.pole_scores is not None and sess.answered_count is not None:
+        return
+    current = session_answers(sess) if current is None else current
+    sess.pole_scores = pole_scores(current).tolist()
+    sess.answered_count = int(np.count_nonzero(current))
+
+
+def apply_answers(sess: MbtiSession, new: np.ndarray, old: np.ndarray | None = None) -> int:
+    """세션 답변을 new로 교체하고 누적 점수를 변경분만큼 갱신. 변경된 문항 수 반환"""
+    old = session_answers(sess) if old is None else old
+    _ensure_totals(sess, old)
+    changed = int(np.count_nonzero(old != new))
+    if changed:
+        sess.pole_scores = (np.asarray(sess.pole_scores) + pole_score_delta(old, new)).tolist()
+        sess.answered_count = int(np.count_nonzero(new))
+        _store_answers(sess, new)
+        _materialize(sess)
+    return changed
+
+
+def merge_answers(sess: MbtiSession, patch: np.ndarray) -> int:
+    """patch에서 응답된(0이 아닌) 문항만 덮어쓰기. 변경된 문항 수 반환 (0이면 상태 변경 없음)"""
+    old = session_answers(sess)
+    return apply_answers(sess, np.where(patch > 0, patch, old), old)
+
+
+def _store_answers(sess: MbtiSession, answers: np.ndarray) -> None:
+    sess.answers_packed = encode_answers(answers)
+    if ANSWERS_JSON_DUAL_WRITE:
+        sess.answers = {QUESTION_IDS[i]: int(answers[i]) for i in np.flatnonzero(answers)}
+    else:
+        sess.answers = None
+
+
+def _materialize(sess: MbtiSession) -> None:
+    """완료 세션은 결과 컬럼 저장, 미완료로 돌아가면 비움"""
+    if sess.answered_count >= NUM_QUESTIONS:
+        result = result_from_scores(sess.pole_scores)
+        sess.mbti_type = result["type"]
+        sess.percentages = result["percentages"]
+        sess.completed_at = sess.completed_at or datetime.utcnow()
+    else:
+        sess.mbti_type = None
+        sess.percentages = None
+        sess.completed_at = None
+
+
+def new_session(session_id: str, answers: np.ndarray) -> MbtiSession:
+    """새 세션 생성 - 빈 상태에서 증분 갱신"""
+    sess = MbtiSession(
+        id=session_id, pole_scores=EMPTY_POLE_SCORES.tolist(), answered_count=0,
+    )
+    apply_answers(sess, answers)
+    return sess
+
+
+def new_session_rows(session_ids: list[str], answers: np.ndarray) -> tuple[list[dict], list[dict | None]]:
+    """여러 새 세션의 INSERT 행과 결과를 한 번의 행렬 채점으로 생성 (일괄 등록용)
+
+    answers: (N, 48) 응답 행렬. 반환: (mbti_sessions 행 목록, 세션별 결과 - 미완료면 None)
+    """
+    scores = pole_scores(answers)
+    counts = np.count_nonzero(answers, axis=1).tolist()
+    scored = results_from_scores(scores)
+    now = datetime.utcnow()
+    rows, results = [], []
+    for sid, arr, s, n, res in zip(session_ids, answers, scores.tolist(), counts, scored):
+        done = n >= NUM_QUESTIONS
+        rows.append({
+            "id": sid,
+            "answers": {QUESTION_IDS[i]: int(arr[i]) for i in np.flatnonzero(arr)} if ANSWERS_JSON_DUAL_WRITE else None,
+            "answers_packed": encode_answers(arr),
+            "pole_scores": s,
+            "answered_count": n,
+            "mbti_type": res["type"] if done else None,
+            "percentages": res["percentages"] if done else None,
+            "completed_at": now if done else None,
+            "version": 1,
+            "updated_at": now,
+        })
+        results.append(res if done else None)
+    return rows, results
+
+
+def is_complete(sess: MbtiSession) -> bool:
+    _ensure_totals(sess)
+    return sess.answered_count >= NUM_QUESTIONS
+
+
+def session_result(sess: MbtiSession) -> dict | None:
+    """완료된 세션의 결과 - 저장된 결과 컬럼, 없으면 누적 점수에서 계산. 미완료면 None"""
+    if sess.mbti_type:
+        return {"type": sess.mbti_type, "percentages": sess.percentages}
+    if not is_complete(sess):
+        return None
+    return result_from_scores(sess.pole_scores)
+
+
+def session_results(sessions: list[MbtiSession]) -> list[dict | None]:
+    """여러 세션 결과 - 결과 컬럼이 없는 완료 세션만 모아 한 번에 채점"""
+    results: list[dict | None] = [
+        {"type": s.mbti_type, "percentages": s.percentages} if s.mbti_type else None for s in sessions
+    ]
+    pending = [i for i, s in enumerate(sessions) if results[i] is None and is_complete(s)]
+    if pending:
+        scored = results_from_scores(np.array([sessions[i].pole_scores for i in pending]))
+        for i, r in zip(pending, scored):
+            results[i] = r
+    return results
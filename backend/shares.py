@@ -0,0 +1,35 @@
+"""
+공유 결과 저장 형식 - 유형, 퍼센트, 세션 ID, 리포트 템플릿 버전만 저장하고 리포트 본문은 읽을 때 템플릿 표에서 조인
+이전 형식(리포트 본문 전체 복사)도 읽기는 지원. python maintenance.py compact-shares 로 새 형식 변환
+"""
+from typing import Optional
+
+from report_templates import REPORT_TEMPLATE_VERSION, report_for
+
+
+def share_record(result: dict, session_id: str) -> dict:
+    """Share.data로 저장할 내용"""
+    return {
+        "type": result["type"],
+        "percentages": result["percentages"],
+        "session_id": session_id,
+        "template_version": REPORT_TEMPLATE_VERSION,
+    }
+
+
+def expand_share(data: dict) -> dict:
+    """저장된 Share.data → 응답 {type, percentages, session_id, report}"""
+    if "template_version" not in data:  # 이전 형식 - 리포트 포함
+        return data
+    out = {k: v for k, v in data.items() if k != "template_version"}
+    out["report"] = report_for(data.get("type", ""), data["template_version"])
+    return out
+
+
+def compact_share(data: dict) -> Optional[dict]:
+    """이전 형식 → 새 형식. 이미 새 형식이거나 리포트가 현재 템플릿과 다르면(문구 변경 전 생성) None"""
+    if "template_version" in data or "type" not in data:
+        return None
+    if data.get("report") != report_for(data["type"]):
+        return None
+    return share_record(data, data.get("session_id"))
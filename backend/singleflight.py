@@ -0,0 +1,100 @@
+"""
+동일 요청 합치기 (single-flight) - 같은 키로 동시에 진행 중인 작업이 있으면 새로 시작하지 않고 그 결과를 함께 기다림
+결과와 예외는 기다리는 모든 호출자에게 전달. 이벤트 루프 안에서만 사용 (스레드 안전 아님)
+"""
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class FlightAborted(Exception):
+    """진행 중이던 작업이 취소됨 (시작한 쪽 연결 종료, 대기자 전원 취소 등) - 합류한 쪽은 새로 시작하면 됨"""
+
+
+class _Flight:
+    __slots__ = ("future", "task", "waiters")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """fn() 실행 또는 진행 중인 같은 키 작업에 합류 → (결과, 합류 여부)
+
+        작업은 별도 태스크로 돌기 때문에 기다리던 호출자 하나가 취소돼도 다른 호출자에게 영향 없음.
+        기다리는 호출자가 모두 취소되면 작업도 취소. 합류한 작업이 중단되면(FlightAborted) 새로 시작하거나 다시 합류
+        """
+        while True:
+            flight = self._flights.get(key)
+            joined = flight is not None
+            if not joined:
+                flight = self._start(key)
+                flight.task = asyncio.ensure_future(fn())
+                flight.task.add_done_callback(partial(self._settle, key, flight))
+            try:
+                return await self._wait(key, flight), joined
+            except FlightAborted:
+                if not joined:
+                    raise
+
+    async def wait(self, key: Hashable) -> Any:
+        """진행 중인 같은 키 작업의 결과를 기다림 (in_flight(key)일 때만)"""
+        return await self._wait(key, self._flights[key])
+
+    def begin(self, key: Hashable) -> _Flight:
+        """호출자가 직접 수행하는 작업 등록 (스트리밍 등). 반드시 finish()로 종료"""
+        return self._start(key)
+
+    def finish(self, key: Hashable, flight: _Flight, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """작업 종료 - 대기자 전원에게 결과 또는 예외 전달"""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        fut = flight.future
+        if fut.done():
+            return
+        if error is None:
+            fut.set_result(result)
+        else:
+            if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+                error = FlightAborted()
+            fut.set_exception(error)
+            fut.exception()  # 대기자가 없어도 "exception was never retrieved" 경고 방지
+
+    def _start(self, key: Hashable) -> _Flight:
+        flight = _Flight(asyncio.get_running_loop().create_future())
+        self._flights[key] = flight
+        return flight
+
+    async def _wait(self, key: Hashable, flight: _Flight) -> Any:
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.future)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and flight.task is not None and not flight.task.done():
+                # 마지막 대기자 - 작업 취소. 새 요청은 새 작업으로 시작
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _settle(self, key: Hashable, flight: _Flight, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self.finish(key, flight, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self.finish(key, flight, error=task.exception())
+        else:
+            self.finish(key, flight, result=task.result())
@@ -0,0 +1,89 @@
+"""
+정적 콘텐츠 응답 사전 렌더링 - 배포 시에만 바뀌는 데이터(설문, 기본 리포트, 직무 추천, 궁합)
+가능한 응답 전체를 시작 시 한 번 JSON 바이트로 만들고 gzip/brotli 변형과 ETag를 함께 보관
+핸들러는 바이트를 그대로 내려주고 If-None-Match가 일치하면 304
+
+환경 변수
+- STATIC_CACHE_MAX_AGE: Cache-Control max-age(초, 기본 86400)
+"""
+import gzip
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import brotli
+from fastapi import Request
+from fastapi.responses import Response
+
+STATIC_CACHE_MAX_AGE = int(os.getenv("STATIC_CACHE_MAX_AGE", "86400"))
+CACHE_CONTROL = f"public, max-age={STATIC_CACHE_MAX_AGE}"
+MEDIA_TYPE = "application/json"
+
+
+def dumps(content: Any) -> bytes:
+    """FastAPI JSONResponse와 같은 직렬화"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class StaticResponse:
+    body: bytes
+    gzip: bytes
+    br: bytes
+    etag: str  # 약한 ETag - 인코딩 변형이 같은 값을 공유
+
+    @classmethod
+    def render(cls, content: Any) -> "StaticResponse":
+        body = dumps(content)
+        return cls(
+            body=body,
+            gzip=gzip.compress(body, compresslevel=9, mtime=0),
+            br=brotli.compress(body, quality=11),
+            etag=f'W/"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+
+
+def _accepted_encodings(header: str) -> set[str]:
+    """Accept-Encoding → q > 0 인 인코딩 집합"""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match 약한 비교"""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == opaque for t in header.split(","))
+
+
+def serve(request: Request, entry: StaticResponse, cache_control: str = CACHE_CONTROL) -> Response:
+    """사전 렌더링된 응답 - 304 / br / gzip / 원본 중 선택"""
+    headers = {"ETag": entry.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), entry.etag):
+        return Response(status_code=304, headers=headers)
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    if "br" in accepted:
+        body, headers["Content-Encoding"] = entry.br, "br"
+    elif "gzip" in accepted:
+        body, headers["Content-Encoding"] = entry.gzip, "gzip"
+    else:
+        body = entry.body
+    return Response(content=body, media_type=MEDIA_TYPE, headers=headers)
+
+
+def render_table(contents: dict[Any, Any]) -> dict[Any, StaticResponse]:
+    return {key: StaticResponse.render(content) for key, content in contents.items()}
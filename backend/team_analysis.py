@@ -0,0 +1,81 @@
+"""
+팀(대규모 그룹) 궁합 분석 - 구성원을 16칸 유형 히스토그램으로 줄인 뒤 궁합 표와 곱해 계산
+비용은 인원 수와 무관하게 O(16²)
+"""
+import numpy as np
+
+from compatibility import COMPATIBILITY_MATRIX, RELATIONSHIP_TYPES
+from scoring import DIMENSIONS, TYPE_CODES, TYPES_BY_CODE
+
+_REL_KEYS = tuple(RELATIONSHIP_TYPES)
+_REL_INDEX = np.array([[_REL_KEYS.index(e["relationship_key"]) for e in row] for row in COMPATIBILITY_MATRIX])
+# _POLE_BITS[code, d] = 1 이면 d번째 지표에서 두 번째 극
+_POLE_BITS = np.array([[code >> (3 - d) & 1 for d in range(len(DIMENSIONS))] for code in range(len(TYPES_BY_CODE))])
+HOTSPOT_LIMIT = 5
+
+
+def type_histogram(types: list[str]) -> np.ndarray:
+    """유형 목록 → 길이 16 인원 수 (4비트 코드 순). 유효하지 않은 유형은 ValueError"""
+    try:
+        codes = [TYPE_CODES[t.upper()] for t in types]
+    except KeyError as e:
+        raise ValueError(f"유효하지 않은 MBTI 유형: {e.args[0]}") from None
+    return np.bincount(np.array(codes, dtype=np.int64), minlength=len(TYPES_BY_CODE))
+
+
+def _pair_counts(hist: np.ndarray) -> np.ndarray:
+    """유형 쌍별 구성원 쌍 수 (순서 없는 쌍, 상삼각만 사용). 같은 유형끼리는 nC2"""
+    pairs = np.outer(hist, hist)
+    np.fill_diagonal(pairs, hist * (hist - 1) // 2)
+    return np.triu(pairs)
+
+
+def analyze_team(hist: np.ndarray) -> dict:
+    """히스토그램 → 관계 유형 분포, 지표별 균형, 갈등 핫스팟"""
+    hist = np.asarray(hist, dtype=np.int64)
+    members = int(hist.sum())
+    pairs = _pair_counts(hist)
+    total_pairs = int(pairs.sum())
+
+    rel_pairs = np.bincount(_REL_INDEX.ravel(), weights=pairs.ravel(), minlength=len(_REL_KEYS)).astype(np.int64)
+    relationship_distribution = {
+        key: {
+            "label": RELATIONSHIP_TYPES[key],
+            "pairs": int(n),
+            "ratio": round(n / total_pairs, 4) if total_pairs else 0.0,
+        }
+        for key, n in zip(_REL_KEYS, rel_pairs)
+    }
+
+    second = hist @ _POLE_BITS  # 지표별 두 번째 극 인원
+    dimension_balance = {}
+    for dim, n2 in zip(DIMENSIONS, second.tolist()):
+        n1 = members - n2
+        dimension_balance[dim] = {
+            dim[0]: n1,
+            dim[2]: n2,
+            "conflict_pairs": n1 * n2,  # 이 지표에서 극이 다른 구성원 쌍
+        }
+
+    challenging = np.where(_REL_INDEX == _REL_KEYS.index("challenging"), pairs, 0)
+    order = np.argsort(challenging, axis=None, kind="stable")[::-1][:HOTSPOT_LIMIT]
+    conflict_hotspots = []
+    for a, b in zip(*np.unravel_index(order, challenging.shape)):
+        if challenging[a, b] == 0:
+            break
+        entry = COMPATIBILITY_MATRIX[a][b]
+        conflict_hotspots.append({
+            "type_a": entry["type_a"],
+            "type_b": entry["type_b"],
+            "pairs": int(challenging[a, b]),
+            "conflict_points": list(entry["conflict_points"]),
+        })
+
+    return {
+        "members": members,
+        "histogram": {t: int(n) for t, n in zip(TYPES_BY_CODE, hist) if n},
+        "total_pairs": total_pairs,
+        "relationship_distribution": relationship_distribution,
+        "dimension_balance": dimension_balance,
+        "conflict_hotspots": conflict_hotspots,
+    }
@@ -1,5 +1,5 @@
 """MindMBTI API 테스트"""
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 from main import app
 
@@ -52,6 +52,18 @@ def test_login_wrong_password():
     assert r.status_code == 401
 
 
+def test_login_hash_pool_busy(monkeypatch):
+    import main
+
+    client.post("/api/auth/register", json={"email": "busy@example.com", "password": "pwd", "nickname": "B"})
+    monkeypatch.setattr(main.password_hasher, "max_pending", 0)
+    r = client.post("/api/auth/login", json={"email": "busy@example.com", "password": "pwd"})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+    r = client.post("/api/auth/register", json={"email": "busy2@example.com", "password": "pwd", "nickname": "B"})
+    assert r.status_code == 503
+
+
 # --- FR-003: 회원정보 수정 ---
 def test_get_profile_unauthorized():
     r = client.get("/api/user/me")
@@ -90,6 +102,42 @@ def test_update_profile_invalid_gender():
     assert r2.status_code == 400
 
 
+def test_auth_user_lookup_cached():
+    from sqlalchemy import event
+    from conftest import test_engine
+
+    client.post("/api/auth/register", json={"email": "cache@example.com", "password": "pwd", "nickname": "C"})
+    token = client.post("/api/auth/login", json={"email": "cache@example.com", "password": "pwd"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    user_queries = []
+
+    def count(conn, cursor, statement, *args):
+        if "FROM users" in statement:
+            user_queries.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", count)
+    try:
+        assert client.get("/api/user/me", headers=headers).json()["nickname"] == "C"
+        assert len(user_queries) == 1  # 프로필 조회 시 회원 조회는 1회
+        user_queries.clear()
+        client.get("/api/dashboard/history", headers=headers)
+        client.get("/api/dashboard/history", headers=headers)
+        assert user_queries == []  # 존재 확인은 캐시
+        r = client.patch("/api/user/me", headers=headers, json={"nickname": "D"})
+        assert r.json()["nickname"] == "D"
+        user_queries.clear()
+        client.get("/api/dashboard/history", headers=headers)
+        assert len(user_queries) == 1  # 프로필 변경 후 캐시 무효화
+    finally:
+        event.remove(test_engine, "before_cursor_execute", count)
+
+
+def test_auth_invalid_token():
+    r = client.get("/api/dashboard/history", headers={"Authorization": "Bearer not-a-jwt"})
+    assert r.status_code == 401
+
+
 # --- Phase 2: MBTI 설문 및 결과 ---
 def test_mbti_questions():
     r = client.get("/api/mbti/questions")
@@ -119,6 +167,209 @@ def test_mbti_submit_and_result():
         assert dim in data["percentages"]
 
 
+def test_mbti_submit_compact_formats():
+    values = [(i % 5) + 1 for i in range(48)]
+    items = [{"question_id": i + 1, "value": v} for i, v in enumerate(values)]
+    s_items = client.post("/api/mbti/submit", json={"answers": items}).json()["session_id"]
+    r_arr = client.post("/api/mbti/submit", json={"answers": values})
+    r_str = client.post("/api/mbti/submit", json={"answers": "".join(map(str, values))})
+    assert r_arr.status_code == 200 and r_arr.json()["saved"] == 48
+    assert r_str.status_code == 200 and r_str.json()["saved"] == 48
+    expected = client.get(f"/api/mbti/result/{s_items}").json()
+    for r in (r_arr, r_str):
+        got = client.get(f"/api/mbti/result/{r.json()['session_id']}").json()
+        assert got["type"] == expected["type"]
+        assert got["percentages"] == expected["percentages"]
+
+    partial = client.post("/api/mbti/submit", json={"answers": "0" * 40 + "3" * 8})
+    assert partial.json()["saved"] == 8
+
+
+def test_mbti_submit_compact_invalid():
+    for bad in ["3" * 47, "3" * 47 + "6", "3" * 47 + "x", [3] * 47 + [9], [3] * 49]:
+        r = client.post("/api/mbti/submit", json={"answers": bad})
+        assert r.status_code == 422, bad
+
+
+def test_mbti_patch_answers():
+    r = client.post("/api/mbti/submit", json={"answers": "3" * 24 + "0" * 24})
+    sid, version = r.json()["session_id"], r.json()["version"]
+
+    r2 = client.patch(
+        f"/api/mbti/session/{sid}/answers",
+        json={"answers": [{"question_id": 25, "value": 5}, {"question_id": 1, "value": 3}], "version": version},
+    )
+    assert r2.status_code == 200
+    assert r2.json()["changed"] == 1
+    assert r2.json()["answered"] == 25
+    assert r2.json()["version"] == version + 1
+
+    # 변경 없는 PATCH는 버전을 올리지 않음
+    r3 = client.patch(f"/api/mbti/session/{sid}/answers", json={"answers": [{"question_id": 25, "value": 5}], "version": version + 1})
+    assert r3.json()["changed"] == 0
+    assert r3.json()["version"] == version + 1
+
+    r4 = client.patch(f"/api/mbti/session/{sid}/answers", json={"answers": "0" * 25 + "4" * 23, "version": version + 1})
+    assert r4.json()["answered"] == 48
+    full = client.get(f"/api/mbti/result/{sid}").json()
+    expected = client.get(
+        "/api/mbti/result/" + client.post("/api/mbti/submit", json={"answers": "3" * 24 + "5" + "4" * 23}).json()["session_id"]
+    ).json()
+    assert full["percentages"] == expected["percentages"]
+
+
+def test_mbti_patch_answers_version_conflict():
+    r = client.post("/api/mbti/submit", json={"answers": "3" * 10 + "0" * 38})
+    sid, version = r.json()["session_id"], r.json()["version"]
+    ok = client.patch(f"/api/mbti/session/{sid}/answers", json={"answers": [{"question_id": 11, "value": 2}], "version": version})
+    assert ok.status_code == 200
+    stale = client.patch(f"/api/mbti/session/{sid}/answers", json={"answers": [{"question_id": 12, "value": 2}], "version": version})
+    assert stale.status_code == 409
+    assert stale.headers["X-Session-Version"] == str(version + 1)
+    missing = client.patch("/api/mbti/session/nope/answers", json={"answers": [], "version": 1})
+    assert missing.status_code == 404
+
+
+def test_mbti_write_behind_buffer(monkeypatch):
+    import asyncio
+    import main
+    from autosave_buffer import WriteBehindBuffer
+    from conftest import TestingSessionLocal
+    from models import MbtiSession
+
+    buf = WriteBehindBuffer(TestingSessionLocal, max_sessions=100, interval=60)
+    monkeypatch.setattr(main, "write_behind", buf)
+
+    r = client.post("/api/mbti/submit", json={"answers": "4" * 20 + "0" * 28})
+    sid = r.json()["session_id"]
+    for n in range(21, 49):
+        r = client.post("/api/mbti/submit", json={"answers": "4" * n + "0" * (48 - n), "session_id": sid})
+    assert r.json()["version"] == 29
+    db = TestingSessionLocal()
+    assert db.get(MbtiSession, sid) is None  # 아직 DB에 쓰지 않음
+    # 읽기는 버퍼에서
+    res = client.get(f"/api/mbti/result/{sid}")
+    assert res.status_code == 200
+    p = client.patch(f"/api/mbti/session/{sid}/answers", json={"answers": [{"question_id": 1, "value": 1}], "version": 29})
+    assert p.json()["version"] == 30
+    batch = client.post("/api/mbti/result/batch", json={"session_ids": [sid]}).json()
+    assert batch["results"][0]["session_id"] == sid
+
+    asyncio.run(buf.stop())  # 종료 시 flush
+    assert len(buf) == 0
+    sess = db.get(MbtiSession, sid)
+    assert sess.version == 30 and sess.answered_count == 48
+    assert sess.mbti_type == client.get(f"/api/mbti/result/{sid}").json()["type"]
+    db.close()
+    # DB 반영 후에도 버퍼 경로로 계속 변경 가능
+    p2 = client.patch(f"/api/mbti/session/{sid}/answers", json={"answers": [{"question_id": 1, "value": 5}], "version": 30})
+    assert p2.json()["version"] == 31
+
+
+def test_mbti_write_behind_buffer_bounded(monkeypatch):
+    import main
+    from autosave_buffer import WriteBehindBuffer
+    from conftest import TestingSessionLocal
+    from models import MbtiSession
+
+    buf = WriteBehindBuffer(TestingSessionLocal, max_sessions=3, interval=60)
+    monkeypatch.setattr(main, "write_behind", buf)
+    for _ in range(4):
+        client.post("/api/mbti/submit", json={"answers": "3" * 48})
+    assert len(buf) == 0  # 상한 초과 시 즉시 반영
+    db = TestingSessionLocal()
+    assert db.query(MbtiSession).count() == 4
+    db.close()
+
+
+def test_mbti_write_behind_buffer_backpressure(monkeypatch):
+    import main
+    from autosave_buffer import WriteBehindBuffer
+    from conftest import TestingSessionLocal
+    from models import MbtiSession
+
+    down = True
+
+    def session_factory():
+        if down:
+            broken = MagicMock()
+            broken.get_bind.return_value.dialect.name = "sqlite"
+            broken.execute.side_effect = RuntimeError("db down")
+            return broken
+        return TestingSessionLocal()
+
+    buf = WriteBehindBuffer(session_factory, max_sessions=2, interval=3)
+    monkeypatch.setattr(main, "write_behind", buf)
+    ids = [client.post("/api/mbti/submit", json={"answers": "3" * 48}).json()["session_id"] for _ in range(3)]
+    assert len(buf) == 3  # 즉시 flush 실패 - 이미 받은 답변은 200, 버퍼에 남음
+    r = client.post("/api/mbti/submit", json={"answers": "3" * 48})
+    assert r.status_code == 503 and r.headers["retry-after"] == "3"  # 새 세션은 거절
+    r = client.post("/api/mbti/submit", json={"session_id": ids[0], "answers": "4" * 48})
+    assert r.status_code == 200  # 버퍼에 있는 세션 변경은 허용
+
+    down = False
+    assert buf.flush() == 3
+    assert client.post("/api/mbti/submit", json={"answers": "3" * 48}).status_code == 200
+    db = TestingSessionLocal()
+    assert db.query(MbtiSession).filter(MbtiSession.id.in_(ids)).count() == 3
+    db.close()
+
+
+def test_purge_abandoned_sessions():
+    from datetime import datetime, timedelta
+    from conftest import TestingSessionLocal
+    from maintenance import purge_abandoned_sessions
+    from models import ArchivedMbtiSession, MbtiSession
+
+    old = datetime.utcnow() - timedelta(days=40)
+    stale = [client.post("/api/mbti/submit", json={"answers": "3" * 10 + "0" * 38}).json()["session_id"] for _ in range(5)]
+    done = client.post("/api/mbti/submit", json={"answers": "3" * 48}).json()["session_id"]
+    fresh = client.post("/api/mbti/submit", json={"answers": "3" * 10 + "0" * 38}).json()["session_id"]
+    db = TestingSessionLocal()
+    db.query(MbtiSession).filter(MbtiSession.id.in_(stale + [done])).update(
+        {MbtiSession.updated_at: old}, synchronize_session=False,
+    )
+    db.commit()
+
+    report = purge_abandoned_sessions(TestingSessionLocal, timedelta(days=30), batch_size=2, archive=True)
+    assert report.rows == 5 and report.batches == 3
+    assert report.rows_per_sec > 0
+    remaining = {s.id for s in db.query(MbtiSession).all()}
+    assert remaining == {done, fresh}
+    archived = db.query(ArchivedMbtiSession).all()
+    assert {a.id for a in archived} == set(stale)
+    assert all(a.answered_count == 10 and len(a.answers_packed) == 18 for a in archived)
+    db.close()
+
+
+def test_purge_skips_session_resumed_mid_batch(monkeypatch):
+    from datetime import datetime, timedelta
+    from sqlalchemy import update
+    import maintenance
+    from conftest import TestingSessionLocal
+    from models import ArchivedMbtiSession, MbtiSession
+
+    stale = [client.post("/api/mbti/submit", json={"answers": "2" * 10 + "0" * 38}).json()["session_id"] for _ in range(2)]
+    db = TestingSessionLocal()
+    db.query(MbtiSession).filter(MbtiSession.id.in_(stale)).update(
+        {MbtiSession.updated_at: datetime.utcnow() - timedelta(days=40)}, synchronize_session=False,
+    )
+    db.commit()
+    archive_rows = maintenance._archive_rows
+
+    def resume_then_archive(session, ids, cutoff):
+        # id 조회 직후 사용자가 stale[0]을 이어서 응답
+        session.execute(update(MbtiSession).where(MbtiSession.id == stale[0]).values(updated_at=datetime.utcnow()))
+        archive_rows(session, ids, cutoff)
+
+    monkeypatch.setattr(maintenance, "_archive_rows", resume_then_archive)
+    report = maintenance.purge_abandoned_sessions(TestingSessionLocal, timedelta(days=30), archive=True)
+    assert report.rows == 1
+    assert db.get(MbtiSession, stale[0]) is not None and db.get(MbtiSession, stale[1]) is None
+    assert db.get(ArchivedMbtiSession, stale[0]) is None
+    db.close()
+
+
 def test_mbti_result_incomplete():
     answers = [{"question_id": i, "value": 3} for i in range(1, 30)]
     r = client.post("/api/mbti/submit", json={"answers": answers})
@@ -132,6 +383,154 @@ def test_mbti_result_not_found():
     assert r.status_code == 404
 
 
+def test_mbti_result_uses_stored_answers():
+    # E/I 문항만 E 쪽으로 강하게 응답 → 저장 후 재조회 시에도 E로 채점되어야 함
+    answers = [{"question_id": i, "value": (5 if i % 2 else 1) if i <= 12 else 3} for i in range(1, 49)]
+    sid = client.post("/api/mbti/submit", json={"answers": answers}).json()["session_id"]
+    data = client.get(f"/api/mbti/result/{sid}").json()
+    assert data["type"][0] == "E"
+    assert data["percentages"]["E/I"]["E"] > 50
+
+
+def test_mbti_submit_updates_running_scores():
+    import random
+    from scoring import score_answers
+
+    rng = random.Random(7)
+    sid = None
+    answers = {}
+    for _ in range(6):
+        answers.update({q: rng.randint(1, 5) for q in rng.sample(range(1, 49), 20)})
+        for q in rng.sample(sorted(answers), 3):
+            answers.pop(q)  # 이전 제출에 있던 답변 제거
+        items = [{"question_id": q, "value": v} for q, v in answers.items()]
+        sid = client.post("/api/mbti/submit", json={"answers": items, "session_id": sid}).json()["session_id"]
+    full = {q: rng.randint(1, 5) for q in range(1, 49)}
+    items = [{"question_id": q, "value": v} for q, v in full.items()]
+    client.post("/api/mbti/submit", json={"answers": items, "session_id": sid})
+    data = client.get(f"/api/mbti/result/{sid}").json()
+    expected = score_answers(full)
+    assert data["type"] == expected["type"]
+    assert data["percentages"] == expected["percentages"]
+
+
+def test_mbti_result_legacy_session_without_scores():
+    from conftest import TestingSessionLocal
+    from models import MbtiSession
+
+    from scoring import score_answers
+
+    legacy = {str(i): (i % 5) + 1 for i in range(1, 49)}
+    db = TestingSessionLocal()
+    db.add(MbtiSession(id="legacy-session", answers=legacy))
+    db.commit()
+    db.close()
+    r = client.get("/api/mbti/result/legacy-session")
+    assert r.status_code == 200
+    assert r.json()["type"] == score_answers(legacy)["type"]
+
+
+def test_mbti_session_materializes_result():
+    from conftest import TestingSessionLocal
+    from models import MbtiSession
+
+    answers = [{"question_id": i, "value": 4} for i in range(1, 49)]
+    sid = client.post("/api/mbti/submit", json={"answers": answers}).json()["session_id"]
+    db = TestingSessionLocal()
+    sess = db.get(MbtiSession, sid)
+    assert sess.mbti_type == client.get(f"/api/mbti/result/{sid}").json()["type"]
+    assert sess.completed_at is not None
+
+    client.post("/api/mbti/submit", json={"answers": answers[:40], "session_id": sid})
+    db.expire_all()
+    sess = db.get(MbtiSession, sid)
+    assert sess.mbti_type is None and sess.completed_at is None
+    db.close()
+
+
+def test_answer_codec_roundtrip():
+    import numpy as np
+    from answer_codec import PACKED_SIZE, decode_answers, decode_answers_batch, encode_answers
+
+    rows = np.random.default_rng(3).integers(0, 6, size=(50, 48))
+    blobs = [encode_answers(r) for r in rows]
+    assert all(len(b) == PACKED_SIZE == 18 for b in blobs)
+    assert (decode_answers_batch(blobs) == rows).all()
+    assert (decode_answers(blobs[0]) == rows[0]).all()
+
+
+def test_mbti_submit_stores_packed_answers():
+    from conftest import TestingSessionLocal
+    from models import MbtiSession
+
+    answers = [{"question_id": i, "value": (i % 5) + 1} for i in range(1, 49)]
+    sid = client.post("/api/mbti/submit", json={"answers": answers}).json()["session_id"]
+    db = TestingSessionLocal()
+    sess = db.get(MbtiSession, sid)
+    assert sess.answers is None
+    assert len(sess.answers_packed) == 18
+    db.close()
+    # 압축 형식에서 읽어 변경분만 반영되어야 함
+    answers[0]["value"] = 5
+    client.post("/api/mbti/submit", json={"answers": answers, "session_id": sid})
+    from scoring import score_answers
+    expected = score_answers({a["question_id"]: a["value"] for a in answers})
+    assert client.get(f"/api/mbti/result/{sid}").json()["percentages"] == expected["percentages"]
+
+
+def test_mbti_result_batch():
+    full = [{"question_id": i, "value": 4} for i in range(1, 49)]
+    partial = [{"question_id": i, "value": 4} for i in range(1, 10)]
+    s1 = client.post("/api/mbti/submit", json={"answers": full}).json()["session_id"]
+    s2 = client.post("/api/mbti/submit", json={"answers": full}).json()["session_id"]
+    s3 = client.post("/api/mbti/submit", json={"answers": partial}).json()["session_id"]
+    r = client.post("/api/mbti/result/batch", json={"session_ids": [s1, s2, s3, "missing-id"]})
+    assert r.status_code == 200
+    data = r.json()
+    assert [x["session_id"] for x in data["results"]] == [s1, s2]
+    single = client.get(f"/api/mbti/result/{s1}").json()
+    assert data["results"][0]["type"] == single["type"]
+    assert data["results"][0]["percentages"] == single["percentages"]
+    assert data["incomplete"] == [s3]
+    assert data["not_found"] == ["missing-id"]
+
+
+def _auth_headers(email: str) -> dict:
+    client.post("/api/auth/register", json={"email": email, "password": "pwd", "nickname": "기관"})
+    token = client.post("/api/auth/login", json={"email": email, "password": "pwd"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_mbti_import_ndjson():
+    import json
+    import main
+
+    lines = [json.dumps({"answers": "4" * 48, "external_id": f"sheet-{i}"}) for i in range(7)]
+    lines.insert(2, "not json")
+    lines.insert(4, json.dumps({"answers": "9" * 48}))
+    lines.append(json.dumps({"answers": [{"question_id": 1, "value": 5}], "external_id": "partial"}))
+    body = "\n".join(lines) + "\n\n" + "x" * (main.IMPORT_MAX_LINE_BYTES + 10)
+    old_chunk = main.IMPORT_CHUNK_SIZE
+    main.IMPORT_CHUNK_SIZE = 3
+    try:
+        r = client.post(
+            "/api/mbti/import", content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson", **_auth_headers("import@example.com")},
+        )
+    finally:
+        main.IMPORT_CHUNK_SIZE = old_chunk
+    assert r.status_code == 200
+    out = [json.loads(x) for x in r.text.splitlines()]
+    assert out[-1] == {"summary": {"imported": 8, "errors": 3}}
+    errors = sorted(o["line"] for o in out if "error" in o)
+    assert errors == [3, 5, 12]
+    ok = [o for o in out if "session_id" in o]
+    assert [o["external_id"] for o in ok] == [f"sheet-{i}" for i in range(7)] + ["partial"]
+    single = client.get(f"/api/mbti/result/{ok[0]['session_id']}").json()
+    assert ok[0]["type"] == single["type"] and ok[0]["percentages"] == single["percentages"]
+    assert ok[-1]["type"] is None and ok[-1]["answered"] == 1
+
+
 # --- Phase 3: 심리 분석 리포트 ---
 def test_basic_report():
     r = client.get("/api/report/basic/ENFP")
@@ -156,14 +555,13 @@ def test_basic_report_case_insensitive():
     assert r.json()["mbti_type"] == "INFP"
 
 
-@patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test-key"})
-@patch("openai.OpenAI")
-def test_ai_report(mock_openai):
+@patch("main.get_ai_client")
+def test_ai_report(mock_get_client):
     mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = MagicMock(
+    mock_client.chat.completions.create = AsyncMock(return_value=MagicMock(
         choices=[MagicMock(message=MagicMock(content="테스트 AI 해석입니다."))]
-    )
-    mock_openai.return_value = mock_client
+    ))
+    mock_get_client.return_value = mock_client
 
     r = client.post(
         "/api/report/ai",
@@ -181,6 +579,337 @@ def test_ai_report(mock_openai):
     assert "테스트 AI 해석" in data["ai_interpretation"]
 
 
+@patch("main.get_ai_client")
+def test_ai_report_cached(mock_get_client):
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(return_value=MagicMock(
+        choices=[MagicMock(message=MagicMock(content="캐시될 해석"))]
+    ))
+    mock_get_client.return_value = mock_client
+    body = {"mbti_type": "ISFJ", "job": "간호사"}
+    r1 = client.post("/api/report/ai", json=body)
+    r2 = client.post("/api/report/ai", json={**body, "mbti_type": "isfj", "job": " 간호사 "})
+    assert r1.json() == r2.json()
+    assert mock_client.chat.completions.create.await_count == 1  # 같은 유형/직업은 캐시에서
+    client.post("/api/report/ai", json={**body, "job": "교사"})
+    assert mock_client.chat.completions.create.await_count == 2
+    stats = client.get("/api/ai/cache/stats").json()
+    assert stats["entries"] == 2
+    assert stats["endpoints"]["report"]["hits"] >= 1
+
+
+def test_ai_cache_eviction():
+    from datetime import datetime, timedelta
+    from ai_cache import evict, put_cached
+    from conftest import TestingSessionLocal
+    from models import AiCacheEntry
+
+    db = TestingSessionLocal()
+    try:
+        for i in range(5):
+            put_cached(db, f"k{i}", "report", "m", f"t{i}")
+        db.query(AiCacheEntry).filter(AiCacheEntry.key == "k0").update({"expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        db.query(AiCacheEntry).filter(AiCacheEntry.key == "k1").update({"last_used_at": datetime.utcnow() - timedelta(days=1)})
+        db.commit()
+        assert evict(db, max_entries=3) == 2  # 만료 1 + 가장 오래 안 쓴 1
+        assert {k for (k,) in db.query(AiCacheEntry.key)} == {"k2", "k3", "k4"}
+    finally:
+        db.close()
+
+
+def test_ai_cache_hits_buffered():
+    from ai_cache import flush_hits, get_cached, put_cached
+    from conftest import TestingSessionLocal
+    from models import AiCacheEntry
+
+    db = TestingSessionLocal()
+    try:
+        put_cached(db, "hot", "report", "m", "t")
+        for _ in range(3):
+            assert get_cached(db, "hot", "report") == "t"
+        assert db.get(AiCacheEntry, "hot").hits == 0  # 조회는 쓰기 없음
+        flush_hits(db)
+        db.expire_all()
+        assert db.get(AiCacheEntry, "hot").hits == 3  # 모아서 한 번에
+    finally:
+        db.close()
+
+
+def _mock_stream_client(*pieces):
+    async def stream():
+        for p in pieces:
+            yield MagicMock(choices=[MagicMock(delta=MagicMock(content=p))])
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=lambda **kw: stream())
+    return mock_client
+
+
+def _sse_events(body: str) -> list[tuple[str, dict]]:
+    import json
+
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@patch("main.get_ai_client")
+def test_ai_report_stream(mock_get_client):
+    mock_get_client.return_value = _mock_stream_client("스트리밍 ", "해석")
+    r = client.post("/api/report/ai/stream", json={"mbti_type": "ENTP", "job": "기획자"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert [e for e, _ in events] == ["token", "token", "done"]
+    assert events[-1][1] == {"mbti_type": "ENTP", "ai_interpretation": "스트리밍 해석"}
+    # 스트리밍 결과도 캐시 - 일반 엔드포인트에서 적중
+    assert client.post("/api/report/ai", json={"mbti_type": "ENTP", "job": "기획자"}).json()["ai_interpretation"] == "스트리밍 해석"
+    assert client.post("/api/report/ai/stream", json={"mbti_type": "XXXX"}).status_code == 400
+
+
+@patch("main.get_ai_client")
+def test_ai_career_advice_stream(mock_get_client):
+    mock_get_client.return_value = _mock_stream_client('```json\n{"career_advice": "조언', '", "strength_strategy": "전략"}\n```')
+    r = client.post("/api/career/ai-advice/stream", json={"mbti_type": "ISTJ", "current_job": "회계사"})
+    event, data = _sse_events(r.text)[-1]
+    assert event == "done"
+    assert data["career_advice"] == "조언"
+    assert data["strength_strategy"] == "전략"
+
+
+def test_singleflight_coalesces_and_fans_out():
+    import asyncio
+    from singleflight import FlightAborted, SingleFlight
+
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.05)
+            if value == "boom":
+                raise RuntimeError("upstream")
+            return value
+
+        results = await asyncio.gather(*(flight.do("k", lambda: work("v")) for _ in range(5)))
+        assert calls == ["v"]
+        assert [r for r, _ in results] == ["v"] * 5
+        assert [joined for _, joined in results] == [False, True, True, True, True]
+        assert len(flight) == 0
+
+        errors = await asyncio.gather(*(flight.do("e", lambda: work("boom")) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(e, RuntimeError) for e in errors)
+
+        # 대기자 하나 취소 - 나머지는 결과를 받음
+        calls.clear()
+        a = asyncio.ensure_future(flight.do("c", lambda: work("c")))
+        b = asyncio.ensure_future(flight.do("c", lambda: work("c")))
+        await asyncio.sleep(0.01)
+        a.cancel()
+        assert (await b) == ("c", True)
+        assert calls == ["c"]
+
+        # 대기자 전원 취소 - 작업도 취소, 다음 호출은 새로 시작
+        c = asyncio.ensure_future(flight.do("d", lambda: work("d1")))
+        await asyncio.sleep(0.01)
+        c.cancel()
+        await asyncio.sleep(0.01)
+        assert not flight.in_flight("d")
+        assert (await flight.do("d", lambda: work("d2"))) == ("d2", False)
+
+        # 직접 수행(스트리밍) 작업 중단 - 합류한 대기자는 FlightAborted 대신 새로 시작해 결과를 받음
+        calls.clear()
+        f = flight.begin("s")
+        waiter = asyncio.ensure_future(flight.do("s", lambda: work("s2")))
+        await asyncio.sleep(0)
+        flight.finish("s", f, error=asyncio.CancelledError())
+        assert (await waiter) == ("s2", False)
+        assert calls == ["s2"]
+
+        # 직접 수행한 쪽은 중단을 FlightAborted로 구분
+        f = flight.begin("t")
+        flight.finish("t", f, error=GeneratorExit())
+        try:
+            await f.future
+            raise AssertionError("FlightAborted expected")
+        except FlightAborted:
+            pass
+
+    asyncio.run(scenario())
+
+
+def test_cached_stream_joiner_survives_leader_disconnect(monkeypatch):
+    import asyncio
+    import ai_cache
+
+    monkeypatch.setattr(ai_cache, "AI_CACHE_TTL", 0)
+    calls = []
+
+    async def fake_stream(client, prompt, max_tokens):
+        calls.append(prompt)
+        for piece in ("가", "나", "다"):
+            await asyncio.sleep(0.01)
+            yield piece
+
+    monkeypatch.setattr(ai_cache, "stream_complete", fake_stream)
+
+    async def collect(gen):
+        return "".join([piece async for piece in gen])
+
+    async def scenario():
+        leader = ai_cache.cached_stream(None, "report", None, "p", 10)
+        assert await leader.__anext__() == "가"
+        joiner = asyncio.ensure_future(collect(ai_cache.cached_stream(None, "report", None, "p", 10)))
+        await asyncio.sleep(0)
+        await leader.aclose()  # 시작한 쪽 연결 종료
+        return await joiner
+
+    assert asyncio.run(scenario()) == "가나다"  # 합류한 쪽은 새로 시작해 전체 응답을 받음
+    assert len(calls) == 2
+
+
+def test_ai_report_coalesced(monkeypatch):
+    import asyncio
+    import httpx
+    import ai_cache
+
+    monkeypatch.setattr(ai_cache, "AI_CACHE_TTL", 0)  # 캐시 없이 합치기만 확인
+
+    async def slow_create(**kwargs):
+        await asyncio.sleep(0.1)
+        return MagicMock(choices=[MagicMock(message=MagicMock(content="합쳐진 해석"))])
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(*(
+                ac.post("/api/report/ai", json={"mbti_type": "ESTJ", "job": "관리자"}) for _ in range(8)
+            ))
+
+    with patch("main.get_ai_client", return_value=mock_client):
+        responses = asyncio.run(burst())
+    assert all(r.json()["ai_interpretation"] == "합쳐진 해석" for r in responses)
+    assert mock_client.chat.completions.create.await_count == 1
+
+
+def test_ai_job_retries_then_succeeds(monkeypatch):
+    import asyncio
+    import httpx
+    import openai
+    import ai_cache
+    import main
+    from ai_jobs import JobQueue
+    from conftest import TestingSessionLocal
+
+    monkeypatch.setattr(ai_cache, "AI_CACHE_TTL", 0)
+    monkeypatch.setattr(main, "job_session_factory", TestingSessionLocal)
+    monkeypatch.setattr(main, "ai_jobs", JobQueue(concurrency=2, retries=2, backoff=0.01))
+
+    calls = []
+
+    async def flaky_create(**kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise openai.APIConnectionError(request=httpx.Request("POST", "http://upstream"))
+        return MagicMock(choices=[MagicMock(message=MagicMock(content="작업 해석"))])
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(side_effect=flaky_create)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            r = await ac.post("/api/jobs/report", json={"mbti_type": "INTJ", "job": "개발자"})
+            assert r.status_code == 202
+            job_id = r.json()["job_id"]
+            for _ in range(100):
+                job = (await ac.get(f"/api/jobs/{job_id}")).json()
+                if job["status"] in ("succeeded", "failed"):
+                    return job
+                await asyncio.sleep(0.01)
+            raise AssertionError("job did not finish")
+
+    with patch("main.get_ai_client", return_value=mock_client):
+        job = asyncio.run(scenario())
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 2
+    assert job["result"] == {"mbti_type": "INTJ", "ai_interpretation": "작업 해석"}
+    assert client.get("/api/jobs/없는작업").status_code == 404
+
+
+def test_ai_job_circuit_breaker(monkeypatch):
+    import asyncio
+    import openai
+    import httpx
+    from ai_jobs import CircuitBreaker, JobQueue
+
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    queue = JobQueue(concurrency=1, retries=0, breaker=breaker)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise openai.APIConnectionError(request=httpx.Request("POST", "http://upstream"))
+
+    async def ok():
+        calls.append(1)
+        return "ok"
+
+    async def run(fn):
+        job = queue.submit("test", fn)
+        await queue._queue.join()
+        return job
+
+    async def scenario():
+        assert (await run(failing)).error == "upstream_error"
+        assert (await run(failing)).error == "upstream_error"
+        assert breaker.state == "open"
+        assert (await run(ok)).error == "upstream_unavailable"  # 호출 없이 즉시 실패
+        assert len(calls) == 2
+        now[0] = 10
+        assert breaker.state == "half_open"
+        job = await run(ok)
+        assert job.status == "succeeded" and job.result == "ok"
+        assert breaker.state == "closed"
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_static_responses_etag_and_gzip():
+    r = client.get("/api/report/basic/intj", headers={"Accept-Encoding": "identity"})
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert "max-age" in r.headers["cache-control"]
+    assert r.json()["mbti_type"] == "INTJ"
+    r304 = client.get("/api/report/basic/INTJ", headers={"If-None-Match": etag})
+    assert r304.status_code == 304
+    assert r304.content == b""
+    assert client.get("/api/report/basic/ENFP", headers={"If-None-Match": etag}).status_code == 200
+
+    r = client.get("/api/mbti/questions", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert len(r.json()["questions"]) == 48  # httpx가 자동 해제
+
+    r = client.get("/api/mbti/questions", headers={"Accept-Encoding": "gzip, br"})
+    assert r.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert len(r.json()["questions"]) == 48  # brotli 설치 시 httpx가 자동 해제
+
+    for path in ("/api/career/match/INFP", "/api/compatibility/ENFP/INTJ"):
+        r = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+    post = client.post("/api/compatibility", json={"type_a": "enfp", "type_b": "intj"})
+    assert post.json() == r.json()
+
+
 @patch("main.os.getenv", return_value="")
 def test_ai_report_no_api_key(mock_getenv):
     r = client.post(
@@ -209,6 +938,56 @@ def test_compatibility_invalid():
     assert r.status_code == 400
 
 
+def test_compatibility_matrix():
+    r = client.get("/api/compatibility/matrix")
+    assert r.status_code == 200
+    data = r.json()
+    assert len(data["types"]) == 16
+    assert len(data["matrix"]) == 16 and all(len(row) == 16 for row in data["matrix"])
+    pair = client.post("/api/compatibility", json={"type_a": "ENFP", "type_b": "INTJ"}).json()
+    cell = data["matrix"][data["types"].index("ENFP")][data["types"].index("INTJ")]
+    assert cell["relationship_key"] == pair["relationship_key"]
+    assert cell["conflict_points"] == pair["conflict_points"]
+    assert data["communication_strategy"][cell["relationship_key"]] == pair["communication_strategy"]
+    assert client.get("/api/compatibility/matrix", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+
+
+def test_team_compatibility_types():
+    import random
+    from itertools import combinations
+    from compatibility import compatibility_entry
+
+    rng = random.Random(0)
+    types = [rng.choice(["INTJ", "ENFP", "ISTJ", "ESFP", "INFP"]) for _ in range(60)]
+    r = client.post("/api/compatibility/team", json={"types": types})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["members"] == 60
+    assert data["total_pairs"] == 60 * 59 // 2
+    expected = {"ideal": 0, "complementary": 0, "challenging": 0}
+    for a, b in combinations(types, 2):  # O(N²) 기준값과 비교
+        expected[compatibility_entry(a, b)["relationship_key"]] += 1
+    assert {k: v["pairs"] for k, v in data["relationship_distribution"].items()} == expected
+    e = sum(t[0] == "E" for t in types)
+    assert data["dimension_balance"]["E/I"] == {"E": e, "I": 60 - e, "conflict_pairs": e * (60 - e)}
+    assert all(h["pairs"] > 0 for h in data["conflict_hotspots"])
+    assert client.post("/api/compatibility/team", json={"types": ["INTJ", "XXXX"]}).status_code == 400
+    assert client.post("/api/compatibility/team", json={}).status_code == 422
+
+
+def test_team_compatibility_sessions():
+    full = [{"question_id": i, "value": 4} for i in range(1, 49)]
+    s1 = client.post("/api/mbti/submit", json={"answers": full}).json()["session_id"]
+    s2 = client.post("/api/mbti/submit", json={"answers": full[:5]}).json()["session_id"]
+    r = client.post("/api/compatibility/team", json={"session_ids": [s1, s1, s2, "missing-id"]})
+    assert r.status_code == 200
+    data = r.json()
+    assert data["members"] == 1
+    assert data["histogram"] == {client.get(f"/api/mbti/result/{s1}").json()["type"]: 1}
+    assert data["incomplete"] == [s2]
+    assert data["not_found"] == ["missing-id"]
+
+
 def test_career_match():
     r = client.get("/api/career/match/INTJ")
     assert r.status_code == 200
@@ -218,19 +997,39 @@ def test_career_match():
     assert len(data["recommended_careers"]) >= 5
 
 
+def test_career_rank():
+    pct = {"E/I": {"E": 10, "I": 90}, "S/N": {"S": 10, "N": 90}, "T/F": {"T": 90, "F": 10}, "J/P": {"J": 90, "P": 10}}
+    r = client.post("/api/career/match", json={"percentages": pct, "top_k": 3})
+    assert r.status_code == 200
+    careers = r.json()["careers"]
+    assert len(careers) == 3
+    assert [c["score"] for c in careers] == sorted((c["score"] for c in careers), reverse=True)
+    assert careers[0]["career"] in client.get("/api/career/match/INTJ").json()["recommended_careers"]
+    bad = client.post("/api/career/match", json={"percentages": {"E/I": {"E": 50}}})
+    assert bad.status_code == 400
+
+
+def test_career_types_index():
+    r = client.get("/api/career/상담/types")
+    assert r.status_code == 200
+    types = [t["type"] for t in r.json()["types"]]
+    assert len(types) == 4
+    assert types[0] in ("INFJ", "INFP", "ENFJ", "ENFP")
+    assert client.get("/api/career/없는직무/types").status_code == 404
+
+
 def test_career_match_invalid():
     r = client.get("/api/career/match/INVALID")
     assert r.status_code == 400
 
 
-@patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test-key"})
-@patch("openai.OpenAI")
-def test_ai_career_advice(mock_openai):
+@patch("main.get_ai_client")
+def test_ai_career_advice(mock_get_client):
     mock_client = MagicMock()
-    mock_client.chat.completions.create.return_value = MagicMock(
+    mock_client.chat.completions.create = AsyncMock(return_value=MagicMock(
         choices=[MagicMock(message=MagicMock(content='{"career_advice": "테스트 조언", "strength_strategy": "강점 전략"}'))]
-    )
-    mock_openai.return_value = mock_client
+    ))
+    mock_get_client.return_value = mock_client
     r = client.post(
         "/api/career/ai-advice",
         json={"mbti_type": "INTJ", "current_job": "개발자"},
@@ -243,6 +1042,17 @@ def test_ai_career_advice(mock_openai):
     assert "strength_strategy" in data
 
 
+@patch.dict("os.environ", {"OPENAI_API_KEY": "sk-test-key"})
+def test_ai_client_shared():
+    import asyncio
+    from ai_client import close_ai_client, get_ai_client
+
+    try:
+        assert get_ai_client() is get_ai_client()
+    finally:
+        asyncio.run(close_ai_client())
+
+
 @patch("main.os.getenv", return_value="")
 def test_ai_career_advice_no_key(mock_getenv):
     r = client.post("/api/career/ai-advice", json={"mbti_type": "ENFP", "current_job": "디자이너"})
@@ -317,3 +1127,195 @@ def test_share_and_pdf():
     r5 = client.get(f"/api/mbti/result/{sid}/pdf")
     assert r5.status_code == 200
     assert r5.headers.get("content-type", "").startswith("application/pdf")
+
+
+def test_pdf_cache_conditional_and_disk(tmp_path, monkeypatch):
+    import main
+    from pdf_cache import PdfCache, pdf_key
+
+    cache = PdfCache(str(tmp_path), max_bytes=1 << 20, memory_bytes=1 << 20)
+    monkeypatch.setattr(main, "pdf_cache", cache)
+    answers = [{"question_id": i, "value": 4} for i in range(1, 49)]
+    sid = client.post("/api/mbti/submit", json={"answers": answers}).json()["session_id"]
+    share_id = client.post("/api/share", json={"session_id": sid}).json()["share_id"]
+
+    r1 = client.get(f"/api/share/{share_id}/pdf")
+    assert r1.status_code == 200
+    etag = r1.headers["etag"]
+    assert client.get(f"/api/mbti/result/{sid}/pdf").headers["etag"] == etag  # 같은 입력 → 같은 키
+    assert cache.stats()["misses"] == 1
+    assert client.get(f"/api/share/{share_id}/pdf", headers={"If-None-Match": etag}).status_code == 304
+    r_since = client.get(f"/api/share/{share_id}/pdf", headers={"If-Modified-Since": r1.headers["last-modified"]})
+    assert r_since.status_code == 304
+
+    # 재시작 후 (메모리 비어 있음) 디스크에서 읽어 메모리로 올림
+    monkeypatch.setattr(main, "pdf_cache", PdfCache(str(tmp_path)))
+    r2 = client.get(f"/api/share/{share_id}/pdf")
+    assert r2.content == r1.content and r2.headers["etag"] == etag
+    client.get(f"/api/share/{share_id}/pdf")
+    assert main.pdf_cache.stats()["hits"] == {"memory": 1, "disk": 1}
+
+    # 다른 워커가 파일을 지운 경우 - 미스로 처리해 다시 렌더링
+    monkeypatch.setattr(main, "pdf_cache", PdfCache(str(tmp_path)))
+    for f in tmp_path.glob("*.pdf"):
+        f.unlink()
+    r3 = client.get(f"/api/share/{share_id}/pdf")
+    assert r3.status_code == 200 and r3.headers["etag"] == etag
+    assert main.pdf_cache.stats()["misses"] == 1
+
+    # 디스크 용량 초과 시 오래 사용하지 않은 파일부터 삭제
+    small = PdfCache(str(tmp_path / "small"), max_bytes=250, memory_bytes=0)
+    keys = [pdf_key("INTJ", {"EI": i}, {}) for i in range(3)]
+    for k in keys:
+        small.put(k, b"x" * 100)
+    assert small.get(keys[0]) is None
+    assert small.get(keys[2]).body == b"x" * 100
+    assert small.stats()["disk"]["bytes"] == 200
+
+
+def test_pdf_render_pool(tmp_path, monkeypatch):
+    import asyncio
+    import main
+    from pdf_cache import PdfCache
+    from pdf_render import PdfRenderer
+    from report_templates import MBTI_REPORTS
+
+    renderer = PdfRenderer(workers=1, max_pending=2)
+    try:
+        body = asyncio.run(renderer.render("ENFP", {"EI": {"E": 70, "I": 30}}, MBTI_REPORTS["ENFP"]))
+    finally:
+        renderer.shutdown()
+    assert body.startswith(b"%PDF")
+
+    # 대기열이 가득 차면 503 + Retry-After (캐시에 없는 PDF만 렌더링 대기)
+    monkeypatch.setattr(main, "pdf_cache", PdfCache(str(tmp_path)))
+    monkeypatch.setattr(main, "pdf_renderer", PdfRenderer(workers=0, max_pending=0))
+    answers = [{"question_id": i, "value": 2} for i in range(1, 49)]
+    sid = client.post("/api/mbti/submit", json={"answers": answers}).json()["session_id"]
+    r = client.get(f"/api/mbti/result/{sid}/pdf")
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+
+
+def test_render_many_respects_max_pending():
+    import asyncio
+    from pdf_render import PdfRenderer
+    from report_templates import MBTI_REPORTS
+
+    renderer = PdfRenderer(workers=0, max_pending=1)
+    job = ("ENFP", {"EI": {"E": 70, "I": 30}}, MBTI_REPORTS["ENFP"])
+
+    async def run():
+        renderer._pending = 1  # 다른 렌더링이 자리를 차지한 상태
+        task = asyncio.create_task(renderer.render_many([job, job]))
+        await asyncio.sleep(0.2)
+        assert not task.done() and renderer.pending == 1  # 상한을 넘기지 않고 대기
+        renderer._pending = 0
+        return await task
+
+    pdfs = asyncio.run(run())
+    assert len(pdfs) == 2 and all(p.startswith(b"%PDF") for p in pdfs)
+    assert renderer.pending == 0
+
+
+def test_pdf_template_stamp_matches_full_render():
+    import pdf_utils
+    from report_templates import MBTI_REPORTS
+
+    pct = {"EI": {"E": 30.0, "I": 70.0}, "SN": {"S": 40.5, "N": 59.5}, "TF": {"T": 80, "F": 20}, "JP": {"J": 55, "P": 45}}
+    stamped = pdf_utils.create_mbti_pdf("INTJ", pct, MBTI_REPORTS["INTJ"])
+    assert pdf_utils._templates["INTJ"] is not None
+    padded = [line.ljust(pdf_utils.PCT_SLOT_WIDTH) for line in pdf_utils._percentage_lines(pct)]
+    assert stamped == pdf_utils._render("INTJ", padded, MBTI_REPORTS["INTJ"], page_compression=0)
+    assert b"@@PCT" not in stamped
+
+    # 기본 리포트와 다르거나 비율이 4줄이 아니면 전체 렌더링
+    custom = pdf_utils.create_mbti_pdf("INTJ", pct, {**MBTI_REPORTS["INTJ"], "strengths": "custom"})
+    assert custom.startswith(b"%PDF") and b"@@PCT" not in custom
+    assert pdf_utils.create_mbti_pdf("INTJ", {}, MBTI_REPORTS["INTJ"]).startswith(b"%PDF")
+
+
+def test_export_pdfs_zip(monkeypatch):
+    import csv
+    import io
+    import json
+    import zipfile
+    import main
+    from pdf_render import PdfRenderer
+
+    monkeypatch.setattr(main, "EXPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(main, "pdf_renderer", PdfRenderer(workers=0, max_pending=4))
+    lines = [json.dumps({"answers": str(1 + i % 5) * 48}) for i in range(5)]
+    lines.append(json.dumps({"answers": [{"question_id": 1, "value": 5}]}))  # 미완료
+    body = "\n".join(lines).encode()
+    assert client.post("/api/mbti/import?cohort=2026-spring", content=body).status_code == 401
+    assert client.post("/api/mbti/export/pdf", json={"cohort": "2026-spring"}).status_code == 401
+    headers = _auth_headers("export@example.com")
+    other = _auth_headers("export-other@example.com")
+    r = client.post("/api/mbti/import?cohort=2026-spring", content=body, headers=headers)
+    ids = [json.loads(x)["session_id"] for x in r.text.splitlines() if "session_id" in x]
+    client.post("/api/mbti/import?cohort=2026-spring", content=lines[0].encode(), headers=other)  # 같은 이름, 다른 회원
+
+    r = client.post("/api/mbti/export/pdf", json={"cohort": "2026-spring"}, headers=headers)
+    assert r.status_code == 200 and r.headers["content-type"] == "application/zip"
+    zf = zipfile.ZipFile(io.BytesIO(r.content))
+    assert zf.testzip() is None
+    rows = list(csv.DictReader(io.StringIO(zf.read("manifest.csv").decode("utf-8-sig"))))
+    assert sorted(row["session_id"] for row in rows) == sorted(ids)
+    assert [row["status"] for row in rows].count("ok") == 5
+    assert all(zf.read(row["file"]).startswith(b"%PDF") for row in rows if row["status"] == "ok")
+    assert all("/" not in name and ".." not in name for name in zf.namelist())
+    assert main._ZIP_NAME_UNSAFE.sub("_", "../a/b") == "___a_b"
+
+    r = client.post("/api/mbti/export/pdf", json={"session_ids": [ids[0], "missing", ids[5]]}, headers=headers)
+    rows = list(csv.DictReader(io.StringIO(zipfile.ZipFile(io.BytesIO(r.content)).read("manifest.csv").decode("utf-8-sig"))))
+    assert [row["status"] for row in rows] == ["ok", "not_found", "incomplete"]
+    assert client.post("/api/mbti/export/pdf", json={"cohort": "x", "session_ids": ids}, headers=headers).status_code == 422
+
+    # 다른 회원은 같은 이름의 캠페인을 내보내도 자기 세션만, id를 알아도 남의 세션은 not_found
+    r = client.post("/api/mbti/export/pdf", json={"cohort": "2026-spring"}, headers=other)
+    rows = list(csv.DictReader(io.StringIO(zipfile.ZipFile(io.BytesIO(r.content)).read("manifest.csv").decode("utf-8-sig"))))
+    assert len(rows) == 1 and rows[0]["session_id"] not in ids
+    r = client.post("/api/mbti/export/pdf", json={"session_ids": [ids[0]]}, headers=other)
+    rows = list(csv.DictReader(io.StringIO(zipfile.ZipFile(io.BytesIO(r.content)).read("manifest.csv").decode("utf-8-sig"))))
+    assert [row["status"] for row in rows] == ["not_found"]
+
+
+def test_share_normalized_and_cached():
+    import main
+    from conftest import TestingSessionLocal
+    from maintenance import compact_shares
+    from models import Share
+    from report_templates import MBTI_REPORTS, REPORT_TEMPLATE_VERSION
+
+    answers = [{"question_id": i, "value": 5} for i in range(1, 49)]
+    sid = client.post("/api/mbti/submit", json={"answers": answers}).json()["session_id"]
+    share_id = client.post("/api/share", json={"session_id": sid}).json()["share_id"]
+    db = TestingSessionLocal()
+    try:
+        stored = db.get(Share, share_id).data
+        assert "report" not in stored and stored["template_version"] == REPORT_TEMPLATE_VERSION
+        # 이전 형식 (리포트 본문 포함)
+        legacy = {"type": stored["type"], "percentages": stored["percentages"], "session_id": sid,
+                  "report": MBTI_REPORTS[stored["type"]]}
+        db.add(Share(id="legacy01", data=legacy))
+        db.commit()
+    finally:
+        db.close()
+
+    r = client.get(f"/api/share/{share_id}")
+    assert r.json() == legacy
+    assert r.headers["cache-control"] == main.SHARE_CACHE_CONTROL
+    hits = main.share_cache.hits
+    assert client.get(f"/api/share/{share_id}", headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    assert main.share_cache.hits == hits + 1
+    assert client.get("/api/share/legacy01").json() == r.json()
+
+    assert compact_shares(TestingSessionLocal, batch_size=1) == (1, 0)
+    db = TestingSessionLocal()
+    try:
+        assert db.get(Share, "legacy01").data["template_version"] == REPORT_TEMPLATE_VERSION
+    finally:
+        db.close()
+    main.share_cache.clear()
+    assert client.get("/api/share/legacy01").json() == r.json()
@@ -90,6 +90,56 @@ export async function getAiReport(mbtiType, job, currentConcern, relationshipCon
   return r.json()
 }
 
+// SSE 스트림 읽기 (POST라 EventSource 대신 fetch) - token마다 onToken(text), done 이벤트 데이터 반환
+async function readEventStream(r, onToken, fallbackError) {
+  if (!r.ok) {
+    const d = await r.json().catch(() => ({}))
+    throw new Error(d.detail || fallbackError)
+  }
+  const reader = r.body.getReader()
+  const decoder = new TextDecoder()
+  let buf = ''
+  for (;;) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buf += decoder.decode(value, { stream: true })
+    let idx
+    while ((idx = buf.indexOf('\n\n')) >= 0) {
+      const block = buf.slice(0, idx)
+      buf = buf.slice(idx + 2)
+      const event = block.match(/^event: (.*)$/m)?.[1]
+      const data = JSON.parse(block.match(/^data: (.*)$/m)?.[1] || '{}')
+      if (event === 'token') onToken?.(data.text)
+      else if (event === 'done') return data
+      else if (event === 'error') throw new Error(data.detail || fallbackError)
+    }
+  }
+  throw new Error(fallbackError)
+}
+
+export async function streamAiReport(mbtiType, job, currentConcern, relationshipConcern, onToken) {
+  const r = await fetch(`${API}/report/ai/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      mbti_type: mbtiType,
+      job: job || undefined,
+      current_concern: currentConcern || undefined,
+      relationship_concern: relationshipConcern || undefined,
+    }),
+  })
+  return readEventStream(r, onToken, 'AI 리포트 생성 실패')
+}
+
+export async function streamAiCareerAdvice(mbtiType, currentJob, onToken) {
+  const r = await fetch(`${API}/career/ai-advice/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ mbti_type: mbtiType, current_job: currentJob }),
+  })
+  return readEventStream(r, onToken, 'AI 커리어 조언 생성 실패')
+}
+
 export async function getCompatibility(typeA, typeB) {
   const r = await fetch(`${API}/compatibility`, {
     method: 'POST',
@@ -100,12 +150,28 @@ export async function getCompatibility(typeA, typeB) {
   return r.json()
 }
 
+export async function getCompatibilityMatrix() {
+  const r = await fetch(`${API}/compatibility/matrix`)
+  if (!r.ok) throw new Error('궁합 표 조회 실패')
+  return r.json()
+}
+
 export async function getCareerMatch(mbtiType) {
   const r = await fetch(`${API}/career/match/${mbtiType}`)
   if (!r.ok) throw new Error('직무 매칭 실패')
   return r.json()
 }
 
+export async function rankCareers(percentages, topK = 10) {
+  const r = await fetch(`${API}/career/match`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ percentages, top_k: topK }),
+  })
+  if (!r.ok) throw new Error('직무 매칭 실패')
+  return r.json()
+}
+
 export async function getAiCareerAdvice(mbtiType, currentJob) {
   const r = await fetch(`${API}/career/ai-advice`, {
     method: 'POST',
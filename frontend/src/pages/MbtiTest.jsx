@@ -47,8 +47,9 @@ export default function MbtiTest() {
     if (Object.keys(answers).length < 48) return
     setSubmitting(true)
     try {
-      const arr = Object.entries(answers).map(([q, v]) => ({ question_id: +q, value: +v }))
-      const { session_id } = await submitAnswers(arr)
+      // 간단 형식: 문항 순서대로 48자리 숫자 문자열 (0 = 미응답)
+      const compact = questions.map((q) => answers[q.id] || 0).join('')
+      const { session_id } = await submitAnswers(compact)
       navigate(`/result/${session_id}`)
     } catch (err) {
       alert(err.message)
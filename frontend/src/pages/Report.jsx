@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react'
 import { useSearchParams } from 'react-router-dom'
-import { getBasicReport, getAiReport } from '../api'
+import { getBasicReport, streamAiReport } from '../api'
 
 const TYPES = ['INTJ','INTP','ENTJ','ENTP','INFJ','INFP','ENFJ','ENFP','ISTJ','ISFJ','ESTJ','ESFJ','ISTP','ISFP','ESTP','ESFP']
 
@@ -22,8 +22,12 @@ export default function Report() {
 
   const handleAiReport = async () => {
     setLoadingAi(true)
+    setAi('')
     try {
-      const d = await getAiReport(mbtiType, job || undefined, concern || undefined, relConcern || undefined)
+      const d = await streamAiReport(
+        mbtiType, job || undefined, concern || undefined, relConcern || undefined,
+        (text) => setAi((prev) => (prev || '') + text),
+      )
       setAi(d.ai_interpretation)
     } catch (e) {
       alert(e.message)